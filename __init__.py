@@ -1,4 +1,25 @@
-from .pathfinding import a_star
-from .decision_tree import HunterDecisionModel
+"""Knights of Eldoria.
 
-__all__ = ['a_star', 'HunterDecisionModel']
\ No newline at end of file
+Top-level names are imported on first access, so ``import eldoria`` (and
+importing any submodule) stays cheap for worker processes and CLI runs.
+"""
+import importlib
+
+_LAZY = {
+    'a_star': '.ai.pathfinding',
+    'HunterDecisionModel': '.ai.decision_tree',
+}
+
+__all__ = ['a_star', 'HunterDecisionModel']
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
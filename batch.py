@@ -0,0 +1,140 @@
+"""Headless batch runner for EldoriaSimulation.
+
+Runs seeded games to game over (or a step cap), serially or across a process
+pool, and streams one result per game as it finishes:
+
+    python -m eldoria.batch --runs 10000 --size 20 --workers 8 > results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+RECORD_CHUNK = 50  # Games per pool task when recording
+
+
+class RunResult(NamedTuple):
+    seed: int
+    score: float
+    steps: int
+    hunters_surviving: int
+    treasures_expired: int
+    game_over: bool
+
+
+def run_game(seed: int, size: int = 20, max_steps: int = 1000, recorder=None, **options) -> RunResult:
+    """Play one seeded game; options are passed to EldoriaSimulation.
+
+    recorder is an eldoria.trajectory.TrajectoryRecorder to add the game's
+    hunter decisions to; the caller closes it.
+    """
+    from eldoria.simulation import EldoriaSimulation
+
+    simulation = EldoriaSimulation(size=size, seed=seed, **options)
+    simulation.recorder = recorder
+    steps = 0
+    while not simulation.game_over and steps < max_steps:
+        simulation.run_step()
+        steps += 1
+    if recorder is not None:
+        recorder.finish(simulation)  # Settles a game cut off by max_steps
+    return RunResult(
+        seed=seed,
+        score=float(simulation.score),
+        steps=steps,
+        hunters_surviving=len(simulation.hunters),
+        treasures_expired=simulation.treasures_expired,
+        game_over=simulation.game_over,
+    )
+
+
+def run_recorded(seeds: Iterable[int], record: str, size: int = 20, max_steps: int = 1000,
+                 **options) -> Iterator[RunResult]:
+    """Play seeds in order, writing all their hunter decisions to the directory record through one recorder"""
+    from eldoria.trajectory import TrajectoryRecorder
+
+    with TrajectoryRecorder(record) as recorder:  # Uniquely named chunks; recorders never overwrite each other
+        for seed in seeds:
+            yield run_game(seed, size, max_steps, recorder, **options)
+
+
+def _run_recorded_chunk(seeds, record, size, max_steps, **options) -> List[RunResult]:
+    return list(run_recorded(seeds, record, size, max_steps, **options))
+
+
+def run_batch(seeds: Iterable[int], size: int = 20, max_steps: int = 1000,
+              workers: Optional[int] = None, record: Optional[str] = None, **options) -> Iterator[RunResult]:
+    """Yield one RunResult per seed in completion order.
+
+    workers=1 runs in this process; otherwise games are spread over a
+    ProcessPoolExecutor (default: one worker per CPU). A seed gives the same
+    result either way. record is a directory to write the hunters' decisions
+    to (see eldoria.trajectory); each pool task then plays RECORD_CHUNK games
+    through one recorder, so chunk files hold many games.
+    """
+    seeds = list(seeds)
+    if workers == 1:
+        if record is not None:
+            yield from run_recorded(seeds, record, size, max_steps, **options)
+            return
+        for seed in seeds:
+            yield run_game(seed, size, max_steps, **options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if record is not None:
+            futures = [pool.submit(_run_recorded_chunk, seeds[start:start + RECORD_CHUNK], record, size, max_steps,
+                                   **options) for start in range(0, len(seeds), RECORD_CHUNK)]
+            for future in as_completed(futures):
+                yield from future.result()
+            return
+        futures = [pool.submit(run_game, seed, size, max_steps, **options) for seed in seeds]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_lockstep(seeds: Iterable[int], size: int = 20, max_steps: int = 1000,
+                 chunk: int = 4096, **options) -> Iterator[RunResult]:
+    """Yield RunResults from the vectorized LockstepSimulation, chunk worlds at a time.
+
+    Statistically equivalent to run_batch, not game-for-game identical.
+    """
+    from eldoria.lockstep import LockstepSimulation
+
+    seeds = list(seeds)
+    for start in range(0, len(seeds), chunk):
+        engine = LockstepSimulation(seeds[start:start + chunk], size=size, **options)
+        engine.run(max_steps)
+        yield from engine.results()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded Eldoria games headless and print JSON lines.")
+    parser.add_argument('--runs', type=int, default=100, help="number of games")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument('--size', type=int, default=20)
+    parser.add_argument('--max-steps', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--navigation', choices=('astar', 'flow'), default='astar')
+    parser.add_argument('--record', metavar='DIR', help="write the hunters' decisions to DIR as training data")
+    parser.add_argument('--lockstep', action='store_true',
+                        help="step all games together with the vectorized engine (same statistics, not the same games)")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.seed, args.seed + args.runs)
+    if args.lockstep:
+        if args.record:
+            parser.error("--record needs the scalar engine")
+        results = run_lockstep(seeds, args.size, args.max_steps)
+    else:
+        results = run_batch(seeds, args.size, args.max_steps, args.workers, navigation=args.navigation,
+                            record=args.record)
+    for result in results:
+        sys.stdout.write(json.dumps(result._asdict()) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Before/after benchmark for hunter and knight pathfinding.
+
+"before" is the original Euclidean-heuristic a_star, recomputed every tick;
+"after" is the torus-aware a_star behind per-agent PathCache repair.
+
+    python -m eldoria.bench_pathfinding --size 40 --ticks 200
+"""
+import argparse
+import math
+import random
+import time
+from heapq import heappop, heappush
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from eldoria.enums import EntityType
+from eldoria.models.grid import Grid
+from eldoria.ai.pathfinding import PathCache, SearchStats, a_star, collect_stats
+
+
+def legacy_a_star(grid, start: Tuple[int, int], goal: Tuple[int, int], stats: SearchStats) -> List[Tuple[int, int]]:
+    """The original tuple-keyed a_star with a straight-line heuristic, for comparison"""
+    stats.calls += 1
+    open_set = []
+    heappush(open_set, (0, start))
+    came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    g_score = {start: 0}
+    f_score = {start: math.dist(start, goal)}
+
+    while open_set:
+        _, current = heappop(open_set)
+        if current == goal:
+            path = []
+            while current in came_from:
+                path.append(current)
+                current = came_from[current]
+            return path[::-1]
+        stats.expansions += 1
+
+        for neighbor, cell_type in grid.get_adjacent(*current).items():
+            if cell_type == EntityType.KNIGHT:
+                continue
+            tentative_g = g_score[current] + 1
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                f_score[neighbor] = tentative_g + math.dist(neighbor, goal)
+                heappush(open_set, (f_score[neighbor], neighbor))
+    return []
+
+
+def bench_queries(size: int, knights: int, queries: int, seed: int) -> Dict[str, Dict[str, float]]:
+    """Single a_star calls between random cells on a grid scattered with knights"""
+    rng = random.Random(seed)
+    grid = Grid(size)
+    for _ in range(knights):
+        grid.add_entity(rng.randrange(size), rng.randrange(size), EntityType.KNIGHT)
+    pairs = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size)))
+             for _ in range(queries)]
+
+    results = {}
+    for name, search in (('before', lambda s, g, st: legacy_a_star(grid, s, g, st)),
+                         ('after', lambda s, g, st: _counted(grid, s, g, st))):
+        stats = SearchStats()
+        started = time.perf_counter()
+        for start, goal in pairs:
+            search(start, goal, stats)
+        elapsed = time.perf_counter() - started
+        results[name] = {'expansions': stats.expansions / queries, 'ms': 1000 * elapsed / queries}
+    return results
+
+
+def _counted(grid, start, goal, stats):
+    with collect_stats(stats):
+        return a_star(grid, start, goal)
+
+
+def bench_ticks(size: int, ticks: int, seed: int) -> Dict[str, Dict[str, float]]:
+    """Whole run_step cost with cached paths versus per-tick legacy recomputation"""
+    from eldoria.simulation import EldoriaSimulation
+
+    cached_next_step = PathCache.next_step
+    results = {}
+    for name in ('before', 'after'):
+        stats = SearchStats()
+        if name == 'before':
+            def next_step(cache, grid, start, goal):
+                path = legacy_a_star(grid, start, goal, stats)
+                return path[0] if path else None
+            PathCache.next_step = next_step
+
+        random.seed(seed)
+        np.random.seed(seed)
+        simulation = EldoriaSimulation(size=size)
+        try:
+            with collect_stats(stats):
+                started = time.perf_counter()
+                steps = 0
+                while steps < ticks and not simulation.game_over:
+                    simulation.run_step()
+                    steps += 1
+                elapsed = time.perf_counter() - started
+        finally:
+            PathCache.next_step = cached_next_step
+        results[name] = {'expansions': stats.expansions / max(steps, 1), 'ms': 1000 * elapsed / max(steps, 1)}
+    return results
+
+
+def _report(title: str, results: Dict[str, Dict[str, float]], unit: str):
+    print(title)
+    for name, row in results.items():
+        print(f"  {name:<7} {row['expansions']:>10.1f} expansions/{unit} {row['ms']:>9.3f} ms/{unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=40)
+    parser.add_argument('--knights', type=int, default=80)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    _report(f"a_star on {args.size}x{args.size} with {args.knights} knights",
+            bench_queries(args.size, args.knights, args.queries, args.seed), 'query')
+    _report(f"run_step on {args.size}x{args.size}, up to {args.ticks} ticks",
+            bench_ticks(args.size, args.ticks, args.seed), 'tick')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Reproducible benchmark suite for EldoriaSimulation.
+
+Every scenario is a seeded world of a given size and agent density. Each one
+measures world construction, steady-state run_step cost, a_star and
+find_nearest microbenchmarks, and GUI frame cost against a canvas stand-in (no
+display needed). Timings are the best of --repeat runs, in milliseconds.
+
+    python -m eldoria.benchmarks --output baseline.json
+    python -m eldoria.benchmarks --output current.json --compare baseline.json --threshold 0.2
+
+Results are one flat {"<scenario>/<metric>": value} map, so two files compare
+key by key; --compare exits with status 1 when any timing got slower than the
+baseline by more than the threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from eldoria.enums import EntityType
+from eldoria.simulation import EldoriaSimulation
+from eldoria.renderer import GridRenderer
+from eldoria.ai.pathfinding import a_star
+
+SIZES = (15, 30, 60)
+DENSITIES = {'sparse': 0.5, 'default': 1.0, 'dense': 2.0}
+BASE_AREA = 20 * 20  # the default world's 5 knights / 20 treasures are scaled from this area
+
+
+class Scenario(NamedTuple):
+    size: int
+    density: str
+    knights: int
+    treasures: int
+    hunters_per_hideout: int
+
+    @property
+    def name(self) -> str:
+        return f"size{self.size}-{self.density}"
+
+    def options(self) -> Dict[str, int]:
+        return {'size': self.size, 'knights': self.knights, 'treasures': self.treasures,
+                'hunters_per_hideout': self.hunters_per_hideout}
+
+
+def scenario(size: int, density: str) -> Scenario:
+    """Agent counts scaled with the world's area and the density factor"""
+    scale = DENSITIES[density] * size * size / BASE_AREA
+    return Scenario(size, density,
+                    knights=max(1, round(5 * scale)),
+                    treasures=max(1, round(20 * scale)),
+                    hunters_per_hideout=max(1, round(2 * DENSITIES[density])))
+
+
+class NullCanvas:
+    """The canvas calls GridRenderer makes, doing no drawing"""
+
+    def __init__(self):
+        self._items = 0
+
+    def delete(self, tag):
+        self._items = 0
+
+    def create_rectangle(self, *coords, **options):
+        self._items += 1
+        return self._items
+
+    create_text = create_rectangle
+
+    def itemconfigure(self, item, **options):
+        pass
+
+
+def _best(function, repeat: int) -> float:
+    """Smallest wall time of function() over repeat calls, in ms"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return 1000 * best
+
+
+def _random_cells(rng: random.Random, size: int, count: int) -> List[Tuple[int, int]]:
+    return [(rng.randrange(size), rng.randrange(size)) for _ in range(count)]
+
+
+def bench_construction(case: Scenario, seed: int, repeat: int) -> Dict[str, float]:
+    return {'construct_ms': _best(lambda: EldoriaSimulation(seed=seed, **case.options()), repeat)}
+
+
+def bench_run_step(case: Scenario, seed: int, repeat: int, warmup: int, ticks: int) -> Dict[str, float]:
+    """ms per run_step after warmup ticks, measured over at most ticks steps"""
+    best, measured = float('inf'), 0
+    for _ in range(repeat):
+        simulation = EldoriaSimulation(seed=seed, **case.options())
+        for _ in range(warmup):
+            if simulation.game_over:
+                break
+            simulation.run_step()
+        steps = 0
+        started = time.perf_counter()
+        while steps < ticks and not simulation.game_over:
+            simulation.run_step()
+            steps += 1
+        if steps:
+            best = min(best, (time.perf_counter() - started) / steps)
+            measured = steps
+    return {'run_step_ms': 1000 * best if measured else 0.0, 'run_step_ticks': measured}
+
+
+def bench_a_star(case: Scenario, seed: int, repeat: int, queries: int) -> Dict[str, float]:
+    """ms per a_star call between random cells of a freshly built world"""
+    simulation = EldoriaSimulation(seed=seed, **case.options())
+    rng = random.Random(seed)
+    pairs = list(zip(_random_cells(rng, case.size, queries), _random_cells(rng, case.size, queries)))
+
+    def run():
+        for start, goal in pairs:
+            a_star(simulation.grid, start, goal)
+    return {'a_star_ms': _best(run, repeat) / queries}
+
+
+def bench_find_nearest(case: Scenario, seed: int, repeat: int, queries: int) -> Dict[str, float]:
+    """ms per find_nearest call, with the grid unchanged (warm) and changed before every call (cold)"""
+    simulation = EldoriaSimulation(seed=seed, **case.options())
+    grid = simulation.grid
+    rng = random.Random(seed)
+    starts = _random_cells(rng, case.size, queries)
+    types = [EntityType.TREASURE, EntityType.HIDEOUT, EntityType.KNIGHT]
+    empty = next((cell for cell in _random_cells(rng, case.size, 1000) if grid.get(*cell) == EntityType.EMPTY),
+                 None)
+    if empty is None:  # Crowded grid: search for a free cell instead of sampling
+        empty = grid.find_nearest(starts[0], EntityType.EMPTY)
+
+    def warm():
+        for index, start in enumerate(starts):
+            grid.find_nearest(start, types[index % 3])
+
+    def cold():
+        for index, start in enumerate(starts):
+            entity_type = types[index % 3]
+            grid.add_entity(*empty, entity_type)
+            grid.add_entity(*empty, EntityType.EMPTY)
+            grid.find_nearest(start, entity_type)
+
+    result = {'find_nearest_warm_ms': _best(warm, repeat) / queries}
+    if empty != (-1, -1):  # A full grid has no cell to change, so no cold measurement
+        result['find_nearest_cold_ms'] = _best(cold, repeat) / queries
+    return result
+
+
+def bench_frames(case: Scenario, seed: int, repeat: int, frames: int) -> Dict[str, float]:
+    """Full first draw on attach, then ms per incremental frame with one step per frame"""
+    def attach():
+        GridRenderer(NullCanvas()).attach(EldoriaSimulation(seed=seed, **case.options()))
+    result = {'frame_attach_ms': _best(attach, repeat)}
+
+    best = float('inf')
+    for _ in range(repeat):
+        simulation = EldoriaSimulation(seed=seed, **case.options())
+        renderer = GridRenderer(NullCanvas())
+        renderer.attach(simulation)
+        elapsed, drawn = 0.0, 0
+        while drawn < frames and not simulation.game_over:
+            simulation.run_step()
+            started = time.perf_counter()
+            renderer.draw()
+            elapsed += time.perf_counter() - started
+            drawn += 1
+        if drawn:
+            best = min(best, elapsed / drawn)
+    result['frame_ms'] = 1000 * best if best != float('inf') else 0.0
+    return result
+
+
+def run_suite(sizes: Iterable[int] = SIZES, densities: Iterable[str] = tuple(DENSITIES), seed: int = 0,
+              repeat: int = 3, warmup: int = 10, ticks: int = 50, queries: int = 200,
+              frames: int = 50) -> Dict[str, float]:
+    """Run every benchmark on every scenario; returns {"<scenario>/<metric>": value}"""
+    results = {}
+    for size in sizes:
+        for density in densities:
+            case = scenario(size, density)
+            metrics = {}
+            metrics.update(bench_construction(case, seed, repeat))
+            metrics.update(bench_run_step(case, seed, repeat, warmup, ticks))
+            metrics.update(bench_a_star(case, seed, repeat, queries))
+            metrics.update(bench_find_nearest(case, seed, repeat, queries))
+            metrics.update(bench_frames(case, seed, repeat, frames))
+            for metric, value in metrics.items():
+                results[f"{case.name}/{metric}"] = value
+    return results
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Timings (``*_ms``) present in both runs that grew by more than threshold (0.2 = 20%)"""
+    regressions = []
+    for key in sorted(current):
+        if not key.endswith('_ms') or key not in baseline or baseline[key] <= 0:
+            continue
+        ratio = current[key] / baseline[key]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {baseline[key]:.4f} -> {current[key]:.4f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Eldoria across world sizes and agent densities.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--densities', nargs='+', choices=tuple(DENSITIES), default=list(DENSITIES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="timings are the best of this many runs")
+    parser.add_argument('--ticks', type=int, default=50, help="steady-state steps per run_step measurement")
+    parser.add_argument('--queries', type=int, default=200, help="calls per pathfinding microbenchmark")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON file from an earlier --output")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.densities, args.seed, args.repeat,
+                        ticks=args.ticks, queries=args.queries, frames=args.ticks)
+    report = {
+        'meta': {'python': platform.python_version(), 'machine': platform.machine(), 'seed': args.seed,
+                 'repeat': args.repeat, 'ticks': args.ticks, 'queries': args.queries},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    for key, value in results.items():
+        print(f"{key:45} {value:12.4f}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
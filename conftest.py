@@ -0,0 +1,33 @@
+import pytest
+
+
+class FakeCanvas:
+    """Records canvas calls so the renderer can run without a display"""
+
+    def __init__(self):
+        self.items = {}
+        self.updates = 0
+
+    def delete(self, tag):
+        self.items.clear()
+
+    def _create(self, **options):
+        item = len(self.items) + 1
+        self.items[item] = dict(options)
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self._create(**options)
+
+    def create_text(self, *coords, **options):
+        return self._create(**options)
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+        self.updates += 1
+
+
+@pytest.fixture
+def canvas():
+    """A FakeCanvas to draw on"""
+    return FakeCanvas()
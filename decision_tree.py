@@ -1,21 +1,178 @@
-from sklearn.tree import DecisionTreeClassifier
+import json
+import math
+import struct
+from typing import Optional, Sequence
 import numpy as np
 
+# Training data: [stamina, treasure_value, knight_distance]
+TRAINING_X = np.array([
+    [80, 0.13, 5],   # MOVE (1)
+    [30, 0.07, 2],   # FLEE (3)
+    [10, 0.03, 1],   # REST (4)
+    [50, 0.13, 8],   # MOVE (1)
+    [90, 0.13, 10],  # COLLECT (2)
+    [20, 0.07, 3]    # FLEE (3)
+])
+TRAINING_Y = np.array([1, 3, 4, 1, 2, 3])  # Action enum values
+
+_LEAF = -1  # sklearn's TREE_LEAF marker for children
+MODEL_FORMAT = 1  # Layout of the .npz model files written by CompiledTree.save
+
+
+def _float32(value: float) -> float:
+    """Round to float32 the way sklearn does before walking a tree"""
+    try:
+        return struct.unpack('f', struct.pack('f', value))[0]
+    except OverflowError:
+        return math.copysign(math.inf, value)
+
+
+class CompiledTree:
+    """Standalone evaluator for a fitted decision tree stored as flat node arrays.
+
+    Node i splits on ``feature[i] <= threshold[i]``; leaves have both children
+    set to -1 and predict ``action[i]``.
+    """
+
+    def __init__(self, feature: Sequence[int], threshold: Sequence[float],
+                 children_left: Sequence[int], children_right: Sequence[int],
+                 action: Sequence[int]):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.children_left = np.asarray(children_left, dtype=np.intp)
+        self.children_right = np.asarray(children_right, dtype=np.intp)
+        self.action = np.asarray(action, dtype=np.int64)
+
+        # Plain lists for the scalar walk; leaves loop onto themselves for the batch walk
+        self._nodes = list(zip(self.feature.tolist(), self.threshold.tolist(),
+                               self.children_left.tolist(), self.children_right.tolist(),
+                               self.action.tolist()))
+        leaf = self.children_left == _LEAF
+        node_ids = np.arange(len(self.feature))
+        self._feature = np.where(leaf, 0, self.feature)
+        self._left = np.where(leaf, node_ids, self.children_left)
+        self._right = np.where(leaf, node_ids, self.children_right)
+        self.depth = self._depth(0)
+        self.version: Optional[int] = None  # Set for trees read from a model file
+        self.metadata: dict = {}
+
+    def _depth(self, node: int) -> int:
+        if self.children_left[node] == _LEAF:
+            return 0
+        return 1 + max(self._depth(self.children_left[node]), self._depth(self.children_right[node]))
+
+    @classmethod
+    def from_sklearn(cls, classifier) -> 'CompiledTree':
+        """Export a fitted DecisionTreeClassifier"""
+        tree = classifier.tree_
+        action = classifier.classes_[np.argmax(tree.value[:, 0, :], axis=1)]
+        return cls(tree.feature, tree.threshold, tree.children_left, tree.children_right, action)
+
+    @classmethod
+    def constant(cls, action: int) -> 'CompiledTree':
+        """Single-leaf tree that always predicts action, as a baseline policy"""
+        return cls([-2], [-2.0], [_LEAF], [_LEAF], [action])
+
+    @classmethod
+    def from_module(cls, module) -> 'CompiledTree':
+        """Load a tree written by to_source()"""
+        return cls(module.FEATURE, module.THRESHOLD, module.CHILDREN_LEFT,
+                   module.CHILDREN_RIGHT, module.ACTION)
+
+    def save(self, path: str, version: int, **metadata):
+        """Write the tree as a .npz model file with its version and JSON-serializable metadata"""
+        with open(path, 'wb') as f:
+            np.savez(f, format=MODEL_FORMAT, version=version, metadata=json.dumps(metadata),
+                     feature=self.feature, threshold=self.threshold, children_left=self.children_left,
+                     children_right=self.children_right, action=self.action)
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledTree':
+        """Read a model file written by save()"""
+        with np.load(path) as model:
+            if int(model['format']) != MODEL_FORMAT:
+                raise ValueError(f"{path} has model format {int(model['format'])}, expected {MODEL_FORMAT}")
+            tree = cls(model['feature'], model['threshold'], model['children_left'],
+                       model['children_right'], model['action'])
+            tree.version = int(model['version'])
+            tree.metadata = json.loads(str(model['metadata']))
+        return tree
+
+    def to_source(self) -> str:
+        """Render the tree as an importable Python module"""
+        return (
+            '"""Compiled HunterDecisionModel tree.\n\n'
+            'Generated by `python -m eldoria.ai.decision_tree`; do not edit by hand.\n"""\n\n'
+            f'FEATURE = {tuple(self.feature.tolist())!r}\n'
+            f'THRESHOLD = {tuple(self.threshold.tolist())!r}\n'
+            f'CHILDREN_LEFT = {tuple(self.children_left.tolist())!r}\n'
+            f'CHILDREN_RIGHT = {tuple(self.children_right.tolist())!r}\n'
+            f'ACTION = {tuple(self.action.tolist())!r}\n'
+        )
+
+    def predict(self, stamina: float, treasure_value: float, distance: float) -> int:
+        """Walk the tree for a single state"""
+        state = (_float32(stamina), _float32(treasure_value), _float32(distance))
+        feature, threshold, left, right, action = self._nodes[0]
+        while left != _LEAF:
+            node = left if state[feature] <= threshold else right
+            feature, threshold, left, right, action = self._nodes[node]
+        return action
+
+    def predict_batch(self, states: np.ndarray) -> np.ndarray:
+        """Walk the tree for an (n, 3) array of states, one level per NumPy pass"""
+        states = np.asarray(states, dtype=np.float32).reshape(-1, 3)
+        rows = np.arange(len(states))
+        node = np.zeros(len(states), dtype=np.intp)
+        for _ in range(self.depth):
+            go_left = states[rows, self._feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self._left[node], self._right[node])
+        return self.action[node]
+
+
+def fit_classifier():
+    """Fit the reference sklearn tree on the training data (needs scikit-learn)"""
+    from sklearn.tree import DecisionTreeClassifier
+
+    classifier = DecisionTreeClassifier(random_state=0)
+    classifier.fit(TRAINING_X, TRAINING_Y)
+    return classifier
+
+
 class HunterDecisionModel:
-    def __init__(self):
-        # Training data: [stamina, treasure_value, knight_distance]
-        X = np.array([
-            [80, 0.13, 5],   # MOVE (1)
-            [30, 0.07, 2],   # FLEE (3)
-            [10, 0.03, 1],   # REST (4)
-            [50, 0.13, 8],   # MOVE (1)
-            [90, 0.13, 10],  # COLLECT (2)
-            [20, 0.07, 3]    # FLEE (3)
-        ])
-        y = np.array([1, 3, 4, 1, 2, 3])  # Action enum values
-        self.model = DecisionTreeClassifier()
-        self.model.fit(X, y)
+    _shared: Optional['HunterDecisionModel'] = None
+
+    def __init__(self, tree: Optional[CompiledTree] = None):
+        if tree is None:
+            from eldoria.ai import hunter_tree
+            tree = CompiledTree.from_module(hunter_tree)
+        self.tree = tree
+
+    @classmethod
+    def load(cls, path: str) -> 'HunterDecisionModel':
+        """Model from a file written by CompiledTree.save (see eldoria.ai.training)"""
+        return cls(CompiledTree.load(path))
+
+    @classmethod
+    def shared(cls) -> 'HunterDecisionModel':
+        """Process-wide model instance, loaded once on first use"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
 
     def predict(self, stamina: float, treasure_value: float, distance: float) -> int:
         """Predict action based on current state"""
-        return int(self.model.predict([[stamina, treasure_value, distance]])[0])
\ No newline at end of file
+        return self.tree.predict(stamina, treasure_value, distance)
+
+    def predict_batch(self, states: np.ndarray) -> np.ndarray:
+        """Predict actions for an (n, 3) array of [stamina, treasure_value, knight_distance] rows"""
+        return self.tree.predict_batch(states)
+
+
+if __name__ == '__main__':
+    import os
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hunter_tree.py')
+    with open(path, 'w') as f:
+        f.write(CompiledTree.from_sklearn(fit_classifier()).to_source())
+    print(f"Wrote {path}")
@@ -0,0 +1,65 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+Position = Tuple[int, int]
+
+
+class PositionIndex:
+    """(x, y) -> entities standing on that cell, in insertion order.
+
+    Entities expose ``x``/``y``; callers report moves with the old position.
+    """
+
+    def __init__(self, entities=()):
+        self._cells: Dict[Position, List[object]] = {}
+        self._count = 0
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity):
+        self._cells.setdefault((entity.x, entity.y), []).append(entity)
+        self._count += 1
+
+    def remove(self, entity, position: Optional[Position] = None):
+        position = (entity.x, entity.y) if position is None else position
+        entities = self._cells[position]
+        entities.remove(entity)
+        if not entities:
+            del self._cells[position]
+        self._count -= 1
+
+    def move(self, entity, old_position: Position):
+        """Re-file an entity whose x/y changed from old_position"""
+        if old_position != (entity.x, entity.y):
+            self.remove(entity, old_position)
+            self.add(entity)
+
+    def first(self, position: Position):
+        entities = self._cells.get(position)
+        return entities[0] if entities else None
+
+    def at(self, position: Position) -> List[object]:
+        return self._cells.get(position, [])
+
+    def __contains__(self, position: Position) -> bool:
+        return position in self._cells
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[object]:
+        for entities in self._cells.values():
+            yield from entities
+
+    def check(self, entities, name: str):
+        """Raise RuntimeError unless the index holds exactly these entities at their positions"""
+        if self._count != len(entities):
+            raise RuntimeError(f"{name} index holds {self._count} entries for {len(entities)} entities")
+        for position, indexed in self._cells.items():
+            for entity in indexed:
+                if (entity.x, entity.y) != position:
+                    raise RuntimeError(f"{name} at {(entity.x, entity.y)} is indexed under {position}")
+        expected: Dict[Position, List[object]] = {}
+        for entity in entities:
+            expected.setdefault((entity.x, entity.y), []).append(entity)
+        if expected != self._cells:
+            raise RuntimeError(f"{name} index is out of sync with the entity list")
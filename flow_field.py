@@ -0,0 +1,83 @@
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from eldoria.enums import EntityType
+from eldoria.models.grid import ENTITY_CODES
+
+UNREACHABLE = -1
+
+
+class FlowField:
+    """Reverse BFS distances to a set of goal cells, treating KNIGHT cells as walls.
+
+    Any agent's next step is the neighbour with the smallest distance, so one
+    field serves every agent heading for the same goals.
+    """
+
+    def __init__(self, grid, goals: Sequence[Tuple[int, int]]):
+        self.size = grid.size
+        self._neighbors = grid.neighbor_table()
+        passable = grid.codes.reshape(-1) != ENTITY_CODES[EntityType.KNIGHT]
+
+        distance = np.full(self.size * self.size, UNREACHABLE, dtype=np.int64)
+        frontier = np.array([(x % self.size) * self.size + y % self.size for x, y in goals], dtype=np.int64)
+        frontier = np.unique(frontier[passable[frontier]])
+        distance[frontier] = 0
+        level = 0
+        while len(frontier):
+            level += 1
+            reached = self._neighbors[frontier].reshape(-1)
+            reached = np.unique(reached[(distance[reached] == UNREACHABLE) & passable[reached]])
+            distance[reached] = level
+            frontier = reached
+        self.distance = distance
+        self._distance = distance.tolist()
+
+    def distance_at(self, position: Tuple[int, int]) -> int:
+        return self._distance[(position[0] % self.size) * self.size + position[1] % self.size]
+
+    def next_step(self, position: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Neighbour one step closer to the goals (first in DIRECTIONS order on ties)"""
+        index = (position[0] % self.size) * self.size + position[1] % self.size
+        if self._distance[index] == 0:
+            return None
+        best, best_distance = None, None
+        for neighbor in self._neighbors[index].tolist():
+            distance = self._distance[neighbor]
+            if distance != UNREACHABLE and (best_distance is None or distance < best_distance):
+                best, best_distance = neighbor, distance
+        return divmod(best, self.size) if best is not None else None
+
+
+class FlowFieldNavigator:
+    """Per-tick cache of flow fields shared by all agents of a simulation.
+
+    Fields are built on first use and dropped by begin_tick(), so each goal
+    costs one BFS per tick however many agents head for it.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self._fields: Dict[object, FlowField] = {}
+
+    def begin_tick(self):
+        self._fields.clear()
+
+    def field(self, goal: Tuple[int, int]) -> FlowField:
+        field = self._fields.get(goal)
+        if field is None:
+            field = self._fields[goal] = FlowField(self.grid, [goal])
+        return field
+
+    def type_field(self, entity_type: EntityType) -> FlowField:
+        """Field toward every cell of one entity type at once"""
+        field = self._fields.get(entity_type)
+        if field is None:
+            goals = [tuple(position) for position in self.grid.positions(entity_type).tolist()]
+            field = self._fields[entity_type] = FlowField(self.grid, goals)
+        return field
+
+    def next_step(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        return self.field(goal).next_step(start)
+
+    def next_step_to_type(self, start: Tuple[int, int], entity_type: EntityType) -> Optional[Tuple[int, int]]:
+        return self.type_field(entity_type).next_step(start)
@@ -1,23 +1,148 @@
-from typing import List, Dict, Tuple
+from typing import Iterable, Iterator, Dict, Optional, Set, Tuple
+import numpy as np
 from eldoria.enums import EntityType
 
+# Neighbour order used by get_adjacent and, through it, by find_nearest tie-breaking
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Compact uint8 cell codes; EMPTY is 0 so a fresh buffer is an empty grid
+ENTITY_TYPES = tuple(EntityType)
+ENTITY_CODES = {entity_type: code for code, entity_type in enumerate(ENTITY_TYPES)}
+
+# Entity types whose nearest-cell queries are answered from cached distance fields
+FIELD_TYPES = (EntityType.TREASURE, EntityType.HIDEOUT, EntityType.KNIGHT)
+
+
+class _Column:
+    """cells[x] compatibility view over one column of the code buffer"""
+    __slots__ = ('_grid', '_offset')
+
+    def __init__(self, grid: 'Grid', x: int):
+        self._grid = grid
+        self._offset = x * grid.size
+
+    def _index(self, y: int) -> int:
+        if y < 0:
+            y += self._grid.size
+        if not 0 <= y < self._grid.size:
+            raise IndexError('grid column index out of range')
+        return self._offset + y
+
+    def __getitem__(self, y: int) -> EntityType:
+        return ENTITY_TYPES[self._grid._buf[self._index(y)]]
+
+    def __setitem__(self, y: int, entity_type: EntityType):
+        self._grid._set(self._index(y), ENTITY_CODES[entity_type])
+
+    def __len__(self) -> int:
+        return self._grid.size
+
+    def __iter__(self) -> Iterator[EntityType]:
+        buf = self._grid._buf
+        return (ENTITY_TYPES[code] for code in buf[self._offset:self._offset + self._grid.size])
+
 
 class Grid:
     def __init__(self, size: int = 20):
         self.size = size
-        self.cells = [[EntityType.EMPTY for _ in range(size)] for _ in range(size)]
+        self._buf = bytearray(size * size)
+        # Zero-copy NumPy view of the same memory for whole-grid reads; write
+        # through add_entity/place_many so cached distance fields stay valid
+        self.codes = np.frombuffer(self._buf, dtype=np.uint8).reshape(size, size)
+        self.cells = [_Column(self, x) for x in range(size)]
+        self._fields: Dict[int, np.ndarray] = {}
+        self._generations = [0] * len(ENTITY_TYPES)
+        self._neighbors = None
+        self._dirty: Optional[Set[int]] = None  # Flat indices written since the last take_dirty()
+        self.nearest_queries = 0  # find_nearest calls, read by instrumentation
+
+    def track_dirty(self):
+        """Start recording which cells change, for incremental renderers"""
+        if self._dirty is None:
+            self._dirty = set()
+
+    def take_dirty(self) -> Set[Tuple[int, int]]:
+        """Cells whose entity changed since the previous call; always empty until track_dirty()"""
+        if self._dirty is None:
+            return set()
+        dirty, self._dirty = self._dirty, set()
+        return {divmod(index, self.size) for index in dirty}
+
+    def generation(self, entity_type: EntityType) -> int:
+        """Counter bumped whenever a cell gains or loses this entity type"""
+        return self._generations[ENTITY_CODES[entity_type]]
+
+    def get(self, x: int, y: int) -> EntityType:
+        """Entity type at a (wrapped) position"""
+        return ENTITY_TYPES[self._buf[(x % self.size) * self.size + y % self.size]]
 
     def add_entity(self, x: int, y: int, entity_type: EntityType):
-        self.cells[x % self.size][y % self.size] = entity_type
+        self._set((x % self.size) * self.size + y % self.size, ENTITY_CODES[entity_type])
+
+    def place_many(self, positions: Iterable[Tuple[int, int]], entity_type: EntityType):
+        """Write one entity type at many (wrapped) positions in a single pass"""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2) % self.size
+        flat = self.codes.reshape(-1)
+        index = positions[:, 0] * self.size + positions[:, 1]
+        for code in np.unique(flat[index]).tolist() + [ENTITY_CODES[entity_type]]:
+            self._fields.pop(code, None)
+            self._generations[code] += 1
+        flat[index] = ENTITY_CODES[entity_type]
+        if self._dirty is not None:
+            self._dirty.update(index.tolist())
+
+    def write_codes(self, index, codes):
+        """Write raw cell codes at flat indices in a single pass (snapshot restore and replay)"""
+        flat = self.codes.reshape(-1)
+        index = np.asarray(index, dtype=np.int64).reshape(-1)
+        codes = np.asarray(codes, dtype=np.uint8).reshape(-1)
+        changed = flat[index] != codes
+        index, codes = index[changed], codes[changed]
+        for code in np.union1d(flat[index], codes).tolist():
+            self._fields.pop(code, None)
+            self._generations[code] += 1
+        flat[index] = codes
+        if self._dirty is not None:
+            self._dirty.update(index.tolist())
+
+    def load_codes(self, codes):
+        """Replace every cell with a (size, size) or flat array of codes"""
+        self.write_codes(np.arange(self.size * self.size), codes)
 
     def get_adjacent(self, x: int, y: int) -> Dict[Tuple[int, int], EntityType]:
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        return {
-            ((x + dx) % self.size, (y + dy) % self.size): self.cells[(x + dx) % self.size][(y + dy) % self.size]
-            for dx, dy in directions
-        }
+        size, buf = self.size, self._buf
+        adjacent = {}
+        for dx, dy in DIRECTIONS:
+            nx, ny = (x + dx) % size, (y + dy) % size
+            adjacent[(nx, ny)] = ENTITY_TYPES[buf[nx * size + ny]]
+        return adjacent
+
+    def mask(self, entity_type: EntityType) -> np.ndarray:
+        """Boolean (size, size) occupancy mask for one entity type"""
+        return self.codes == ENTITY_CODES[entity_type]
+
+    def positions(self, entity_type: EntityType) -> np.ndarray:
+        """(n, 2) array of coordinates holding an entity type, in row-major order"""
+        return np.argwhere(self.mask(entity_type))
+
+    def neighbor_codes(self) -> np.ndarray:
+        """(4, size, size) codes of each cell's toroidal neighbours in DIRECTIONS order"""
+        return np.stack([np.roll(self.codes, (-dx, -dy), axis=(0, 1)) for dx, dy in DIRECTIONS])
+
+    def count_adjacent(self, entity_type: EntityType) -> np.ndarray:
+        """(size, size) count of each cell's neighbours holding an entity type"""
+        return (self.neighbor_codes() == ENTITY_CODES[entity_type]).sum(axis=0)
 
     def find_nearest(self, start: Tuple[int, int], target: EntityType) -> Tuple[int, int]:
+        self.nearest_queries += 1
+        if target in FIELD_TYPES:
+            code = ENTITY_CODES[target]
+            field = self._fields.get(code)
+            if field is None:
+                field = self._fields[code] = self._nearest_field(code)
+            nearest = int(field[(start[0] % self.size) * self.size + start[1] % self.size])
+            return divmod(nearest, self.size) if nearest >= 0 else (-1, -1)
+
         from collections import deque
         queue = deque([start])
         visited = set()
@@ -30,4 +155,53 @@ class Grid:
                 if (nx, ny) not in visited:
                     visited.add((nx, ny))
                     queue.append((nx, ny))
-        return (-1, -1)
\ No newline at end of file
+        return (-1, -1)
+
+    def _set(self, index: int, code: int):
+        """Write one cell code, dropping cached fields for the types it touches"""
+        old = self._buf[index]
+        if old != code:
+            self._buf[index] = code
+            self._fields.pop(old, None)
+            self._fields.pop(code, None)
+            self._generations[old] += 1
+            self._generations[code] += 1
+            if self._dirty is not None:
+                self._dirty.add(index)
+
+    def neighbor_table(self) -> np.ndarray:
+        """(size * size, 4) flat neighbour indices in DIRECTIONS order"""
+        if self._neighbors is None:
+            index = np.arange(self.size * self.size, dtype=np.int64).reshape(self.size, self.size)
+            self._neighbors = np.stack(
+                [np.roll(index, (-dx, -dy), axis=(0, 1)).reshape(-1) for dx, dy in DIRECTIONS], axis=1
+            )
+        return self._neighbors
+
+    def _nearest_field(self, code: int) -> np.ndarray:
+        """Multi-source BFS giving, for every cell, the flat index find_nearest would return.
+
+        A BFS from a start cell reaches cells in order of their lexicographically
+        smallest shortest path (compared by DIRECTIONS index), so among the nearest
+        targets it returns the one reached by always taking the first direction that
+        gets closer. Each cell therefore inherits the answer of its first neighbour
+        one step nearer to the target set. Cells with no target get -1.
+        """
+        neighbors = self.neighbor_table()
+        distance = np.full(self.size * self.size, -1, dtype=np.int64)
+        nearest = np.full(self.size * self.size, -1, dtype=np.int64)
+        frontier = np.flatnonzero(self.codes.reshape(-1) == code)
+        distance[frontier] = 0
+        nearest[frontier] = frontier
+
+        level = 0
+        while len(frontier):
+            level += 1
+            reached = neighbors[frontier].reshape(-1)
+            reached = np.unique(reached[distance[reached] < 0])
+            distance[reached] = level
+            candidates = neighbors[reached]
+            first_closer = (distance[candidates] == level - 1).argmax(axis=1)
+            nearest[reached] = nearest[candidates[np.arange(len(reached)), first_closer]]
+            frontier = reached
+        return nearest
@@ -9,6 +9,7 @@ class Hideout:
         self.hunters: List[Tuple[int, HunterSkill]] = []  # (hunter_id, skill)
         self.stored_treasure = 0.0
         self.capacity = 5
+        self.knowledge = None  # HunterMemory shared by self.hunters when the simulation pools team memory
 
     def add_hunter(self, hunter_id: int, skill: HunterSkill) -> bool:
         """Add hunter to hideout if space available"""
@@ -1,60 +1,86 @@
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Optional
 from eldoria.enums import Action, HunterSkill, EntityType
 from eldoria.models.treasure import Treasure
+from eldoria.models.memory import HunterMemory
 from eldoria.ai.decision_tree import HunterDecisionModel
-from eldoria.ai.pathfinding import a_star
+from eldoria.ai.pathfinding import PathCache
 import math
 
 
+def to_action(action_code: int) -> Action:
+    """Map a model output to an Action, resting on unknown codes"""
+    try:
+        return Action(action_code)
+    except ValueError:
+        return Action.REST
+
+
 class TreasureHunter:
+    __slots__ = ('x', 'y', 'skill', 'stamina', 'carried_treasure', 'memory', 'decision_model',
+                 'survival_timer', 'path_cache', 'hunter_id', 'home')
+
     def __init__(self, x: int, y: int, skill: HunterSkill):
         self.x = x
         self.y = y
         self.skill = skill
         self.stamina = 100.0
         self.carried_treasure: Optional[Treasure] = None
-        self.memory: Dict[Tuple[int, int], float] = {}
-        self.decision_model = HunterDecisionModel()
+        self.memory = HunterMemory()  # Replaced by the simulation with its configured or team memory
+        self.decision_model = HunterDecisionModel.shared()
         self.survival_timer = 3
+        self.path_cache = PathCache()
+        self.hunter_id: Optional[int] = None  # Assigned by the simulation, with the hideout it belongs to
+        self.home = None
 
-    def decide_action(self, simulation, nearest_knight: Tuple[int, int]) -> Action:
-        """Use simulation object instead of grid to access treasures"""
+    def observe(self, simulation, nearest_knight: Tuple[int, int]) -> Optional[Tuple[float, float, float]]:
+        """Update memory and return the (stamina, treasure_value, knight_distance) features.
+
+        Returns None when there is no treasure left to go after.
+        """
         # Update memory with visible treasures
+        size = simulation.grid.size
+        stamps = simulation.treasure_stamps
         for (x, y), cell_type in simulation.grid.get_adjacent(self.x, self.y).items():
             if cell_type == EntityType.TREASURE:
-                for treasure in simulation.treasures:
-                    if (x, y) == (treasure.x, treasure.y):
-                        self.memory[(x, y)] = treasure.get_value()
+                treasures = simulation.treasure_index.at((x, y))
+                if treasures:
+                    cell = x * size + y
+                    self.memory.remember(cell, treasures[-1].get_value(), stamps.get(cell, 0))
 
         nearest_treasure = simulation.grid.find_nearest((self.x, self.y), EntityType.TREASURE)
         if nearest_treasure == (-1, -1):
-            return Action.REST
+            return None
 
         knight_dist = math.dist((self.x, self.y), nearest_knight) if nearest_knight != (-1, -1) else float('inf')
-        treasure_value = self.memory.get(nearest_treasure, 0)
-
-        action_code = self.decision_model.predict(
-            self.stamina,
-            treasure_value,
-            knight_dist
-        )
+        cell = nearest_treasure[0] * size + nearest_treasure[1]
+        treasure_value = self.memory.recall(cell, stamps.get(cell, 0))
+        return self.stamina, treasure_value, knight_dist
 
-        try:
-            return Action(action_code)
-        except ValueError:
+    def decide_action(self, simulation, nearest_knight: Tuple[int, int]) -> Action:
+        """Use simulation object instead of grid to access treasures"""
+        features = self.observe(simulation, nearest_knight)
+        if features is None:
             return Action.REST
+        return to_action(self.decision_model.predict(*features))
 
-    def move_toward(self, grid, target: Tuple[int, int]) -> bool:
+    def move_toward(self, grid, target: Tuple[int, int], navigator=None) -> bool:
         if target == (-1, -1):
             return False
 
-        path = a_star(grid, (self.x, self.y), target)
-        if path and len(path) > 0:
-            new_x, new_y = path[0]
+        if navigator is not None:
+            step = navigator.next_step((self.x, self.y), target)
+        else:
+            step = self.path_cache.next_step(grid, (self.x, self.y), target)
+        return self.step_to(grid, step)
+
+    def step_to(self, grid, step: Optional[Tuple[int, int]]) -> bool:
+        """Move onto an adjacent cell if it is free or holds treasure"""
+        if step is not None:
+            new_x, new_y = step
 
-            if grid.cells[new_x][new_y] in [EntityType.EMPTY, EntityType.TREASURE]:
-                grid.cells[self.x][self.y] = EntityType.EMPTY
+            if grid.get(new_x, new_y) in [EntityType.EMPTY, EntityType.TREASURE]:
+                grid.add_entity(self.x, self.y, EntityType.EMPTY)
                 self.x, self.y = new_x, new_y
-                grid.cells[self.x][self.y] = EntityType.HUNTER
+                grid.add_entity(self.x, self.y, EntityType.HUNTER)
                 return True
-        return False
\ No newline at end of file
+        return False
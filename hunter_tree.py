@@ -0,0 +1,10 @@
+"""Compiled HunterDecisionModel tree.
+
+Generated by `python -m eldoria.ai.decision_tree`; do not edit by hand.
+"""
+
+FEATURE = (1, 2, -2, -2, 0, -2, -2)
+THRESHOLD = (0.09999999776482582, 1.5, -2.0, -2.0, 85.0, -2.0, -2.0)
+CHILDREN_LEFT = (1, 2, -1, -1, 5, -1, -1)
+CHILDREN_RIGHT = (4, 3, -1, -1, 6, -1, -1)
+ACTION = (1, 3, 4, 3, 1, 1, 2)
@@ -0,0 +1,121 @@
+"""Opt-in per-tick profiling for EldoriaSimulation.
+
+    simulation.instrumentation = Instrumentation()
+    ...run steps...
+    simulation.instrumentation.write_jsonl('ticks.jsonl')
+    print(simulation.instrumentation.summary())
+
+Each tick becomes one flat record: wall time per run_step phase (``<phase>_ms``),
+find_nearest and a_star call counts, a_star node expansions and decide_action
+predictions per action (``action_<NAME>``). With no instrumentation attached,
+run_step goes through NO_INSTRUMENTATION, whose hooks do nothing.
+"""
+import csv
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+import numpy as np
+
+from eldoria.enums import Action
+from eldoria.ai.pathfinding import SearchStats, collect_stats
+
+
+class NullInstrumentation:
+    """Instrumentation hooks that cost a call and nothing else"""
+    _context = nullcontext()
+
+    def tick(self, simulation):
+        return self._context
+
+    def time(self, phase: str, function, *args):
+        return function(*args)
+
+    def count_actions(self, decisions):
+        pass
+
+
+NO_INSTRUMENTATION = NullInstrumentation()
+
+
+class Instrumentation(NullInstrumentation):
+    """Collects one record per tick plus running aggregates"""
+
+    def __init__(self):
+        self.records: List[Dict[str, float]] = []
+        self._record: Dict[str, float] = {}
+        self._search = SearchStats()
+
+    @contextmanager
+    def tick(self, simulation):
+        self._search.reset()
+        queries = simulation.grid.nearest_queries
+        self._record = record = {'tick': simulation.tick + 1}
+        for action in Action:
+            record[f'action_{action.name}'] = 0
+        started = time.perf_counter()
+        with collect_stats(self._search):
+            yield
+        record['total_ms'] = 1000 * (time.perf_counter() - started)
+        record['find_nearest'] = simulation.grid.nearest_queries - queries
+        record['a_star_calls'] = self._search.calls
+        record['a_star_expansions'] = self._search.expansions
+        record['hunters'] = len(simulation.hunters)
+        record['treasures'] = len(simulation.treasures)
+        self.records.append(record)
+
+    def time(self, phase: str, function, *args):
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self._record[f'{phase}_ms'] = 1000 * (time.perf_counter() - started)
+
+    def count_actions(self, decisions):
+        for _, action in decisions:
+            self._record[f'action_{action.name}'] += 1
+
+    def columns(self) -> List[str]:
+        columns = []
+        for record in self.records:
+            columns.extend(key for key in record if key not in columns)
+        return columns
+
+    def write_jsonl(self, path: str):
+        with open(path, 'w') as f:
+            for record in self.records:
+                f.write(json.dumps(record) + '\n')
+
+    def write_csv(self, path: str):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns(), restval=0)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    def histograms(self, bins: int = 20) -> Dict[str, Dict[str, list]]:
+        """Per-metric histogram of the per-tick values: {'counts': [...], 'edges': [...]}"""
+        result = {}
+        for column in self.columns():
+            if column == 'tick':
+                continue
+            values = np.array([record.get(column, 0) for record in self.records], dtype=float)
+            counts, edges = np.histogram(values, bins=bins)
+            result[column] = {'counts': counts.tolist(), 'edges': edges.tolist()}
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total, mean, p50, p95 and max of every metric across ticks"""
+        result = {}
+        for column in self.columns():
+            if column == 'tick':
+                continue
+            values = np.array([record.get(column, 0) for record in self.records], dtype=float)
+            result[column] = {
+                'total': float(values.sum()),
+                'mean': float(values.mean()),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'max': float(values.max()),
+            }
+        return result
@@ -1,41 +1,66 @@
 import random
 from eldoria.enums import EntityType
-from eldoria.ai.pathfinding import a_star
+from eldoria.ai.pathfinding import PathCache
+
+# Energy rules, shared with the columnar store's whole-array update
+RETURN_ENERGY = 20  # At or below this a knight heads back to a hideout
+PATROL_COST = 10    # Spent per successful patrol step
+RECOVERY = 5        # Regained per tick spent returning
+MAX_ENERGY = 100
+
 
 class Knight:
-    def __init__(self, x: int, y: int):
+    __slots__ = ('x', 'y', 'energy', 'path_cache', 'rng')
+
+    def __init__(self, x: int, y: int, rng=None):
         self.x = x
         self.y = y
         self.energy = 100.0
+        self.path_cache = PathCache()
+        self.rng = rng if rng is not None else random
 
-    def patrol(self, grid):
+    def patrol(self, grid, navigator=None):
         """Knight's movement behavior"""
-        if self.energy <= 20:
-            self._return_to_garrison(grid)
-        else:
-            self._random_move(grid)
+        returning = self.energy <= RETURN_ENERGY
+        moved = self.move(grid, navigator, returning)
+        if returning:
+            self.energy = min(MAX_ENERGY, self.energy + RECOVERY)
+        elif moved:
+            self.energy = max(0, self.energy - PATROL_COST)
+
+    def move(self, grid, navigator=None, returning=False) -> bool:
+        """Take this tick's step without touching energy; True if the knight moved"""
+        if returning:
+            return self._return_to_garrison(grid, navigator)
+        return self._random_move(grid)
 
-    def _random_move(self, grid):
+    def _random_move(self, grid) -> bool:
         """Move randomly when patrolling"""
         directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        random.shuffle(directions)
+        self.rng.shuffle(directions)
         for dx, dy in directions:
             new_x = (self.x + dx) % grid.size
             new_y = (self.y + dy) % grid.size
-            if grid.cells[new_x][new_y] == EntityType.EMPTY:
-                grid.cells[self.x][self.y] = EntityType.EMPTY
+            if grid.get(new_x, new_y) == EntityType.EMPTY:
+                grid.add_entity(self.x, self.y, EntityType.EMPTY)
                 self.x, self.y = new_x, new_y
-                grid.cells[new_x][new_y] = EntityType.KNIGHT
-                self.energy = max(0, self.energy - 10)
-                break
+                grid.add_entity(new_x, new_y, EntityType.KNIGHT)
+                return True
+        return False
 
-    def _return_to_garrison(self, grid):
-        """Return to nearest hideout to recover energy"""
+    def _return_to_garrison(self, grid, navigator=None) -> bool:
+        """Step toward the nearest hideout to recover energy"""
         garrison = grid.find_nearest((self.x, self.y), EntityType.HIDEOUT)
         if garrison != (-1, -1):
-            path = a_star(grid, (self.x, self.y), garrison)
-            if path and len(path) > 0:
-                grid.cells[self.x][self.y] = EntityType.EMPTY
-                self.x, self.y = path[0]
-                grid.cells[self.x][self.y] = EntityType.KNIGHT
-        self.energy = min(100, self.energy + 5)
\ No newline at end of file
+            if navigator is not None:
+                step = navigator.next_step((self.x, self.y), garrison)
+                if step is not None and grid.get(*step) == EntityType.KNIGHT:
+                    step = None  # The shared field predates knights moved earlier this tick
+            else:
+                step = self.path_cache.next_step(grid, (self.x, self.y), garrison)
+            if step is not None:
+                grid.add_entity(self.x, self.y, EntityType.EMPTY)
+                self.x, self.y = step
+                grid.add_entity(self.x, self.y, EntityType.KNIGHT)
+                return True
+        return False
@@ -0,0 +1,477 @@
+"""Lockstep engine: many independent worlds advanced by one set of array operations per tick.
+
+Every world starts exactly like ``EldoriaSimulation(size, seed=seed, **options)``.
+After that, the grids live in one (B, size * size) code array and the agents in
+(B, hunters), (B, knights) and (B, treasures) arrays. Worlds that reach game
+over are masked out. Once fewer than half are still playing, the finished
+rows are dropped from every array.
+
+    engine = LockstepSimulation(range(10000), size=12)
+    engine.run(max_steps=1000)
+    results = engine.results()   # one batch.RunResult per world
+
+The tick applies the same rules as run_step. Within a phase, though, agents
+act simultaneously rather than one after another:
+- contested cells go to the lowest-numbered agent;
+- hunters and returning knights step along a shortest path through
+  non-knight cells toward the nearest target of the right kind, where
+  run_step plans an A* path to one specific target;
+- knights draw their patrol order from a NumPy generator seeded per world.
+Individual games therefore diverge from the scalar engine, but their
+statistics agree (see test_lockstep.py). Only the EldoriaSimulation options in
+WORLD_OPTIONS are honoured; the others change rules this engine does not
+implement and raise ValueError.
+"""
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from eldoria.enums import Action, EntityType, HunterSkill
+from eldoria.models.grid import DIRECTIONS, ENTITY_CODES
+from eldoria.models.knight import MAX_ENERGY, PATROL_COST, RECOVERY, RETURN_ENERGY
+from eldoria.models.store import MULTIPLIERS, NOWHERE, TREASURE_TYPE_CODES
+from eldoria.batch import RunResult
+
+EMPTY, TREASURE, HUNTER, KNIGHT, HIDEOUT = (ENTITY_CODES[entity_type] for entity_type in (
+    EntityType.EMPTY, EntityType.TREASURE, EntityType.HUNTER, EntityType.KNIGHT, EntityType.HIDEOUT))
+
+# Treasure states
+GROUND, CARRIED, GONE = 0, 1, 2
+
+# Per-world arrays, all indexed by row first; finished rows are dropped together
+ROW_ARRAYS = ('rows', 'codes', 'hideout_cells', 'hunter_alive', 'hunter_position', 'stamina', 'survival_timer',
+              'stamina_cost', 'carried', 'memory', 'knight_alive', 'knight_position', 'energy',
+              'treasure_state', 'treasure_position', 'treasure_type', 'decay_steps', 'ground_since', 'placed',
+              'tick', 'score', 'treasures_expired', 'game_over')
+NO_KEY = np.iinfo(np.int64).max
+COMPACT_BELOW = 0.5  # Drop finished rows once fewer than this fraction of rows is still playing
+WORLD_OPTIONS = frozenset({'knights', 'treasures', 'hunters_per_hideout', 'hideouts', 'placement', 'decay_rate',
+                           'decision_model'})
+
+
+def check_options(names: Iterable[str]):
+    """Raise ValueError for EldoriaSimulation options the lockstep rules do not implement"""
+    unsupported = sorted(set(names) - WORLD_OPTIONS)
+    if unsupported:
+        raise ValueError(f"the lockstep engine does not implement {', '.join(unsupported)}")
+
+
+class LockstepSimulation:
+    """B seeded worlds stepped together; see the module docstring for the rule set"""
+
+    def __init__(self, seeds: Iterable[int], size: int = 20, **options):
+        from eldoria.simulation import EldoriaSimulation
+
+        check_options(options)
+        self.seeds = list(seeds)
+        self.size = size
+        worlds = [EldoriaSimulation(size=size, seed=seed, **options) for seed in self.seeds]
+        B = len(worlds)
+        N = size * size
+        self._x_key, self._y_key = self._direction_keys(size)
+        self._cell_x, self._cell_y = (np.divmod(np.arange(N), size)[axis].astype(np.int32) for axis in (0, 1))
+        self._worlds = np.arange(B)[:, None]
+        self._neighbor_rows = None  # (4, N) neighbour table, built by the first _steps call
+        self._rng = np.random.default_rng(self.seeds)
+        self.rows = np.arange(B)  # World (index into seeds) held by each row
+        self._finished: List[Tuple[int, RunResult]] = []  # (world, result) of compacted-away rows
+
+        self.codes = np.stack([np.array(world.grid.codes, copy=True).reshape(-1) for world in worlds])
+        self.hideout_cells = np.zeros((B, N), dtype=bool)
+        for b, world in enumerate(worlds):
+            self.hideout_cells[b, [h.x * size + h.y for h in world.hideouts]] = True
+
+        H = max(len(world.hunters) for world in worlds)
+        self.hunter_alive = np.zeros((B, H), dtype=bool)
+        self.hunter_position = np.zeros((B, H), dtype=np.int64)
+        self.stamina = np.zeros((B, H))
+        self.survival_timer = np.zeros((B, H), dtype=np.int64)
+        self.stamina_cost = np.zeros((B, H))
+        self.carried = np.full((B, H), NOWHERE, dtype=np.int64)
+        self.memory = self._new_memory(B, H, N)
+        for b, world in enumerate(worlds):
+            for h, hunter in enumerate(world.hunters):
+                self.hunter_alive[b, h] = True
+                self.hunter_position[b, h] = hunter.x * size + hunter.y
+                self.stamina[b, h] = hunter.stamina
+                self.survival_timer[b, h] = hunter.survival_timer
+                self.stamina_cost[b, h] = 1 if hunter.skill == HunterSkill.ENDURANCE else 2
+
+        K = max(len(world.knights) for world in worlds)
+        self.knight_alive = np.zeros((B, K), dtype=bool)
+        self.knight_position = np.zeros((B, K), dtype=np.int64)
+        self.energy = np.zeros((B, K))
+        for b, world in enumerate(worlds):
+            for k, knight in enumerate(world.knights):
+                self.knight_alive[b, k] = True
+                self.knight_position[b, k] = knight.x * size + knight.y
+                self.energy[b, k] = knight.energy
+
+        T = max(len(world.treasures) for world in worlds)
+        self.treasure_state = np.full((B, T), GONE, dtype=np.int8)
+        self.treasure_position = np.zeros((B, T), dtype=np.int64)
+        self.treasure_type = np.zeros((B, T), dtype=np.int64)
+        self.decay_steps = np.zeros((B, T), dtype=np.int64)  # Banked while carried
+        self.ground_since = np.zeros((B, T), dtype=np.int64)
+        self.placed = np.zeros((B, T), dtype=np.int64)  # Drop order, for "first treasure on the cell"
+        for b, world in enumerate(worlds):
+            for t, treasure in enumerate(world.treasures):
+                self.treasure_state[b, t] = GROUND
+                self.treasure_position[b, t] = treasure.x * size + treasure.y
+                self.treasure_type[b, t] = TREASURE_TYPE_CODES[treasure.type]
+                self.placed[b, t] = t
+        self._placements = T
+
+        self.tick = np.zeros(B, dtype=np.int64)
+        self.score = np.zeros(B)
+        self.treasures_expired = np.zeros(B, dtype=np.int64)
+        self.game_over = np.zeros(B, dtype=bool)
+        self.decay_values = np.array(worlds[0].decay_table)
+        self.lifetime = len(self.decay_values) - 1
+        self.tree = worlds[0].decision_model.tree
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    @property
+    def grid(self) -> np.ndarray:
+        """(rows, size, size) view of the cell codes of the worlds in ``rows``"""
+        return self.codes.reshape(len(self.rows), self.size, self.size)
+
+    def run(self, max_steps: int = 1000):
+        """Step until every world is over or max_steps ticks have run"""
+        for _ in range(max_steps):
+            if self.game_over.all():
+                break
+            self.run_step()
+
+    def run_step(self):
+        """Advance every unfinished world by one tick"""
+        active = ~self.game_over
+        self.tick[active] += 1
+        self._expire_treasures(active)
+        observers = self._update_hunters(active)
+        actions = self._decide_actions(observers)
+        self._move_hunters(actions)
+        self._patrol_knights(active)
+        self._check_game_over(active)
+        if (~self.game_over).sum() < COMPACT_BELOW * len(self.rows):
+            self._compact()
+
+    def results(self) -> List[RunResult]:
+        """One RunResult per seed, in seed order"""
+        current = [(world, self._result(row)) for row, world in enumerate(self.rows.tolist())]
+        return [result for _, result in sorted(self._finished + current, key=lambda pair: pair[0])]
+
+    def _result(self, row: int) -> RunResult:
+        return RunResult(seed=self.seeds[self.rows[row]], score=float(self.score[row]), steps=int(self.tick[row]),
+                         hunters_surviving=int(self.hunter_alive[row].sum()),
+                         treasures_expired=int(self.treasures_expired[row]),
+                         game_over=bool(self.game_over[row]))
+
+    def _compact(self):
+        """Record the results of finished worlds and drop their rows from every array"""
+        self._finished.extend((int(self.rows[row]), self._result(row)) for row in np.flatnonzero(self.game_over))
+        playing = ~self.game_over
+        for name in ROW_ARRAYS:
+            setattr(self, name, getattr(self, name)[playing])
+        self._worlds = np.arange(len(self.rows))[:, None]
+
+    # Treasures
+
+    def _decay(self) -> np.ndarray:
+        """Decay steps of every treasure so far"""
+        on_ground = self.treasure_state == GROUND
+        elapsed = np.where(on_ground, self.tick[:, None] - self.ground_since, 0)
+        return np.minimum(self.decay_steps + elapsed, self.lifetime)
+
+    def _values(self) -> np.ndarray:
+        """Current value, with type multiplier, of every treasure"""
+        return self.decay_values[self._decay()] * MULTIPLIERS[self.treasure_type]
+
+    def _expire_treasures(self, active: np.ndarray):
+        expired = active[:, None] & (self.treasure_state == GROUND) & (self._decay() >= self.lifetime)
+        worlds, treasures = np.nonzero(expired)
+        self.codes[worlds, self.treasure_position[worlds, treasures]] = EMPTY
+        self._forget(worlds, self.treasure_position[worlds, treasures])
+        self.treasure_state[expired] = GONE
+        self.treasures_expired += expired.sum(axis=1)
+
+    def _ground_by_cell(self, reduce, fill: int) -> np.ndarray:
+        """(B, N) drop order of the first (reduce=np.minimum) or last (np.maximum) treasure lying on each cell"""
+        by_cell = np.full(self.codes.shape, fill, dtype=np.int64)
+        worlds, treasures = np.nonzero(self.treasure_state == GROUND)
+        reduce.at(by_cell, (worlds, self.treasure_position[worlds, treasures]), self.placed[worlds, treasures])
+        return by_cell
+
+    # Hunters
+
+    def _update_hunters(self, active: np.ndarray) -> np.ndarray:
+        """Stamina, pickups, deposits and knight encounters; returns the (B, H) mask of hunters that act"""
+        alive = self.hunter_alive & active[:, None]
+        worlds = self._worlds
+        position = self.hunter_position
+
+        # Exhausted hunters count down and then leave, losing what they carry
+        exhausted = alive & (self.stamina <= 0)
+        self.survival_timer[exhausted] -= 1
+        dead = exhausted & (self.survival_timer <= 0)
+        self.codes[np.nonzero(dead)[0], position[dead]] = EMPTY
+        lost = self.carried[dead]
+        self.treasure_state[np.nonzero(dead)[0][lost >= 0], lost[lost >= 0]] = GONE
+        self.carried[dead] = NOWHERE
+        self.hunter_alive[dead] = False
+
+        hunters = alive & ~exhausted
+        in_hideout = self.hideout_cells[worlds, position]
+        resting = hunters & in_hideout
+        walking = hunters & ~in_hideout
+        self.stamina[resting] = np.minimum(100, self.stamina[resting] + 1)
+        self.stamina[walking] = np.maximum(0, self.stamina[walking] - self.stamina_cost[walking])
+
+        # Pick up the first treasure on the hunter's cell
+        first = self._ground_by_cell(np.minimum, np.iinfo(np.int64).max)[worlds, position]
+        picking = hunters & (self.carried == NOWHERE) & (first != np.iinfo(np.int64).max)
+        pick_worlds, pick_hunters = np.nonzero(picking)
+        if len(pick_worlds):
+            treasure = (self.placed[pick_worlds] == first[pick_worlds, pick_hunters][:, None]).argmax(axis=1)
+            self.decay_steps[pick_worlds, treasure] = self._decay()[pick_worlds, treasure]
+            self.treasure_state[pick_worlds, treasure] = CARRIED
+            self.carried[pick_worlds, pick_hunters] = treasure
+            self.codes[pick_worlds, position[pick_worlds, pick_hunters]] = EMPTY
+            self._forget(pick_worlds, position[pick_worlds, pick_hunters])
+
+        # Deposit in a hideout
+        depositing = hunters & in_hideout & (self.carried != NOWHERE)
+        dep_worlds, dep_hunters = np.nonzero(depositing)
+        treasure = self.carried[dep_worlds, dep_hunters]
+        np.add.at(self.score, dep_worlds, self._values()[dep_worlds, treasure])
+        self.treasure_state[dep_worlds, treasure] = GONE
+        self.carried[depositing] = NOWHERE
+
+        # Knight encounters: drop the treasure and lose stamina
+        knight_cells = np.zeros(self.codes.shape, dtype=bool)
+        knight_cells[np.nonzero(self.knight_alive)[0], self.knight_position[self.knight_alive]] = True
+        hit = hunters & knight_cells[worlds, position]
+        dropping = hit & (self.carried != NOWHERE)
+        drop_worlds, drop_hunters = np.nonzero(dropping)
+        if len(drop_worlds):
+            treasure = self.carried[drop_worlds, drop_hunters]
+            cells = position[drop_worlds, drop_hunters]
+            self.treasure_state[drop_worlds, treasure] = GROUND
+            self.treasure_position[drop_worlds, treasure] = cells
+            self.ground_since[drop_worlds, treasure] = self.tick[drop_worlds]
+            self.placed[drop_worlds, treasure] = self._placements + np.arange(len(drop_worlds))
+            self._placements += len(drop_worlds)
+            self.codes[drop_worlds, cells] = TREASURE
+            self._forget(drop_worlds, cells)
+            self.carried[dropping] = NOWHERE
+        self.stamina[hit] = np.maximum(0, self.stamina[hit] - 20)
+        self.survival_timer[hit & (self.stamina <= 0)] = 3
+
+        return hunters & ~in_hideout & (self.stamina > 0)
+
+    def _decide_actions(self, observers: np.ndarray) -> np.ndarray:
+        """(B, H) Action values for observing hunters (0 for the rest), from one tree evaluation"""
+        worlds = self._worlds
+        position = self.hunter_position
+        size = self.size
+
+        # Remember the value of the last-dropped treasure on each adjacent treasure cell
+        last = self._ground_by_cell(np.maximum, -1)
+        cell_value = np.zeros(self.codes.shape)
+        ground_worlds, ground_treasures = np.nonzero(self.treasure_state == GROUND)
+        cells = self.treasure_position[ground_worlds, ground_treasures]
+        top = last[ground_worlds, cells] == self.placed[ground_worlds, ground_treasures]
+        cell_value[ground_worlds[top], cells[top]] = self._values()[ground_worlds[top], ground_treasures[top]]
+        adjacent = self._adjacent(position)  # (B, H, 4)
+        visible = observers[:, :, None] & (self.codes[worlds[:, :, None], adjacent] == TREASURE) \
+            & (last[worlds[:, :, None], adjacent] >= 0)
+        obs_worlds, obs_hunters, sides = np.nonzero(visible)
+        seen = adjacent[obs_worlds, obs_hunters, sides]
+        self._remember(obs_worlds, obs_hunters, seen, cell_value[obs_worlds, seen])
+
+        nearest_treasure = self._nearest_cell(position, TREASURE, observers)
+        nearest_knight = self._nearest_cell(position, KNIGHT, observers)
+        hunter_worlds, hunter_ids = np.nonzero(observers)
+        here = position[hunter_worlds, hunter_ids]
+        treasure = nearest_treasure[hunter_worlds, hunter_ids]
+        knight = nearest_knight[hunter_worlds, hunter_ids]
+        distance = np.hypot(here // size - knight // size, here % size - knight % size)
+        states = np.column_stack([
+            self.stamina[hunter_worlds, hunter_ids],
+            self._recall(hunter_worlds, hunter_ids, np.maximum(treasure, 0)),
+            np.where(knight >= 0, distance, np.inf),
+        ])
+
+        actions = np.zeros(observers.shape, dtype=np.int64)
+        if len(states):
+            decided = self.tree.predict_batch(states)
+            decided = np.where(np.isin(decided, [action.value for action in Action]), decided, Action.REST.value)
+            actions[hunter_worlds, hunter_ids] = np.where(treasure >= 0, decided, Action.REST.value)
+        return actions
+
+    def _move_hunters(self, actions: np.ndarray):
+        seeking = (actions == Action.MOVE.value) & (self.carried == NOWHERE)
+        homing = (actions == Action.REST.value) | ((actions == Action.MOVE.value) & ~seeking)
+        step = np.full(actions.shape, -1)
+        for wanted, code in ((seeking, TREASURE), (homing, HIDEOUT)):
+            if wanted.any():
+                step = np.where(wanted, self._step_toward(self.hunter_position, code, wanted), step)
+        moving = (seeking | homing) & (step >= 0)
+        walkable = np.isin(self.codes[self._worlds, np.maximum(step, 0)], (EMPTY, TREASURE))
+        self._claim(moving & walkable, step, self.hunter_position, HUNTER)
+
+    # Hunter memory
+
+    @staticmethod
+    def _new_memory(B: int, H: int, N: int):
+        """Remembered value of every cell for every hunter; only ever read as a float32 tree input"""
+        return np.zeros((B, H, N), dtype=np.float32)
+
+    def _remember(self, worlds: np.ndarray, hunters: np.ndarray, cells: np.ndarray, values: np.ndarray):
+        self.memory[worlds, hunters, cells] = values
+
+    def _recall(self, worlds: np.ndarray, hunters: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        return self.memory[worlds, hunters, cells]
+
+    def _forget(self, worlds: np.ndarray, cells: np.ndarray):
+        """Drop every hunter's memory of cells whose treasure was lifted or dropped, as run_step's stamps do"""
+        self.memory[worlds, :, cells] = 0
+
+    # Knights
+
+    def _patrol_knights(self, active: np.ndarray):
+        knights = self.knight_alive & active[:, None]
+        returning = knights & (self.energy <= RETURN_ENERGY)
+        patrolling = knights & ~returning
+        position = self.knight_position
+        worlds = self._worlds
+
+        moved = np.zeros(position.shape, dtype=bool)
+        if returning.any():
+            home = self._step_toward(position, HIDEOUT, returning)
+            moved = self._claim(returning & (home >= 0), home, position, KNIGHT)
+
+        # Patrol: first empty neighbour in a shuffled direction order, lowest knight first on conflicts
+        order = self._rng.random(position.shape + (4,)).argsort(axis=2)
+        candidates = np.take_along_axis(self._adjacent(position), order, axis=2)
+        pending = patrolling.copy()
+        for side in range(4):
+            target = candidates[:, :, side]
+            free = pending & (self.codes[worlds, target] == EMPTY)
+            won = self._claim(free, target, position, KNIGHT)
+            moved |= won
+            pending &= ~won
+
+        self.energy[returning] = np.minimum(MAX_ENERGY, self.energy[returning] + RECOVERY)
+        paid = patrolling & moved
+        self.energy[paid] = np.maximum(0, self.energy[paid] - PATROL_COST)
+
+    # Shared helpers
+
+    def _claim(self, wants: np.ndarray, target: np.ndarray, position: np.ndarray, code: int) -> np.ndarray:
+        """Move agents onto their target cells; the lowest-numbered agent wins a contested cell.
+
+        Vacated cells become empty and claimed cells take ``code``. Returns the (B, A) mask of agents that moved.
+        """
+        worlds, agents = np.nonzero(wants)
+        cells = target[worlds, agents]
+        _, first = np.unique(worlds * self.codes.shape[1] + cells, return_index=True)
+        worlds, agents, cells = worlds[first], agents[first], cells[first]
+        self.codes[worlds, position[worlds, agents]] = EMPTY
+        self.codes[worlds, cells] = code
+        position[worlds, agents] = cells
+        moved = np.zeros(wants.shape, dtype=bool)
+        moved[worlds, agents] = True
+        return moved
+
+    def _adjacent(self, cells: np.ndarray) -> np.ndarray:
+        """(..., 4) flat toroidal neighbours of cells in DIRECTIONS order"""
+        size = self.size
+        x, y = np.divmod(cells, size)
+        return np.stack([((x + dx) % size) * size + (y + dy) % size for dx, dy in DIRECTIONS], axis=-1)
+
+    def _nearest_cell(self, position: np.ndarray, code: int, wanted: np.ndarray) -> np.ndarray:
+        """(B, A) cell Grid.find_nearest returns for the TREASURE or KNIGHT code, -1 if none or not wanted"""
+        if code == TREASURE:
+            candidates, valid = self.treasure_position, self.treasure_state == GROUND
+        else:
+            candidates, valid = self.knight_position, self.knight_alive
+        nearest = self._nearest(position, candidates, valid & (self.codes[self._worlds, candidates] == code))
+        return np.where(wanted, nearest, -1)
+
+    def _step_toward(self, position: np.ndarray, code: int, wanted: np.ndarray) -> np.ndarray:
+        """(B, A) first cell of a knight-avoiding shortest path from each wanted agent to the nearest code cell"""
+        return self._steps(self.codes == code, self.codes == KNIGHT, position, wanted)
+
+    def _nearest(self, position: np.ndarray, candidates: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """(B, A) cell Grid.find_nearest would return among the valid (B, C) candidate cells, -1 if none.
+
+        find_nearest's BFS returns the target whose lexicographically smallest
+        shortest path (by DIRECTIONS index) comes first. Without walls that path
+        is the sorted move list, so targets rank by (length, -moves in direction
+        0, -moves in direction 1, -moves in direction 2).
+        """
+        row, column = self._cell_x, self._cell_y
+        dx = row[candidates][:, None, :] - row[position][:, :, None]
+        dy = column[candidates][:, None, :] - column[position][:, :, None]
+        key = self._x_key[dx] + self._y_key[dy]
+        key[~np.broadcast_to(valid[:, None, :], key.shape)] = NO_KEY
+        best = key.argmin(axis=2)
+        found = np.take_along_axis(key, best[:, :, None], axis=2)[:, :, 0] != NO_KEY
+        return np.where(found, np.take_along_axis(candidates, best, axis=1), -1)
+
+    @staticmethod
+    def _direction_keys(size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-axis parts of the _nearest ranking key, indexed by the coordinate difference.
+
+        Key order is (length, -moves in direction 0, -in direction 1, -in direction 2);
+        x offsets contribute directions 0/1, y offsets 2/3. Half-way across the wrap
+        both ways are shortest and the path takes direction 0 (or 2).
+        """
+        offset = np.arange(2 * size) % size  # Negative differences index from the end
+        negative = np.where(2 * offset >= size, size - offset, 0)  # Direction 0 (x) or 2 (y)
+        positive = np.where(2 * offset < size, offset, 0)          # Direction 1 (x) or 3 (y)
+        base = size + 1
+        x_key = (negative + positive) * base ** 3 + (size - negative) * base ** 2 + (size - positive) * base
+        y_key = (negative + positive) * base ** 3 + (size - negative)
+        return x_key, y_key
+
+    def _steps(self, targets: np.ndarray, walls: np.ndarray, position: np.ndarray,
+               wanted: np.ndarray) -> np.ndarray:
+        """(B, A) next cell on a shortest non-wall path from each position to the nearest target, -1 if none.
+
+        A multi-source search grows out of the targets one level at a time and
+        records the level at which each agent's neighbours are reached; the step is
+        the nearest neighbour, first in DIRECTIONS order on ties. It stops once every
+        wanted agent has a reached neighbour, since farther cells cannot change the
+        step, and runs cell-major, (N, B), so every lookup gathers contiguous rows.
+        """
+        if self._neighbor_rows is None:
+            self._neighbor_rows = np.ascontiguousarray(self._adjacent(np.arange(self.size * self.size)).T)
+        neighbors = self._neighbor_rows  # (4, N)
+        columns = np.arange(len(position))
+        open_cells = np.ascontiguousarray(~walls.T)
+        reached = np.ascontiguousarray(targets.T) & open_cells
+        adjacent = np.ascontiguousarray(self._adjacent(position).transpose(1, 2, 0))  # (A, 4, B)
+        ahead = np.where(reached[adjacent, columns], 0, NO_KEY)
+        pending = wanted.T & (ahead == NO_KEY).all(axis=1)
+        frontier = reached
+        level = 0
+        while pending.any() and frontier.any():
+            level += 1
+            grown = frontier[neighbors[0]] | frontier[neighbors[1]] | frontier[neighbors[2]] | frontier[neighbors[3]]
+            frontier = grown & open_cells & ~reached
+            reached |= frontier
+            hit = frontier[adjacent, columns] & (ahead == NO_KEY)
+            ahead = np.where(hit, level, ahead)
+            pending &= ~hit.any(axis=1)
+        best = ahead.argmin(axis=1)[:, None, :]
+        found = np.take_along_axis(ahead, best, axis=1)[:, 0] != NO_KEY
+        return np.where(found, np.take_along_axis(adjacent, best, axis=1)[:, 0], -1).T
+
+    def _check_game_over(self, active: np.ndarray):
+        treasure_left = (self.treasure_state != GONE).any(axis=1)
+        hunters_left = self.hunter_alive.any(axis=1)
+        self.game_over |= active & (~treasure_left | ~hunters_left)
@@ -1,32 +1,32 @@
-import tkinter as tk
-from tkinter import messagebox
 from eldoria.simulation import EldoriaSimulation
-from eldoria.enums import EntityType, TreasureType
+from eldoria.enums import EntityType
+from eldoria.renderer import COLORS, GridRenderer
 
 class EldoriaGUI:
-    COLORS = {
-        EntityType.EMPTY: 'white',
-        EntityType.TREASURE: {
-            TreasureType.BRONZE: '#CD7F32',
-            TreasureType.SILVER: '#C0C0C0',
-            TreasureType.GOLD: '#FFD700'
-        },
-        EntityType.HUNTER: 'blue',
-        EntityType.KNIGHT: 'red',
-        EntityType.HIDEOUT: 'green'
-    }
-
-    def __init__(self, root):
+    COLORS = COLORS
+    FRAME_INTERVAL = 50  # ms between redraws, independent of the step rate
+
+    def __init__(self, root, replay=None, remote=None):
+        """replay is an eldoria.replay.ReplayReader to play back instead of running a simulation;
+        remote is an eldoria.server.RemoteWorld to draw from a server's stream"""
         self.root = root
-        self.sim = EldoriaSimulation(size=15)
+        self.replay = replay
+        self.remote = remote
+        self.sim = self.new_simulation()
         self.setup_ui()
         self.running = False
         self.speed = 300  # ms between steps
         self.game_speed = 1.0
+        self.game_over_shown = False
+        self.renderer = GridRenderer(self.canvas, colors=self.COLORS)
+        self.renderer.attach(self.sim)
         self.draw_world()
+        self.root.after(self.FRAME_INTERVAL, self.render_frame)
 
     def setup_ui(self):
         """Initialize GUI components"""
+        import tkinter as tk  # deferred so headless users of this module never load Tk
+
         self.canvas = tk.Canvas(self.root, width=600, height=600, bg='white')
         self.canvas.pack()
 
@@ -60,54 +60,75 @@ class EldoriaGUI:
         self.root.bind('<space>', lambda e: self.toggle_simulation())
 
     def draw_world(self):
-        """Draw the current game state"""
-        self.canvas.delete("all")
-        cell_size = 600 // self.sim.grid.size
-
-        # Draw grid cells
-        for x in range(self.sim.grid.size):
-            for y in range(self.sim.grid.size):
-                entity = self.sim.grid.cells[x][y]
-                color = self.COLORS.get(entity, 'white')
-
-                # Handle treasure with value display
-                if entity == EntityType.TREASURE:
-                    for treasure in self.sim.treasures:
-                        if (x, y) == (treasure.x, treasure.y):
-                            color = self.COLORS[EntityType.TREASURE][treasure.type]
-                            # Draw treasure value
-                            self.canvas.create_text(
-                                x * cell_size + cell_size//2,
-                                y * cell_size + cell_size//2,
-                                text=f"{treasure.value:.1f}",
-                                fill='black'
-                            )
-                            break
-
-                # Draw cell
-                self.canvas.create_rectangle(
-                    x * cell_size, y * cell_size,
-                    (x + 1) * cell_size, (y + 1) * cell_size,
-                    fill=color, outline='black'
-                )
+        """Redraw the cells that changed since the last frame"""
+        self.renderer.draw()
 
         # Update displays
         self.score_label.config(text=f"Score: {int(self.sim.score)}")
+        if self.remote is None:
+            self.sim.settle_hunters()
         if self.sim.hunters:
             stamina = int(self.sim.hunters[0].stamina)
             self.stamina_label.config(text=f"Stamina: {stamina}%")
 
         # Game over message
-        if self.sim.game_over:
+        if self.sim.game_over and not self.game_over_shown:
+            from tkinter import messagebox
             self.running = False
+            self.game_over_shown = True
             messagebox.showinfo(
                 "Game Over",
                 f"Final Score: {int(self.sim.score)}\n\n"
                 "Press Reset to play again"
             )
 
+    def new_simulation(self):
+        """A fresh game, the first recorded tick of a replay, or the streamed world"""
+        if self.remote is not None:
+            return self.remote
+        if self.replay is not None:
+            return self.replay.seek(self.replay.first_tick)
+        return EldoriaSimulation(size=15)
+
+    def advance(self):
+        """One step: run the simulation, or show the next recorded tick of a replay"""
+        if self.remote is not None:
+            return  # The server steps streamed worlds
+        if self.replay is None:
+            self.sim.run_step()
+            return
+        tick = self.replay.tick_after(self.sim.tick)
+        if tick is None:
+            self.running = False
+        else:
+            self.replay.load(self.sim, tick)
+
+    def step_replay(self, direction):
+        """Move a paused or running replay one recorded tick forward (1) or back (-1)"""
+        if direction > 0:
+            tick = self.replay.tick_after(self.sim.tick)
+        else:
+            tick = self.replay.tick_before(self.sim.tick)
+        if tick is not None:
+            self.replay.load(self.sim, tick)
+            self.game_over_shown = self.game_over_shown and self.sim.game_over
+            self.draw_world()
+
+    def render_frame(self):
+        """Frame loop; steps taken (or frames streamed) since the previous frame are drawn together"""
+        if self.remote is not None:
+            self.remote.poll()
+        self.draw_world()
+        self.root.after(self.FRAME_INTERVAL, self.render_frame)
+
     def move_hunter(self, dx, dy):
-        """Move hunter in specified direction"""
+        """Move hunter in specified direction (scrub through the ticks of a replay)"""
+        if self.replay is not None:
+            if dx:
+                self.step_replay(dx)
+            return
+        if self.remote is not None:
+            return
         if self.sim.game_over or not self.sim.hunters or not self.running:
             return
 
@@ -116,14 +137,14 @@ class EldoriaGUI:
         new_y = (hunter.y + dy) % self.sim.grid.size
 
         # Check if target cell is walkable
-        target_entity = self.sim.grid.cells[new_x][new_y]
+        target_entity = self.sim.grid.get(new_x, new_y)
         if target_entity not in [EntityType.EMPTY, EntityType.TREASURE]:
             return
 
         # Update positions
-        self.sim.grid.cells[hunter.x][hunter.y] = EntityType.EMPTY
+        self.sim.grid.add_entity(hunter.x, hunter.y, EntityType.EMPTY)
         hunter.x, hunter.y = new_x, new_y
-        self.sim.grid.cells[new_x][new_y] = EntityType.HUNTER
+        self.sim.grid.add_entity(new_x, new_y, EntityType.HUNTER)
 
         # Run simulation step
         self.sim.run_step()
@@ -147,15 +168,14 @@ class EldoriaGUI:
             self.start_simulation()
 
     def run_simulation(self):
-        """Run simulation steps at intervals"""
+        """Run simulation steps at intervals; render_frame draws them"""
         if self.running and not self.sim.game_over:
-            self.sim.run_step()
-            self.draw_world()
+            self.advance()
             self.root.after(int(self.speed / self.game_speed), self.run_simulation)
 
     def increase_speed(self):
         """Increase simulation speed"""
-        self.game_speed = min(3.0, self.game_speed + 0.5)
+        self.game_speed = min(10.0, self.game_speed + 0.5)
 
     def decrease_speed(self):
         """Decrease simulation speed"""
@@ -164,12 +184,33 @@ class EldoriaGUI:
     def reset_simulation(self):
         """Reset simulation to initial state"""
         self.running = False
-        self.sim = EldoriaSimulation(size=15)
+        self.sim = self.new_simulation()
         self.game_speed = 1.0
+        self.game_over_shown = False
+        self.renderer.attach(self.sim)
         self.draw_world()
 
 if __name__ == "__main__":
+    import argparse
+    import tkinter as tk
+
+    parser = argparse.ArgumentParser(description="Knights of Eldoria")
+    parser.add_argument('--replay', metavar='PATH', help="play back a recorded game instead of simulating")
+    parser.add_argument('--connect', metavar='HOST:PORT', help="draw a world streamed by eldoria.server")
+    parser.add_argument('--world', help="world to watch with --connect (default: the server's first)")
+    args = parser.parse_args()
+    replay = remote = None
+    title = "Knights of Eldoria"
+    if args.connect:
+        from eldoria.server import RemoteWorld
+        host, _, port = args.connect.rpartition(':')
+        remote = RemoteWorld.connect(host or '127.0.0.1', int(port), args.world)
+        title += f" - streaming from {args.connect}"
+    elif args.replay:
+        from eldoria.replay import ReplayReader
+        replay = ReplayReader(args.replay)
+        title += f" - replay of {args.replay}"
     root = tk.Tk()
-    root.title("Knights of Eldoria")
-    gui = EldoriaGUI(root)
-    root.mainloop()
\ No newline at end of file
+    root.title(title)
+    gui = EldoriaGUI(root, replay, remote)
+    root.mainloop()
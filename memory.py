@@ -0,0 +1,66 @@
+"""Bounded hunter memory of treasure values, keyed by flat cell index (x * size + y).
+
+Every entry carries the cell's treasure stamp from when it was written. The
+simulation bumps a cell's stamp whenever a treasure there is picked up,
+expires or is dropped. A recall compares its entry with the current stamp and
+forgets the entry if the treasure it describes is gone; nothing is visited when
+a stamp changes. Once a memory is full, the least recently used entry makes
+room for a new one.
+
+With EldoriaSimulation(team_memory=True), the hunters registered with a
+hideout (Hideout.hunters) all read and write the hideout's one shared memory
+instead of each keeping a copy.
+"""
+from collections import OrderedDict
+from typing import Iterator, Mapping, Tuple
+
+MEMORY_CAPACITY = 16  # Cells one hunter remembers; a hideout's shared memory gets this many per member
+STALE = -1  # Stamp that matches no cell, for restoring entries that were already stale
+
+
+class HunterMemory:
+    """LRU map of cell -> (value, stamp) with lazy validation against the current stamps"""
+    __slots__ = ('capacity', '_entries')
+
+    def __init__(self, capacity: int = MEMORY_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._entries: 'OrderedDict[int, Tuple[float, int]]' = OrderedDict()  # Least recently used first
+
+    def remember(self, cell: int, value: float, stamp: int):
+        """Store a value seen at a cell whose treasure stamp is currently stamp"""
+        entries = self._entries
+        if cell in entries:
+            entries.move_to_end(cell)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        entries[cell] = (value, stamp)
+
+    def recall(self, cell: int, stamp: int) -> float:
+        """Remembered value at a cell, or 0 if it was never seen or its treasure has changed since"""
+        entry = self._entries.get(cell)
+        if entry is None:
+            return 0
+        if entry[1] != stamp:
+            del self._entries[cell]
+            return 0
+        self._entries.move_to_end(cell)
+        return entry[0]
+
+    def entries(self, stamps: Mapping[int, int]) -> Iterator[Tuple[int, float, bool]]:
+        """(cell, value, stale) of every entry against the current stamps, least recently used first.
+
+        Stale entries still hold their place until recalled or evicted.
+        """
+        for cell, (value, stamp) in self._entries.items():
+            yield cell, value, stamps.get(cell, 0) != stamp
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, cell: int) -> bool:
+        return cell in self._entries
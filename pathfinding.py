@@ -1,32 +1,163 @@
-import math
-from typing import List, Tuple, Dict
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Optional
 from heapq import heappop, heappush
 from eldoria.enums import EntityType
 
-def a_star(grid, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
-    """A* pathfinding algorithm"""
-    open_set = []
-    heappush(open_set, (0, start))
-    came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
-    g_score = {start: 0}
-    f_score = {start: math.dist(start, goal)}
+
+class SearchStats:
+    """Counters for a_star calls and node expansions"""
+
+    def __init__(self):
+        self.calls = 0
+        self.expansions = 0
+
+    def reset(self):
+        self.calls = 0
+        self.expansions = 0
+
+
+_active_stats: Optional[SearchStats] = None
+
+
+@contextmanager
+def collect_stats(stats: SearchStats):
+    """Count every a_star call made inside the block into stats"""
+    global _active_stats
+    previous, _active_stats = _active_stats, stats
+    try:
+        yield stats
+    finally:
+        _active_stats = previous
+
+
+def wrapped_manhattan(a: Tuple[int, int], b: Tuple[int, int], size: int) -> int:
+    """Manhattan distance on a torus; admissible for get_adjacent's wrap-around moves"""
+    dx = abs(a[0] - b[0]) % size
+    dy = abs(a[1] - b[1]) % size
+    return min(dx, size - dx) + min(dy, size - dy)
+
+
+MAX_EXPANSIONS = 1 << 16  # a_star's default search budget; only very large worlds reach it
+
+
+def a_star(grid, start: Tuple[int, int], goal: Tuple[int, int],
+           max_expansions: Optional[int] = MAX_EXPANSIONS) -> List[Tuple[int, int]]:
+    """A* pathfinding algorithm.
+
+    After max_expansions nodes (None: no limit) the search gives up and returns
+    the path to the expanded node closest to the goal, so a far goal is
+    approached in legs instead of searched for all at once.
+    """
+    size = grid.size
+    start_index = (start[0] % size) * size + start[1] % size
+    goal_index = (goal[0] % size) * size + goal[1] % size
+    gx, gy = divmod(goal_index, size)
+
+    open_set = [(0, start_index)]
+    came_from: Dict[int, int] = {}
+    g_score = {start_index: 0}
+    closed = set()
+    expansions = 0
+    closest, closest_distance = start_index, size  # Expanded node nearest the goal, for an exhausted budget
 
     while open_set:
         _, current = heappop(open_set)
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            return path[::-1]
-
-        for neighbor, cell_type in grid.get_adjacent(*current).items():
-            if cell_type == EntityType.KNIGHT:  # Avoid knights
+        if current in closed:
+            continue
+        if current == goal_index:
+            break
+        closed.add(current)
+        expansions += 1
+
+        x, y = divmod(current, size)
+        if max_expansions is not None:
+            dx, dy = abs(x - gx), abs(y - gy)
+            distance = min(dx, size - dx) + min(dy, size - dy)
+            if distance < closest_distance:
+                closest, closest_distance = current, distance
+            if expansions >= max_expansions:
+                current = closest
+                break
+        tentative_g = g_score[current] + 1
+        for nx, ny in (((x - 1) % size, y), ((x + 1) % size, y), (x, (y - 1) % size), (x, (y + 1) % size)):
+            if grid.get(nx, ny) == EntityType.KNIGHT:  # Avoid knights
+                continue
+            neighbor = nx * size + ny
+            if neighbor in closed or tentative_g >= g_score.get(neighbor, tentative_g + 1):
                 continue
-            tentative_g = g_score[current] + 1
-            if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g
-                f_score[neighbor] = tentative_g + math.dist(neighbor, goal)
-                heappush(open_set, (f_score[neighbor], neighbor))
-    return []  # No path found
\ No newline at end of file
+            came_from[neighbor] = current
+            g_score[neighbor] = tentative_g
+            dx, dy = abs(nx - gx), abs(ny - gy)
+            heappush(open_set, (tentative_g + min(dx, size - dx) + min(dy, size - dy), neighbor))
+    else:
+        current = None  # No path found
+
+    path = []
+    while current in came_from:
+        path.append(divmod(current, size))
+        current = came_from[current]
+
+    if _active_stats is not None:
+        _active_stats.calls += 1
+        _active_stats.expansions += expansions
+    return path[::-1]
+
+
+class PathCache:
+    """Per-agent path kept across ticks and repaired around knights instead of recomputed"""
+    __slots__ = ('goal', 'path', '_knight_generation')
+
+    def __init__(self):
+        self.goal: Optional[Tuple[int, int]] = None
+        self.path: List[Tuple[int, int]] = []
+        self._knight_generation = -1
+
+    def clear(self):
+        self.goal = None
+        self.path = []
+
+    def is_stale(self, grid) -> bool:
+        """True when knights moved since the path was last checked against them"""
+        return self._knight_generation != grid.generation(EntityType.KNIGHT)
+
+    def restore(self, grid, goal: Optional[Tuple[int, int]], path: List[Tuple[int, int]], stale: bool):
+        """Reload a cache captured with goal, path and is_stale(), for snapshots"""
+        self.goal = goal
+        self.path = path
+        self._knight_generation = -1 if stale else grid.generation(EntityType.KNIGHT)
+
+    def next_step(self, grid, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """First step of a knight-free path from start to goal, or None if there is none"""
+        if goal != self.goal or not self._follow(start, grid.size):
+            self._recompute(grid, start, goal)
+        elif grid.generation(EntityType.KNIGHT) != self._knight_generation:
+            self._repair(grid, start, goal)
+        return self.path[0] if self.path else None
+
+    def _follow(self, start: Tuple[int, int], size: int) -> bool:
+        """Drop the steps already taken; False when start is no longer on the path"""
+        if start in self.path:
+            del self.path[:self.path.index(start) + 1]
+        return bool(self.path) and wrapped_manhattan(start, self.path[0], size) == 1
+
+    def _recompute(self, grid, start, goal):
+        self.goal = goal
+        self.path = a_star(grid, start, goal)
+        self._knight_generation = grid.generation(EntityType.KNIGHT)
+
+    def _repair(self, grid, start, goal):
+        """Splice a detour around the first knight that moved onto the path"""
+        self._knight_generation = grid.generation(EntityType.KNIGHT)
+        path = self.path
+        blocked = next((i for i, (x, y) in enumerate(path) if grid.get(x, y) == EntityType.KNIGHT), None)
+        if blocked is None:
+            return
+        rejoin = next((i for i in range(blocked + 1, len(path)) if grid.get(*path[i]) != EntityType.KNIGHT), None)
+        if rejoin is None:
+            self._recompute(grid, start, goal)
+            return
+        detour = a_star(grid, path[blocked - 1] if blocked else start, path[rejoin])
+        if not detour:
+            self._recompute(grid, start, goal)
+            return
+        self.path = path[:blocked] + detour + path[rejoin + 1:]
@@ -0,0 +1,75 @@
+"""Hideout placement: well-spread centers on a size x size grid.
+
+``lloyd_centers`` runs k-means++ seeding and Lloyd iterations on a coarse lattice
+of at most SAMPLE x SAMPLE cells, so its cost does not grow with the grid area
+and it needs no sklearn. ``kmeans_centers`` is the original full-grid
+sklearn KMeans, kept for comparison.
+"""
+import math
+import random
+from typing import List, Tuple
+
+import numpy as np
+
+SAMPLE = 64  # Lattice points per axis used by lloyd_centers
+ITERATIONS = 30
+
+
+def _lattice(size: int, count: int) -> np.ndarray:
+    """Cell coordinates of an evenly strided lattice with room for count distinct centers"""
+    per_axis = min(size, max(SAMPLE, 2 * math.isqrt(count) + 2))
+    axis = np.unique((np.arange(per_axis) * size) // per_axis)
+    xs, ys = np.meshgrid(axis, axis, indexing='ij')
+    return np.column_stack([xs.ravel(), ys.ravel()]).astype(float)
+
+
+def _seed_centers(points: np.ndarray, count: int, rng) -> np.ndarray:
+    """k-means++ seeding driven by rng (a random.Random or the random module)"""
+    chosen = [rng.randrange(len(points))]
+    distance = ((points - points[chosen[0]]) ** 2).sum(axis=1)
+    for _ in range(1, count):
+        cumulative = np.cumsum(distance)
+        index = int(np.searchsorted(cumulative, rng.random() * cumulative[-1], side='right'))
+        index = min(index, len(points) - 1)
+        chosen.append(index)
+        distance = np.minimum(distance, ((points - points[index]) ** 2).sum(axis=1))
+    return points[chosen].copy()
+
+
+def lloyd_centers(size: int, count: int, rng=random) -> List[Tuple[int, int]]:
+    """count distinct cells spread over the grid like KMeans cluster centers"""
+    if not 0 < count <= size * size:
+        raise ValueError(f"cannot place {count} centers on a {size}x{size} grid")
+    points = _lattice(size, count)
+    centers = _seed_centers(points, count, rng)
+    for _ in range(ITERATIONS):
+        labels = ((centers ** 2).sum(axis=1) - 2 * points @ centers.T).argmin(axis=1)
+        members = np.bincount(labels, minlength=count)
+        sums = np.stack([np.bincount(labels, weights=points[:, axis], minlength=count) for axis in (0, 1)], axis=1)
+        updated = np.where(members[:, None] > 0, sums / np.maximum(members, 1)[:, None], centers)
+        if np.array_equal(updated, centers):
+            break
+        centers = updated
+    return _distinct_cells(centers, points)
+
+
+def _distinct_cells(centers: np.ndarray, points: np.ndarray) -> List[Tuple[int, int]]:
+    """Truncate centers to cells; a center landing on a taken cell moves to the nearest free lattice point"""
+    cells, taken = [], set()
+    for center in centers:
+        cell = (int(center[0]), int(center[1]))
+        if cell in taken:
+            order = ((points - center) ** 2).sum(axis=1).argsort()
+            cell = next(c for c in ((int(points[i, 0]), int(points[i, 1])) for i in order) if c not in taken)
+        taken.add(cell)
+        cells.append(cell)
+    return cells
+
+
+def kmeans_centers(size: int, count: int, random_state=None) -> List[Tuple[int, int]]:
+    """sklearn KMeans over every cell of the grid (slow on large grids)"""
+    from sklearn.cluster import KMeans
+
+    positions = [(x, y) for x in range(size) for y in range(size)]
+    kmeans = KMeans(n_clusters=count, n_init='auto', random_state=random_state).fit(positions)
+    return [(int(center[0]), int(center[1])) for center in kmeans.cluster_centers_]
@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, Optional, Tuple
+from eldoria.enums import EntityType, TreasureType
+
+COLORS = {
+    EntityType.EMPTY: 'white',
+    EntityType.TREASURE: {
+        TreasureType.BRONZE: '#CD7F32',
+        TreasureType.SILVER: '#C0C0C0',
+        TreasureType.GOLD: '#FFD700'
+    },
+    EntityType.HUNTER: 'blue',
+    EntityType.KNIGHT: 'red',
+    EntityType.HIDEOUT: 'green'
+}
+
+
+class GridRenderer:
+    """Draws a simulation on a Tk canvas, creating each cell's items once.
+
+    Later frames only reconfigure cells whose colour or treasure label changed.
+    Works with any object offering the canvas create_rectangle/create_text/
+    itemconfigure/delete calls, so it can be driven without a display.
+    """
+
+    def __init__(self, canvas, width: int = 600, colors=None):
+        self.canvas = canvas
+        self.width = width
+        self.colors = colors or COLORS
+        self.sim = None
+        self._items: Dict[Tuple[int, int], Tuple[int, int]] = {}  # cell -> (rectangle, text)
+        self._shown: Dict[Tuple[int, int], Tuple[str, str]] = {}  # cell -> (fill, label)
+
+    def attach(self, sim):
+        """Create the canvas items for a (new) simulation and draw it in full"""
+        self.sim = sim
+        self.canvas.delete("all")
+        self._items.clear()
+        self._shown.clear()
+        size = sim.grid.size
+        cell_size = self.width // size
+        for x in range(size):
+            for y in range(size):
+                rectangle = self.canvas.create_rectangle(
+                    x * cell_size, y * cell_size,
+                    (x + 1) * cell_size, (y + 1) * cell_size,
+                    fill='white', outline='black'
+                )
+                text = self.canvas.create_text(
+                    x * cell_size + cell_size // 2,
+                    y * cell_size + cell_size // 2,
+                    text='', fill='black'
+                )
+                self._items[(x, y)] = (rectangle, text)
+        sim.grid.track_dirty()
+        sim.grid.take_dirty()
+        return self.draw(self._items)
+
+    def cell_style(self, x: int, y: int) -> Tuple[str, str]:
+        """(fill colour, label) for one cell"""
+        entity = self.sim.grid.get(x, y)
+        if entity == EntityType.TREASURE:
+            treasure = self.sim.treasure_at((x, y))
+            if treasure is not None:
+                return self.colors[EntityType.TREASURE][treasure.type], f"{treasure.value:.1f}"
+        color = self.colors.get(entity, 'white')
+        return (color if isinstance(color, str) else 'white'), ''
+
+    def draw(self, cells: Optional[Iterable[Tuple[int, int]]] = None) -> int:
+        """Refresh the given cells (default: whatever the simulation reports dirty).
+
+        Returns the number of cells whose canvas items were actually updated.
+        """
+        if cells is None:
+            cells = self.sim.take_dirty()
+        updated = 0
+        for cell in cells:
+            style = self.cell_style(*cell)
+            if self._shown.get(cell) == style:
+                continue
+            fill, label = style
+            previous = self._shown.get(cell, (None, None))
+            rectangle, text = self._items[cell]
+            if fill != previous[0]:
+                self.canvas.itemconfigure(rectangle, fill=fill)
+            if label != previous[1]:
+                self.canvas.itemconfigure(text, text=label)
+            self._shown[cell] = style
+            updated += 1
+        return updated
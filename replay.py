@@ -0,0 +1,293 @@
+"""Binary snapshots of an EldoriaSimulation, and replay logs built from them.
+
+A snapshot holds everything needed to continue a game exactly:
+- the tick, score and treasure decay rate;
+- the grid codes;
+- packed hideout, hunter, knight and treasure arrays;
+- hunter memories and the agents' cached paths;
+- the world's random state.
+
+    data = simulation.snapshot()
+    copy = EldoriaSimulation()
+    copy.restore(data)   # copy now carries on exactly like simulation
+
+A replay log is a file of records, one per recorded tick. Every
+keyframe_every ticks the record is a keyframe, which is a full snapshot.
+Between keyframes it is a delta: the cells that changed since the previous
+record plus the agent and treasure arrays.
+
+    with ReplayWriter('game.eldr', simulation) as replay:
+        while not simulation.game_over:
+            simulation.run_step()
+            replay.record()
+
+    reader = ReplayReader('game.eldr')   # memory-maps the file
+    world = reader.seek(120)             # nearest keyframe, then deltas up to tick 120
+
+Deltas leave out memories, cached paths and the random state. A world loaded
+at a delta tick looks exactly as the game did, but only worlds loaded at
+keyframe ticks continue exactly when stepped.
+"""
+import mmap
+import struct
+import weakref
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from eldoria.models.treasure import DECAY_RATE
+
+SNAPSHOT_MAGIC = b'ELDS'
+REPLAY_MAGIC = b'ELDR'
+VERSION = 3
+KEYFRAME_EVERY = 100
+
+# Optional snapshot sections
+CELLS, MEMORY, PATHS, RANDOM = 1, 2, 4, 8
+
+# magic, version, sections, size, tick, score, decay rate, treasures expired, game over, then the row count
+# of hideouts, hunters, knights, treasures, memory entries, path steps and changed cells
+HEADER = struct.Struct('<4sHHIqddqB7I')
+REPLAY_HEADER = struct.Struct('<4sHI')  # magic, version, keyframe_every
+RECORD = struct.Struct('<BqI')          # keyframe flag, tick, payload length
+
+HIDEOUT_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('stored_treasure', '<f8')])
+HUNTER_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('skill', 'u1'), ('stamina', '<f8'),
+                         ('survival_timer', '<i4'), ('carried', '<i4'),  # carried: treasure row or -1
+                         ('hunter_id', '<i4'), ('home', '<i4')])  # home: hideout row or -1
+KNIGHT_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('energy', '<f8')])
+TREASURE_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('type', 'u1'), ('decay_steps', '<i4'),
+                           ('ground_since', '<i8')])  # ground_since: -1 while carried
+# Memory entries in least-recently-used order; stale when the cell's treasure changed since it was seen
+MEMORY_DTYPE = np.dtype([('hunter', '<i4'), ('x', '<i4'), ('y', '<i4'), ('value', '<f8'), ('stale', 'u1')])
+# One path cache per hunter, then per knight; goal -1 for none, stale when knights moved since its last check
+CACHE_DTYPE = np.dtype([('goal_x', '<i4'), ('goal_y', '<i4'), ('stale', 'u1'), ('length', '<i4')])
+STEP_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4')])
+CHANGE_DTYPE = np.dtype([('cell', '<u4'), ('code', 'u1')])
+RANDOM_DTYPE = np.dtype([('key', '<u4', 625), ('gauss_next', '<f8')])  # random.Random state, NaN gauss for None
+
+
+class WorldState(NamedTuple):
+    """Decoded snapshot; sections that were not stored are None"""
+    size: int
+    tick: int
+    score: float
+    treasures_expired: int
+    game_over: bool
+    hideouts: np.ndarray
+    hunters: np.ndarray
+    knights: np.ndarray
+    treasures: np.ndarray
+    decay_rate: float = DECAY_RATE  # Value a ground treasure loses per tick
+    codes: Optional[np.ndarray] = None
+    memory: Optional[np.ndarray] = None
+    caches: Optional[np.ndarray] = None
+    steps: Optional[np.ndarray] = None
+    random_state: Optional[tuple] = None
+    changes: Optional[np.ndarray] = None
+
+
+def pack_random(state: tuple) -> np.ndarray:
+    """random.Random.getstate() as one RANDOM_DTYPE row"""
+    version, key, gauss_next = state
+    if version != 3:
+        raise ValueError(f"unsupported random state version {version}")
+    packed = np.zeros(1, RANDOM_DTYPE)
+    packed['key'] = key
+    packed['gauss_next'] = np.nan if gauss_next is None else gauss_next
+    return packed
+
+
+def unpack_random(packed: np.ndarray) -> tuple:
+    gauss_next = float(packed['gauss_next'][0])
+    return 3, tuple(packed['key'][0].tolist()), None if np.isnan(gauss_next) else gauss_next
+
+
+def encode_state(state: WorldState) -> bytes:
+    """Snapshot bytes for a state; its optional sections are stored when present"""
+    sections = ((CELLS if state.codes is not None else 0) | (MEMORY if state.memory is not None else 0)
+                | (PATHS if state.caches is not None else 0) | (RANDOM if state.random_state is not None else 0))
+    memory = state.memory if state.memory is not None else np.zeros(0, MEMORY_DTYPE)
+    steps = state.steps if state.steps is not None else np.zeros(0, STEP_DTYPE)
+    changes = state.changes if state.changes is not None else np.zeros(0, CHANGE_DTYPE)
+    parts = [HEADER.pack(SNAPSHOT_MAGIC, VERSION, sections, state.size, state.tick, state.score,
+                         state.decay_rate, state.treasures_expired, state.game_over, len(state.hideouts), len(state.hunters),
+                         len(state.knights), len(state.treasures), len(memory), len(steps), len(changes))]
+    if state.codes is not None:
+        parts.append(np.ascontiguousarray(state.codes, dtype=np.uint8).tobytes())
+    parts += [state.hideouts.tobytes(), state.hunters.tobytes(), state.knights.tobytes(), state.treasures.tobytes()]
+    if state.memory is not None:
+        parts.append(memory.tobytes())
+    if state.caches is not None:
+        parts += [state.caches.tobytes(), steps.tobytes()]
+    if state.random_state is not None:
+        parts.append(pack_random(state.random_state).tobytes())
+    parts.append(changes.tobytes())
+    return b''.join(parts)
+
+
+def decode_state(buffer, offset: int = 0) -> WorldState:
+    """WorldState from snapshot bytes at offset; the arrays are read-only views into buffer"""
+    (magic, version, sections, size, tick, score, decay_rate, treasures_expired, game_over,
+     hideouts, hunters, knights, treasures, memory, steps, changes) = HEADER.unpack_from(buffer, offset)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"not an Eldoria snapshot (magic {magic!r})")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version} (expected {VERSION})")
+    position = offset + HEADER.size
+
+    def take(dtype, count):
+        nonlocal position
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=position)
+        position += array.nbytes
+        return array
+
+    codes = take(np.uint8, size * size).reshape(size, size) if sections & CELLS else None
+    state = dict(hideouts=take(HIDEOUT_DTYPE, hideouts), hunters=take(HUNTER_DTYPE, hunters),
+                 knights=take(KNIGHT_DTYPE, knights), treasures=take(TREASURE_DTYPE, treasures))
+    if sections & MEMORY:
+        state['memory'] = take(MEMORY_DTYPE, memory)
+    if sections & PATHS:
+        state['caches'] = take(CACHE_DTYPE, hunters + knights)
+        state['steps'] = take(STEP_DTYPE, steps)
+    if sections & RANDOM:
+        state['random_state'] = unpack_random(take(RANDOM_DTYPE, 1))
+    state['changes'] = take(CHANGE_DTYPE, changes)
+    return WorldState(size, tick, score, treasures_expired, bool(game_over), decay_rate=decay_rate, codes=codes,
+                      **state)
+
+
+class ReplayWriter:
+    """Appends one record per record() call to a replay log; see the module docstring"""
+
+    def __init__(self, path: str, simulation, keyframe_every: int = KEYFRAME_EVERY):
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be at least 1")
+        self.simulation = simulation
+        self.keyframe_every = keyframe_every
+        self._file = open(path, 'wb')
+        self._file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, VERSION, keyframe_every))
+        self._codes = None  # Flat grid codes at the previous record
+        self._keyframe_tick = 0
+        self.record()
+
+    def __enter__(self) -> 'ReplayWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def record(self):
+        """Append the simulation's current tick: a keyframe when one is due, otherwise a delta"""
+        simulation = self.simulation
+        codes = simulation.grid.codes.reshape(-1)
+        keyframe = self._codes is None or simulation.tick - self._keyframe_tick >= self.keyframe_every
+        if keyframe:
+            state = simulation.capture_state()
+            self._keyframe_tick = simulation.tick
+        else:
+            cells = np.flatnonzero(codes != self._codes)
+            changes = np.zeros(len(cells), CHANGE_DTYPE)
+            changes['cell'] = cells
+            changes['code'] = codes[cells]
+            state = simulation.capture_state(full=False)._replace(changes=changes)
+        self._codes = codes.copy()
+        payload = encode_state(state)
+        self._file.write(RECORD.pack(keyframe, simulation.tick, len(payload)))
+        self._file.write(payload)
+
+
+class ReplayReader:
+    """Memory-mapped replay log with random access by tick"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.keyframe_every = REPLAY_HEADER.unpack_from(self._map, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not an Eldoria replay (magic {magic!r})")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version} (expected {VERSION})")
+        ticks, offsets, keyframes = [], [], []
+        position = REPLAY_HEADER.size
+        while position + RECORD.size <= len(self._map):
+            keyframe, tick, length = RECORD.unpack_from(self._map, position)
+            if position + RECORD.size + length > len(self._map):
+                break  # Record still being written
+            ticks.append(tick)
+            offsets.append(position + RECORD.size)
+            keyframes.append(bool(keyframe))
+            position += RECORD.size + length
+        if not ticks:
+            raise ValueError(f"{path} holds no records")
+        self.ticks = np.array(ticks, dtype=np.int64)
+        self._offsets = offsets
+        self._keyframes = np.flatnonzero(keyframes)
+        self._loaded = weakref.WeakKeyDictionary()  # Simulation -> record it was last brought to
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    @property
+    def first_tick(self) -> int:
+        return int(self.ticks[0])
+
+    @property
+    def last_tick(self) -> int:
+        return int(self.ticks[-1])
+
+    def tick_after(self, tick: int) -> Optional[int]:
+        """First recorded tick after tick, None at the end of the log"""
+        index = int(np.searchsorted(self.ticks, tick, side='right'))
+        return int(self.ticks[index]) if index < len(self.ticks) else None
+
+    def tick_before(self, tick: int) -> Optional[int]:
+        """Last recorded tick before tick, None at the start of the log"""
+        index = int(np.searchsorted(self.ticks, tick, side='left')) - 1
+        return int(self.ticks[index]) if index >= 0 else None
+
+    def state(self, record: int) -> WorldState:
+        """Decoded record number record (views into the mapped file)"""
+        return decode_state(self._map, self._offsets[record])
+
+    def seek(self, tick: int, **options):
+        """New EldoriaSimulation showing the game at the last recorded tick <= tick; options as for its constructor"""
+        from eldoria.simulation import EldoriaSimulation
+
+        keyframe = self.state(self._keyframes[0])
+        simulation = EldoriaSimulation(size=keyframe.size, knights=0, treasures=0, hunters_per_hideout=0,
+                                       hideouts=1, **options)
+        self.load(simulation, tick)
+        return simulation
+
+    def load(self, simulation, tick: int):
+        """Bring a simulation loaded from this replay to the last recorded tick <= tick.
+
+        Steps forward through deltas when the simulation was last loaded by this
+        reader at a record between the nearest keyframe and tick (and has not
+        been stepped since), and restarts from that keyframe otherwise. Cells are
+        written through the grid, so an attached GridRenderer redraws only changes.
+        """
+        target = int(np.searchsorted(self.ticks, tick, side='right')) - 1
+        if target < 0:
+            raise ValueError(f"tick {tick} is before the first recorded tick {self.first_tick}")
+        keyframe = int(self._keyframes[np.searchsorted(self._keyframes, target, side='right') - 1])
+        current = self._loaded.get(simulation)
+        if current is None or self.ticks[current] != simulation.tick or not keyframe <= current <= target:
+            simulation.load_state(self.state(keyframe))
+            current = keyframe
+        for record in range(current + 1, target + 1):
+            simulation.load_state(self.state(record))
+        self._loaded[simulation] = target
@@ -0,0 +1,306 @@
+"""Headless streaming server: runs simulations at full speed and pushes per-tick diffs to viewers.
+
+Each world runs in its own asyncio task and never waits for clients.
+Clients connect over TCP and speak newline-delimited JSON. A client first
+sends one line naming the world it wants, then receives frames:
+
+    -> {"world": "0"}
+    <- {"world": "0", "tick": 12, "size": 20, "full": false, "ticks": 3,
+        "cells": [[flat index, code], ...], "treasures": [[x, y, type, value], ...],
+        "score": 40.5, "stamina": [96.0, ...], "game_over": false, "stopped": false}
+
+A frame's cells are only those that changed. "full" frames start from an
+empty grid, and the first frame is always full. Every client has a writer
+that waits on its own socket. While a slow client drains, the ticks that
+pass are coalesced into one pending frame: later codes overwrite earlier
+ones for the same cell, and "ticks" counts how many ticks the frame covers.
+The connection closes after the world's last frame, which is "stopped": the
+game is over or the world reached the server's max_ticks.
+
+    python -m eldoria.server --worlds 4 --size 30 --port 8765
+    python -m eldoria.main --connect 127.0.0.1:8765 --world 2
+
+RemoteWorld is the client side. It mirrors one world from the stream and
+offers the grid, treasure_at, take_dirty, score, hunters and game_over
+attributes that GridRenderer and EldoriaGUI read.
+"""
+import argparse
+import asyncio
+import json
+import queue
+import socket
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from eldoria.models.grid import Grid
+from eldoria.models.store import TREASURE_TYPE_CODES, TREASURE_TYPES
+
+DEFAULT_PORT = 8765
+BUFFER_LIMIT = 64 * 1024  # Bytes queued on a client's transport before its writer waits (and frames coalesce)
+
+
+def _treasures(simulation) -> List[list]:
+    return [[t.x, t.y, TREASURE_TYPE_CODES[t.type], round(t.value, 3)] for t in simulation.treasures]
+
+
+class _Subscriber:
+    """One client's pending frame; ticks published while it is busy writing are merged"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.ready = asyncio.Event()
+        self.full = True
+        self.cells: Dict[int, int] = {}
+        self.status: Optional[dict] = None  # Everything but cells, as of the latest tick
+        self.ticks = 0
+
+    def push(self, cells: Dict[int, int], status: dict):
+        self.cells.update(cells)
+        self.status = status
+        self.ticks += 1
+        self.ready.set()
+
+    def take(self) -> dict:
+        """The pending frame, leaving nothing pending"""
+        frame = dict(self.status, full=self.full, ticks=self.ticks, cells=sorted(self.cells.items()))
+        self.full, self.cells, self.ticks = False, {}, 0
+        self.ready.clear()
+        return frame
+
+
+class _Feed:
+    """One running world and the clients watching it"""
+
+    def __init__(self, name: str, simulation):
+        self.name = name
+        self.simulation = simulation
+        self.subscribers: List[_Subscriber] = []
+        self.stopped = False  # Set by the server with the world's last tick
+        self._codes = simulation.grid.codes.reshape(-1).copy()
+
+    def status(self) -> dict:
+        simulation = self.simulation
+        simulation.settle_hunters()
+        return {'world': self.name, 'tick': simulation.tick, 'size': simulation.grid.size,
+                'treasures': _treasures(simulation), 'score': simulation.score,
+                'stamina': [hunter.stamina for hunter in simulation.hunters], 'game_over': simulation.game_over,
+                'stopped': self.stopped}
+
+    def subscribe(self, subscriber: _Subscriber):
+        """Queue a full frame of the current state for a new client"""
+        occupied = np.flatnonzero(self._codes)
+        subscriber.push(dict(zip(occupied.tolist(), self._codes[occupied].tolist())), self.status())
+        self.subscribers.append(subscriber)
+
+    def publish(self):
+        """Hand the cells changed since the previous tick to every client"""
+        codes = self.simulation.grid.codes.reshape(-1)
+        changed = np.flatnonzero(codes != self._codes)
+        self._codes[changed] = codes[changed]
+        cells = dict(zip(changed.tolist(), codes[changed].tolist()))
+        status = self.status()
+        for subscriber in self.subscribers:
+            subscriber.push(cells, status)
+
+
+class SimulationServer:
+    """Streams named simulations to TCP clients; see the module docstring.
+
+    tick_interval is a pause in seconds between ticks of each world (0 runs at full
+    speed, yielding to the event loop between ticks). port=0 picks a free port.
+    """
+
+    def __init__(self, worlds: Dict[str, object], host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 tick_interval: float = 0.0, max_ticks: Optional[int] = None, buffer_limit: int = BUFFER_LIMIT):
+        self.feeds = {name: _Feed(name, simulation) for name, simulation in worlds.items()}
+        self.host = host
+        self.port = port
+        self.tick_interval = tick_interval
+        self.max_ticks = max_ticks
+        self.buffer_limit = buffer_limit
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> 'SimulationServer':
+        """Listen and start stepping every world"""
+        self._server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [asyncio.create_task(self._run(feed)) for feed in self.feeds.values()]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def wait_finished(self):
+        """Return once every world has stopped stepping"""
+        await asyncio.gather(*self._tasks)
+
+    def _stepping(self, simulation) -> bool:
+        return not simulation.game_over and (self.max_ticks is None or simulation.tick < self.max_ticks)
+
+    async def _run(self, feed: _Feed):
+        simulation = feed.simulation
+        feed.stopped = not self._stepping(simulation)
+        while not feed.stopped:
+            simulation.run_step()
+            feed.stopped = not self._stepping(simulation)
+            feed.publish()  # The last tick's frame is marked stopped, and every client closes after it
+            await asyncio.sleep(self.tick_interval)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.transport.set_write_buffer_limits(high=self.buffer_limit)
+        try:
+            request = json.loads(await reader.readline() or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError(f"expected a JSON object, got {request!r}")
+            name = request.get('world', next(iter(self.feeds)))
+            feed = self.feeds.get(str(name))
+            if feed is None:
+                await self._send(writer, {'error': f"unknown world {name!r}", 'worlds': list(self.feeds)})
+                return
+            subscriber = _Subscriber(writer)
+            feed.subscribe(subscriber)
+            try:
+                while True:
+                    await subscriber.ready.wait()
+                    frame = subscriber.take()
+                    await self._send(writer, frame)
+                    if frame['stopped']:
+                        break
+            finally:
+                feed.subscribers.remove(subscriber)
+        except (ConnectionError, ValueError):
+            pass  # Client went away or sent garbage
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: dict):
+        writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+        await writer.drain()
+
+
+class RemoteHunter(NamedTuple):
+    stamina: float
+
+
+class RemoteTreasure(NamedTuple):
+    type: object  # TreasureType
+    value: float
+
+
+class RemoteWorld:
+    """Client-side mirror of one streamed world, drawable by GridRenderer.
+
+    connect() reads the first (full) frame, then a background thread queues the
+    rest; poll() applies queued frames from the caller's thread (the Tk loop).
+    """
+
+    def __init__(self, size: int):
+        self.grid = Grid(size)
+        self.tick = 0
+        self.score = 0.0
+        self.game_over = False
+        self.hunters: List[RemoteHunter] = []
+        self.treasures: Dict[tuple, RemoteTreasure] = {}
+        self._frames: 'queue.Queue[Optional[dict]]' = queue.Queue()
+        self.connected = False
+
+    @classmethod
+    def connect(cls, host: str, port: int = DEFAULT_PORT, world: Optional[str] = None,
+                timeout: float = 10.0) -> 'RemoteWorld':
+        sock = socket.create_connection((host, port), timeout=timeout)
+        stream = sock.makefile('rb')
+        sock.sendall(json.dumps({} if world is None else {'world': str(world)}).encode() + b'\n')
+        first = json.loads(stream.readline() or b'{}')
+        if 'size' not in first:
+            sock.close()
+            raise ConnectionError(first.get('error', 'server closed the connection'))
+        sock.settimeout(None)
+        remote = cls(first['size'])
+        remote.apply(first)
+        remote.connected = True
+        threading.Thread(target=remote._receive, args=(sock, stream), daemon=True).start()
+        return remote
+
+    def _receive(self, sock: socket.socket, stream):
+        try:
+            for line in stream:
+                self._frames.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        finally:
+            sock.close()
+            self._frames.put(None)
+
+    def poll(self) -> int:
+        """Apply every frame received so far; returns how many there were"""
+        applied = 0
+        while True:
+            try:
+                frame = self._frames.get_nowait()
+            except queue.Empty:
+                return applied
+            if frame is None:
+                self.connected = False
+            else:
+                self.apply(frame)
+                applied += 1
+
+    def apply(self, frame: dict):
+        if frame['full']:
+            self.grid.load_codes(np.zeros(self.grid.size * self.grid.size, dtype=np.uint8))
+        if frame['cells']:
+            index, codes = zip(*frame['cells'])
+            self.grid.write_codes(index, codes)
+        self.tick = frame['tick']
+        self.score = frame['score']
+        self.game_over = frame['game_over']
+        self.hunters = [RemoteHunter(stamina) for stamina in frame['stamina']]
+        self.treasures = {(x, y): RemoteTreasure(TREASURE_TYPES[type_code], value)
+                          for x, y, type_code, value in frame['treasures']}
+
+    def treasure_at(self, position) -> Optional[RemoteTreasure]:
+        return self.treasures.get(tuple(position))
+
+    def take_dirty(self):
+        """Cells to redraw: grid changes plus every treasure, whose value label moves each tick"""
+        dirty = self.grid.take_dirty()
+        dirty.update(self.treasures)
+        return dirty
+
+
+def main(argv=None):
+    from eldoria.simulation import EldoriaSimulation
+
+    parser = argparse.ArgumentParser(description="Run Eldoria worlds headless and stream them to viewers.")
+    parser.add_argument('--worlds', type=int, default=1, help="number of worlds, named 0..N-1")
+    parser.add_argument('--size', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0, help="world i uses seed + i")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--tick-interval', type=float, default=0.0, help="seconds between ticks (0: full speed)")
+    parser.add_argument('--max-ticks', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    worlds = {str(i): EldoriaSimulation(size=args.size, seed=args.seed + i) for i in range(args.worlds)}
+    server = SimulationServer(worlds, args.host, args.port, args.tick_interval, args.max_ticks)
+    print(f"streaming {len(worlds)} world(s) on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
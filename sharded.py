@@ -0,0 +1,228 @@
+"""Sharded engine: one very large world whose spatial searches run in worker processes, one task per tile.
+
+The world starts exactly like ``EldoriaSimulation(size, seed=seed, **options)``
+and follows the lockstep rules (see eldoria.lockstep) as a single-row
+LockstepSimulation. Its cell codes live in a ``multiprocessing.shared_memory``
+block. Every tick, the expensive part is split by tile: finding the nearest
+treasure and knight, and the path steps of hunters and returning knights.
+
+    with ShardedSimulation(seed=7, size=2000, tiles=(4, 4), knights=50000, treasures=200000) as world:
+        world.run(max_steps=500)
+        print(world.results()[0])
+
+Agents see ``radius`` cells around themselves, so a world-spanning search is
+a bounded one. A worker copies its tile plus a halo of radius rows and
+columns out of shared memory. The halo wraps around the torus like
+Grid.get_adjacent, so every search box lies inside the tile's window.
+Workers only read. The coordinator resolves everything after the searches
+in one deterministic pass:
+- moves, including those across tile boundaries;
+- contested cells, which go to the lowest-numbered agent;
+- knight patrol draws, from the seeded generator.
+No search depends on how the grid is tiled or which process ran it. Runs
+with the same seed are therefore identical for any tile and worker count.
+"""
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from eldoria.lockstep import KNIGHT, NO_KEY, LockstepSimulation
+
+RADIUS = 12  # Cells an agent can see in each direction
+NEAREST, STEP = 'nearest', 'step'
+
+_worker: Dict[str, object] = {}  # Shared-memory handle and grid view of a worker process
+
+
+def _attach(name: str, size: int):
+    """Pool initializer: map the shared cell codes into this worker"""
+    block = shared_memory.SharedMemory(name=name)
+    _worker['block'] = block
+    _worker['codes'] = np.ndarray((size, size), dtype=np.uint8, buffer=block.buf)
+
+
+def _run_task(task: tuple) -> np.ndarray:
+    return search_tile(_worker['codes'], *task)
+
+
+def search_tile(codes: np.ndarray, radius: int, kind: str, code: int,
+                bounds: Tuple[Tuple[int, int], Tuple[int, int]], cells: np.ndarray) -> np.ndarray:
+    """Search around every agent of one tile; returns one flat cell per agent, -1 if nothing is in sight.
+
+    codes is the (size, size) grid and bounds the tile's ((x0, x1), (y0, y1))
+    half-open ranges, which must hold every agent cell. NEAREST returns the
+    cell Grid.find_nearest would return when it lies within radius steps.
+    STEP returns the first cell of a shortest knight-avoiding path to the
+    nearest code cell, staying within radius of the agent on both axes.
+    """
+    size = len(codes)
+    (x0, x1), (y0, y1) = bounds
+    rows = np.arange(x0 - radius, x1 + radius) % size
+    columns = np.arange(y0 - radius, y1 + radius) % size
+    window = codes[np.ix_(rows, columns)]  # The tile plus its halo
+    x, y = np.divmod(cells, size)
+    span = np.arange(2 * radius + 1)
+    boxes = window[(x - x0)[:, None, None] + span[:, None], (y - y0)[:, None, None] + span]  # (A, D, D)
+    if kind == NEAREST:
+        dx, dy = _nearest_in_boxes(boxes == code, radius, size)
+    else:
+        dx, dy = _step_in_boxes(boxes == code, boxes != KNIGHT, radius)
+    found = dx != NO_KEY
+    return np.where(found, ((x + dx) % size) * size + (y + dy) % size, -1)
+
+
+def _nearest_in_boxes(targets: np.ndarray, radius: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offset from the box centre of the best-ranked target within radius steps (NO_KEY when none)"""
+    offsets = np.arange(-radius, radius + 1)
+    x_key, y_key = LockstepSimulation._direction_keys(size)
+    key = x_key[offsets][:, None] + y_key[offsets][None, :]
+    in_sight = np.abs(offsets)[:, None] + np.abs(offsets)[None, :] <= radius
+    ranked = np.where(targets & in_sight, key, NO_KEY).reshape(len(targets), -1)
+    best = ranked.argmin(axis=1)
+    found = ranked[np.arange(len(ranked)), best] != NO_KEY
+    dx, dy = np.divmod(best, 2 * radius + 1)
+    return np.where(found, dx - radius, NO_KEY), np.where(found, dy - radius, NO_KEY)
+
+
+def _step_in_boxes(targets: np.ndarray, open_cells: np.ndarray, radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offset of the centre's neighbour nearest to a target through open cells (NO_KEY when none).
+
+    The same level-by-level multi-source search as LockstepSimulation._steps,
+    on (D, D, A) boxes whose edges are walls; ties go to the first neighbour
+    in DIRECTIONS order.
+    """
+    open_cells = np.ascontiguousarray(open_cells.transpose(1, 2, 0))
+    reached = np.ascontiguousarray(targets.transpose(1, 2, 0)) & open_cells
+    sides = [(radius - 1, radius), (radius + 1, radius), (radius, radius - 1), (radius, radius + 1)]
+    ahead = np.stack([np.where(reached[side], 0, NO_KEY) for side in sides])  # (4, A)
+    pending = (ahead == NO_KEY).all(axis=0)
+    frontier = reached
+    level = 0
+    while pending.any() and frontier.any():
+        level += 1
+        grown = np.zeros_like(frontier)
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & open_cells & ~reached
+        reached |= frontier
+        for index, side in enumerate(sides):
+            ahead[index] = np.where(frontier[side] & (ahead[index] == NO_KEY), level, ahead[index])
+        pending &= (ahead == NO_KEY).all(axis=0)
+    best = ahead.argmin(axis=0)
+    found = ahead[best, np.arange(ahead.shape[1])] != NO_KEY
+    moves = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])[best]
+    return np.where(found, moves[:, 0], NO_KEY), np.where(found, moves[:, 1], NO_KEY)
+
+
+class ShardedSimulation(LockstepSimulation):
+    """One seeded world with tile-parallel searches; see the module docstring.
+
+    tiles is a tile count per axis or a (rows, columns) pair. workers=None uses
+    one process per CPU, capped at the tile count; with a single process the
+    searches run inline. Call close() (or use a with block) to stop the workers
+    and free the shared memory.
+    """
+
+    def __init__(self, seed: int = 0, size: int = 200, tiles: Union[int, Tuple[int, int]] = 2,
+                 radius: int = RADIUS, workers: Optional[int] = None, **options):
+        tiles = (tiles, tiles) if isinstance(tiles, int) else tuple(tiles)
+        if not all(0 < count <= size for count in tiles):
+            raise ValueError(f"cannot split a {size}x{size} grid into {tiles[0]}x{tiles[1]} tiles")
+        if not 0 < radius < size // 2:
+            raise ValueError(f"radius must be between 1 and {size // 2 - 1} on a {size}x{size} grid")
+        super().__init__([seed], size=size, **options)
+        self.tiles = tiles
+        self.radius = radius
+        self._edges = [np.linspace(0, size, count + 1).astype(np.int64) for count in tiles]
+
+        self._block = shared_memory.SharedMemory(create=True, size=self.codes.nbytes)
+        shared = np.ndarray(self.codes.shape, dtype=np.uint8, buffer=self._block.buf)
+        shared[:] = self.codes
+        self.codes = shared
+
+        processes = min(workers if workers is not None else os.cpu_count() or 1, tiles[0] * tiles[1])
+        self._pool = None
+        if processes > 1:
+            self._pool = multiprocessing.Pool(processes, initializer=_attach, initargs=(self._block.name, size))
+
+    def __enter__(self) -> 'ShardedSimulation':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the workers and release the shared memory; the final state stays readable"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._block is not None:
+            self.codes = self.codes.copy()
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def _compact(self):
+        """A single world has no finished rows to drop"""
+
+    # Hunter memory: sparse, since a (hunters, size * size) table does not fit large worlds
+
+    @staticmethod
+    def _new_memory(B: int, H: int, N: int) -> Dict[int, float]:
+        return {}
+
+    def _remember(self, worlds: np.ndarray, hunters: np.ndarray, cells: np.ndarray, values: np.ndarray):
+        keys = hunters * self.codes.shape[1] + cells
+        self.memory.update(zip(keys.tolist(), values.astype(np.float32).tolist()))
+
+    def _recall(self, worlds: np.ndarray, hunters: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        keys = hunters * self.codes.shape[1] + cells
+        return np.array([self.memory.get(key, 0.0) for key in keys.tolist()], dtype=np.float32)
+
+    def _forget(self, worlds: np.ndarray, cells: np.ndarray):
+        N = self.codes.shape[1]
+        for cell in cells.tolist():
+            for hunter in range(self.hunter_alive.shape[1]):
+                self.memory.pop(hunter * N + cell, None)
+
+    # Tile-parallel searches
+
+    def _nearest_cell(self, position: np.ndarray, code: int, wanted: np.ndarray) -> np.ndarray:
+        return self._search(NEAREST, code, position, wanted)
+
+    def _step_toward(self, position: np.ndarray, code: int, wanted: np.ndarray) -> np.ndarray:
+        return self._search(STEP, code, position, wanted)
+
+    def _search(self, kind: str, code: int, position: np.ndarray, wanted: np.ndarray) -> np.ndarray:
+        """Run search_tile for the wanted agents of every tile, in tile order; (1, A) results"""
+        agents = np.flatnonzero(wanted[0])
+        cells = position[0, agents]
+        x, y = np.divmod(cells, self.size)
+        band_x = np.searchsorted(self._edges[0], x, side='right') - 1
+        band_y = np.searchsorted(self._edges[1], y, side='right') - 1
+        tile = band_x * self.tiles[1] + band_y
+        order = np.argsort(tile, kind='stable')
+        tiles, starts = np.unique(tile[order], return_index=True)
+        groups = np.split(order, starts[1:])
+        tasks = []
+        for index, group in zip(tiles.tolist(), groups):
+            bx, by = divmod(index, self.tiles[1])
+            bounds = ((int(self._edges[0][bx]), int(self._edges[0][bx + 1])),
+                      (int(self._edges[1][by]), int(self._edges[1][by + 1])))
+            tasks.append((self.radius, kind, code, bounds, cells[group]))
+        if self._pool is not None:
+            found = self._pool.map(_run_task, tasks)
+        else:
+            grid = self.grid[0]
+            found = [search_tile(grid, *task) for task in tasks]
+
+        result = np.full(position.shape, -1, dtype=np.int64)
+        for group, cells_found in zip(groups, found):
+            result[0, agents[group]] = cells_found
+        return result
@@ -1,81 +1,200 @@
 import random
-from sklearn.cluster import KMeans
+from functools import partial
+from heapq import heappush, heappop
+import numpy as np
 from eldoria.models.grid import Grid
-from eldoria.models.hunter import TreasureHunter
+from eldoria.models.sparse_grid import SparseGrid
+from eldoria.models.hunter import TreasureHunter, to_action
 from eldoria.models.knight import Knight
-from eldoria.models.treasure import Treasure
+from eldoria.models.treasure import DECAY_RATE, Treasure, decay_table
 from eldoria.models.hideout import Hideout
+from eldoria.models.memory import MEMORY_CAPACITY, STALE, HunterMemory
+from eldoria.models.entity_index import PositionIndex
+from eldoria.models.store import NOWHERE, SKILL_CODES, SKILLS, TREASURE_TYPE_CODES, TREASURE_TYPES, EntityStore
 from eldoria.enums import EntityType, HunterSkill, TreasureType, Action
 from eldoria.ai.pathfinding import a_star
+from eldoria.ai.decision_tree import HunterDecisionModel
+from eldoria.ai.flow_field import FlowFieldNavigator
+from eldoria.instrumentation import NO_INSTRUMENTATION
+from eldoria.placement import kmeans_centers, lloyd_centers
+from eldoria.replay import (CACHE_DTYPE, HIDEOUT_DTYPE, HUNTER_DTYPE, KNIGHT_DTYPE, MEMORY_DTYPE, STEP_DTYPE,
+                            TREASURE_DTYPE, WorldState, decode_state, encode_state)
 
 
 class EldoriaSimulation:
-    def __init__(self, size=20):
-        self.grid = Grid(size)
+    NAVIGATION_MODES = ('astar', 'flow')
+    PLACEMENTS = ('lloyd', 'kmeans')
+    GRID_BACKENDS = ('dense', 'sparse')
+
+    def __init__(self, size=20, navigation='astar', flow_treasures=False, check_index=False, seed=None,
+                 knights=5, treasures=20, hunters_per_hideout=2, hideouts=3, placement='lloyd',
+                 columnar=False, memory_capacity=MEMORY_CAPACITY, team_memory=False, grid_backend='dense',
+                 decay_rate=DECAY_RATE, decision_model=None):
+        """knights, treasures, hideouts and hunters_per_hideout set the initial population.
+
+        seed gives the world its own random.Random (and KMeans random_state) so runs
+        are reproducible in any process; without it the global random module is used.
+        placement='lloyd' spreads hideouts with eldoria.placement.lloyd_centers;
+        'kmeans' uses the original full-grid sklearn KMeans.
+        columnar=True keeps hunter, knight and treasure fields in an EntityStore
+        and runs stamina and knight energy updates as whole-array operations.
+        memory_capacity bounds how many cells each hunter remembers; with
+        team_memory the hunters registered with a hideout share one memory
+        (see eldoria.models.memory).
+        grid_backend='sparse' keeps the grid in chunks allocated on first write
+        (eldoria.models.sparse_grid), for very large, mostly empty worlds; it
+        does not combine with navigation='flow', whose fields are dense.
+        decay_rate is the value a treasure loses per tick on the ground;
+        decision_model is the HunterDecisionModel every hunter decides with
+        (default: the shipped model, HunterDecisionModel.shared()).
+
+        navigation='flow' sends hideout-bound hunters and knights along shared
+        per-tick flow fields instead of per-agent A*; flow_treasures also routes
+        treasure seekers along one field toward the whole treasure set.
+        check_index verifies the position indexes after every step (for tests).
+        Assign an Instrumentation to `instrumentation` to profile run_step, and
+        an eldoria.trajectory.TrajectoryRecorder to `recorder` to record the
+        hunters' decisions as training data."""
+        if navigation not in self.NAVIGATION_MODES:
+            raise ValueError(f"navigation must be one of {self.NAVIGATION_MODES}, got {navigation!r}")
+        if placement not in self.PLACEMENTS:
+            raise ValueError(f"placement must be one of {self.PLACEMENTS}, got {placement!r}")
+        if grid_backend not in self.GRID_BACKENDS:
+            raise ValueError(f"grid_backend must be one of {self.GRID_BACKENDS}, got {grid_backend!r}")
+        if grid_backend == 'sparse' and navigation == 'flow':
+            raise ValueError("navigation='flow' needs the dense grid")
+        self.seed = seed
+        self.knight_count = knights
+        self.treasure_count = treasures
+        self.hunters_per_hideout = hunters_per_hideout
+        self.hideout_count = hideouts
+        self.placement = placement
+        self.memory_capacity = memory_capacity
+        self.team_memory = team_memory
+        self.rng = random.Random(seed) if seed is not None else random
+        self.grid_backend = grid_backend
+        self.decay_rate = decay_rate
+        self.decay_table = decay_table(decay_rate)
+        self.decision_model = decision_model if decision_model is not None else HunterDecisionModel.shared()
+        self.grid = self._new_grid(size)
+        self.store = EntityStore(decay_table=self.decay_table) if columnar else None
+        self._hideout_cells = np.zeros(0, dtype=np.int64)  # Flat indices, for the columnar stamina drain
+        self.navigator = FlowFieldNavigator(self.grid) if navigation == 'flow' else None
+        self.flow_treasures = flow_treasures and self.navigator is not None
         self.hunters = []
         self.knights = []
         self.treasures = []
         self.hideouts = []
+        # Position indexes kept in step with the lists above
+        self.treasure_index = PositionIndex()
+        self.knight_index = PositionIndex()
+        self.hideout_index = PositionIndex()
+        self.check_index = check_index
+        self.treasure_stamps = {}  # Flat cell -> times its treasures changed (0 when absent)
+        self._next_hunter_id = 0
+        self.instrumentation = None
+        self.recorder = None
         self.score = 0
+        self.tick = 0
+        self.treasures_expired = 0
+        # Live counts behind the O(1) game-over check, kept up to date at every pickup, drop and removal
+        self.hunters_alive = 0
+        self.treasures_on_ground = 0
+        self.treasures_carried = 0
+        # Deferred removals: entities leave the hunter and treasure lists in one pass per phase
+        self._departed_hunters = []
+        self._lifted_treasures = {}  # treasure -> times it left the ground since the last flush
+        # Event scheduling: idle hunters leave the per-tick loops until their next meaningful tick
+        self.active_hunters = []  # self.hunters minus the idle ones, in the same order
+        self._idle_since = {}  # idle hunter -> tick its stamina and survival timer were last brought up to date
+        self._removals = []  # (tick, sequence, hunter) min-heap: when exhausted hunters run out of time
+        self._removal_sequence = 0
+        self._resting = {}  # hideout position -> hunters resting there until a knight arrives
+        self._falling_idle = []  # hunters gone idle this phase; they leave active_hunters at the next flush
+        self._expiry = []  # (expiry_tick, sequence, treasure) min-heap
+        self._expiry_sequence = 0
+        self._live_expiry = {}  # treasure -> sequence of its current heap entry
         self.game_over = False
         self._initialize_world()
 
     def _initialize_world(self):
         """Initialize game world with entities"""
-        positions = [(x, y) for x in range(self.grid.size) for y in range(self.grid.size)]
-        kmeans = KMeans(n_clusters=3, n_init='auto').fit(positions)
+        if self.placement == 'kmeans':
+            random_state = self.rng.randrange(2 ** 32) if self.seed is not None else None
+            centers = kmeans_centers(self.grid.size, self.hideout_count, random_state)
+        else:
+            centers = lloyd_centers(self.grid.size, self.hideout_count, self.rng)
 
         # Create hideouts at cluster centers
-        for center in kmeans.cluster_centers_:
-            x, y = int(center[0]), int(center[1])
+        for x, y in centers:
             hideout = Hideout(x, y)
             self.hideouts.append(hideout)
+            self.hideout_index.add(hideout)
+            self._hideout_cells = np.append(self._hideout_cells, x * self.grid.size + y)
             self.grid.add_entity(x, y, EntityType.HIDEOUT)
 
-        # Spawn hunters (2 per hideout)
+        new_hunter, new_knight, new_treasure = self._factories()
+
+        # Spawn hunters (2 per hideout by default)
         skills = list(HunterSkill)
         for hideout in self.hideouts:
-            for _ in range(2):
+            for _ in range(self.hunters_per_hideout):
                 x, y = self._find_empty_cell_near(hideout.x, hideout.y)
                 if x is not None:
-                    hunter = TreasureHunter(x, y, random.choice(skills))
+                    hunter = new_hunter(x, y, self.rng.choice(skills))
+                    self._enlist(hunter, hideout)
                     self.hunters.append(hunter)
+                    self.active_hunters.append(hunter)
+                    self.hunters_alive += 1
                     self.grid.add_entity(x, y, EntityType.HUNTER)
 
-        # Spawn knights (5 total)
-        for _ in range(5):
+        # Spawn knights (5 total by default)
+        for _ in range(self.knight_count):
             x, y = self._find_empty_cell()
             if x is not None:
-                knight = Knight(x, y)
+                knight = new_knight(x, y, rng=self.rng)
                 self.knights.append(knight)
+                self.knight_index.add(knight)
                 self.grid.add_entity(x, y, EntityType.KNIGHT)
 
-        # Place treasures (20 total)
-        for _ in range(20):
+        # Place treasures (20 total by default)
+        for _ in range(self.treasure_count):
             x, y = self._find_empty_cell()
             if x is not None:
-                treasure_type = random.choices(
+                treasure_type = self.rng.choices(
                     list(TreasureType),
                     weights=[0.5, 0.3, 0.2]
                 )[0]
-                treasure = Treasure(x, y, treasure_type)
+                treasure = new_treasure(x, y, treasure_type, clock=self)
                 self.treasures.append(treasure)
+                self.treasures_on_ground += 1
+                self.treasure_index.add(treasure)
+                self._schedule_expiry(treasure)
                 self.grid.add_entity(x, y, EntityType.TREASURE)
 
+    def _new_grid(self, size):
+        return SparseGrid(size) if self.grid_backend == 'sparse' else Grid(size)
+
+    def _factories(self):
+        """Hunter, knight and treasure constructors: store rows when columnar, plain objects otherwise"""
+        if self.store is not None:
+            return self.store.hunter, self.store.knight, self.store.treasure
+        return TreasureHunter, Knight, partial(Treasure, decay_table=self.decay_table)
+
     def _find_empty_cell(self):
         """Find random empty cell"""
         for _ in range(100):
-            x, y = random.randint(0, self.grid.size - 1), random.randint(0, self.grid.size - 1)
-            if self.grid.cells[x][y] == EntityType.EMPTY:
+            x, y = self.rng.randint(0, self.grid.size - 1), self.rng.randint(0, self.grid.size - 1)
+            if self.grid.get(x, y) == EntityType.EMPTY:
                 return x, y
         return None, None
 
     def _find_empty_cell_near(self, center_x, center_y, radius=3):
         """Find empty cell near specified location"""
         for _ in range(50):
-            x = (center_x + random.randint(-radius, radius)) % self.grid.size
-            y = (center_y + random.randint(-radius, radius)) % self.grid.size
-            if self.grid.cells[x][y] == EntityType.EMPTY:
+            x = (center_x + self.rng.randint(-radius, radius)) % self.grid.size
+            y = (center_y + self.rng.randint(-radius, radius)) % self.grid.size
+            if self.grid.get(x, y) == EntityType.EMPTY:
                 return x, y
         return None, None
 
@@ -84,88 +203,486 @@ class EldoriaSimulation:
         if self.game_over:
             return
 
-        # Update treasures (decay)
-        for treasure in self.treasures[:]:
-            if not treasure.decay():
-                self.treasures.remove(treasure)
-                self.grid.cells[treasure.x][treasure.y] = EntityType.EMPTY
-
-        # Update hunters
-        for hunter in self.hunters[:]:
-            # Handle stamina and survival
-            if hunter.stamina <= 0:
-                hunter.survival_timer -= 1
-                if hunter.survival_timer <= 0:
-                    self._remove_hunter(hunter)
+        probe = self.instrumentation if self.instrumentation is not None else NO_INSTRUMENTATION
+        with probe.tick(self):
+            if self.navigator is not None:
+                self.navigator.begin_tick()
+            self.tick += 1
+            probe.time('decay', self._expire_treasures)
+            observed = probe.time('hunters', self._update_hunters)
+            decisions = probe.time('decide', self._decide_actions, observed)
+            probe.count_actions(decisions)
+            if self.recorder is not None:
+                self.recorder.record(self, observed, decisions)
+            probe.time('movement', self._move_hunters, decisions)
+            probe.time('knights', self._patrol_knights)
+
+            # Check game over conditions
+            probe.time('game_over', self._check_game_over)
+            if self.game_over and self.recorder is not None:
+                self.recorder.finish(self)
+        if self.check_index:
+            self.check_consistency()
+
+    def _expire_treasures(self):
+        """Remove treasures whose value has decayed to 0.
+
+        Decay is read lazily from the tick, so only expiring treasures are touched.
+        """
+        while self._expiry and self._expiry[0][0] <= self.tick:
+            _, sequence, treasure = heappop(self._expiry)
+            if self._live_expiry.get(treasure) == sequence:  # Skip entries left behind by pickups
+                self._lift_treasure(treasure)
+                self.grid.add_entity(treasure.x, treasure.y, EntityType.EMPTY)
+                self.treasures_expired += 1
+                self._release(treasure)
+        self._flush_removals()
+
+    def _update_hunters(self):
+        """Stamina, pickups, deposits and knight encounters for the active hunters.
+
+        Returns (hunter, features) for every hunter that gets to act this tick,
+        in hunter order; None features mean there is no treasure to chase.
+        Hunters left exhausted or resting in a hideout go idle (see _fall_idle).
+        """
+        # Exhausted hunters only wait out their survival timer
+        departing = set()
+        while self._removals and self._removals[0][0] <= self.tick:
+            departing.add(heappop(self._removals)[2])
+        hunters = self.active_hunters
+        if departing:
+            # Removals keep their place in hunter order: a departing hunter clears a cell others may share
+            hunters = [hunter for hunter in self.hunters if hunter in departing or hunter not in self._idle_since]
+
+        observed = []
+        self._drain_stamina(self.active_hunters)
+        for hunter in hunters:
+            if hunter in departing:
+                del self._idle_since[hunter]
+                self._remove_hunter(hunter)
                 continue
 
-            # Check if in hideout (resting)
-            in_hideout = any((hunter.x, hunter.y) == (h.x, h.y) for h in self.hideouts)
-            if in_hideout:
-                hunter.stamina = min(100, hunter.stamina + 1)  # Recover stamina
-            else:
-                # Deduct movement stamina cost
-                cost = 1 if hunter.skill == HunterSkill.ENDURANCE else 2
-                hunter.stamina = max(0, hunter.stamina - cost)
+            position = (hunter.x, hunter.y)
+            in_hideout = position in self.hideout_index
 
             # Handle treasure collection
             if hunter.carried_treasure is None:
-                for treasure in self.treasures[:]:
-                    if (hunter.x, hunter.y) == (treasure.x, treasure.y):
-                        hunter.carried_treasure = treasure
-                        self.treasures.remove(treasure)
-                        self.grid.cells[treasure.x][treasure.y] = EntityType.EMPTY
-                        break
+                treasure = self.treasure_index.first(position)
+                if treasure is not None:
+                    hunter.carried_treasure = treasure
+                    treasure.pick_up()
+                    self._lift_treasure(treasure)
+                    self.treasures_carried += 1
+                    self.grid.add_entity(treasure.x, treasure.y, EntityType.EMPTY)
 
             # Handle treasure deposit
-            if hunter.carried_treasure is not None:
-                for hideout in self.hideouts:
-                    if (hunter.x, hunter.y) == (hideout.x, hideout.y):
-                        self.score += hunter.carried_treasure.get_value()
-                        hunter.carried_treasure = None
-                        break
+            if hunter.carried_treasure is not None and in_hideout:
+                deposited = hunter.carried_treasure
+                value = deposited.get_value()
+                self.score += value
+                self.hideout_index.first(position).store_treasure(value)
+                if self.recorder is not None:
+                    self.recorder.deposited(self, hunter, value)
+                hunter.carried_treasure = None
+                self.treasures_carried -= 1
+                self._release(deposited)
 
             # Handle knight encounters
-            for knight in self.knights[:]:
-                if (hunter.x, hunter.y) == (knight.x, knight.y):
-                    if hunter.carried_treasure is not None:
-                        # Drop treasure
-                        dropped = hunter.carried_treasure
-                        dropped.x, dropped.y = hunter.x, hunter.y
-                        self.treasures.append(dropped)
-                        self.grid.cells[hunter.x][hunter.y] = EntityType.TREASURE
-                        hunter.carried_treasure = None
-
-                    hunter.stamina = max(0, hunter.stamina - 20)
-                    if hunter.stamina <= 0:
-                        hunter.survival_timer = 3  # Reset survival timer
-                    break
-
-            # AI movement decision
-            if not in_hideout and hunter.stamina > 0:
+            if position in self.knight_index:
+                if hunter.carried_treasure is not None:
+                    # Drop treasure
+                    dropped = hunter.carried_treasure
+                    dropped.put_down(hunter.x, hunter.y)
+                    self._stamp(dropped)
+                    self.treasures.append(dropped)
+                    self.treasure_index.add(dropped)
+                    self._schedule_expiry(dropped)
+                    self.grid.add_entity(hunter.x, hunter.y, EntityType.TREASURE)
+                    hunter.carried_treasure = None
+                    self.treasures_on_ground += 1
+                    self.treasures_carried -= 1
+
+                hunter.stamina = max(0, hunter.stamina - 20)
+                if hunter.stamina <= 0:
+                    hunter.survival_timer = 3  # Reset survival timer
+
+            if hunter.stamina <= 0 or in_hideout:
+                self._fall_idle(hunter, position)
+                self._falling_idle.append(hunter)
+            else:
+                # Gather AI inputs; decisions are resolved in one batch below
                 nearest_knight = self.grid.find_nearest((hunter.x, hunter.y), EntityType.KNIGHT)
-                action = hunter.decide_action(self, nearest_knight)
+                observed.append((hunter, hunter.observe(self, nearest_knight)))
+        self._flush_removals()
+        return observed
+
+    def _drain_stamina(self, hunters):
+        """Start-of-tick stamina update for the active hunters (none of them exhausted):
+        they recover in a hideout or pay to move.
+
+        The columnar store updates every row as one array operation, which also
+        keeps idle hunters current.
+        """
+        if self.store is not None:
+            self.store.drain_stamina(self._hideout_cells, self.grid.size)
+            return
+
+        for hunter in hunters:
+            if (hunter.x, hunter.y) in self.hideout_index:
+                hunter.stamina = min(100, hunter.stamina + 1)  # Recover stamina
+            else:
+                # Deduct movement stamina cost
+                cost = 1 if hunter.skill == HunterSkill.ENDURANCE else 2
+                hunter.stamina = max(0, hunter.stamina - cost)
+
+    def _decide_actions(self, observed):
+        """Resolve every observed hunter's action with one model call"""
+        states = [features for _, features in observed if features is not None]
+        codes = iter(self.decision_model.predict_batch(states) if states else ())
+        return [(hunter, Action.REST if features is None else to_action(next(codes)))
+                for hunter, features in observed]
+
+    def _move_hunters(self, decisions):
+        for hunter, action in decisions:
+            if action == Action.MOVE:
+                target = self._get_hunter_target(hunter)
+                if target != (-1, -1):
+                    self._move_hunter(hunter, target)
+            elif action == Action.REST:
+                nearest_hideout = self.grid.find_nearest((hunter.x, hunter.y), EntityType.HIDEOUT)
+                if nearest_hideout != (-1, -1):
+                    hunter.move_toward(self.grid, nearest_hideout, self.navigator)
+
+    def _patrol_knights(self):
+        if self.store is not None:
+            # Moves stay sequential (knights block each other); energy is one array update
+            returning = self.store.returning_knights()
+            moved = np.zeros_like(returning)
+            for knight in self.knights:
+                position = (knight.x, knight.y)
+                moved[knight._row] = knight.move(self.grid, self.navigator, returning[knight._row])
+                self.knight_index.move(knight, position)
+            self.store.recover_knights(returning, moved)
+        else:
+            for knight in self.knights:
+                position = (knight.x, knight.y)
+                knight.patrol(self.grid, self.navigator)
+                self.knight_index.move(knight, position)
+        if self._resting:
+            self._wake_resting()
+
+    def _fall_idle(self, hunter, position):
+        """Schedule a hunter whose next ticks are predictable instead of visiting it every tick.
 
-                if action == Action.MOVE:
-                    target = self._get_hunter_target(hunter)
-                    if target != (-1, -1):
-                        hunter.move_toward(self.grid, target)
-                elif action == Action.REST:
-                    nearest_hideout = self.grid.find_nearest((hunter.x, hunter.y), EntityType.HIDEOUT)
-                    if nearest_hideout != (-1, -1):
-                        hunter.move_toward(self.grid, nearest_hideout)
+        An exhausted hunter only counts down its survival timer, so it is queued
+        for removal when the timer runs out. A hunter in a hideout has nothing to
+        pick up or deposit and never leaves on its own: it recovers 1 stamina a
+        tick until a knight lands on it (_wake_resting).
+        """
+        self._idle_since[hunter] = self.tick
+        if hunter.stamina <= 0:
+            self._removal_sequence += 1
+            heappush(self._removals, (self.tick + max(1, hunter.survival_timer), self._removal_sequence, hunter))
+        else:
+            self._resting.setdefault(position, []).append(hunter)
 
-        # Update knights
-        for knight in self.knights:
-            knight.patrol(self.grid)
+    def _wake_resting(self):
+        """Return resting hunters that a knight now stands on to the active hunters"""
+        woken = [position for position in self._resting if position in self.knight_index]
+        if woken:
+            for position in woken:
+                for hunter in self._resting.pop(position):
+                    self._settle(hunter)
+                    del self._idle_since[hunter]
+            self.active_hunters = [hunter for hunter in self.hunters if hunter not in self._idle_since]
 
-        # Check game over conditions
-        self._check_game_over()
+    def _settle(self, hunter):
+        """Apply the ticks an idle hunter skipped in closed form"""
+        elapsed = self.tick - self._idle_since[hunter]
+        self._idle_since[hunter] = self.tick
+        if self.store is not None or not elapsed:
+            return  # The store's whole-array drain already covered them
+        if hunter.stamina <= 0:
+            hunter.survival_timer -= elapsed
+        else:
+            hunter.stamina = min(100, hunter.stamina + elapsed)
+
+    def settle_hunters(self):
+        """Bring idle hunters' stamina and survival timers up to the current tick.
+
+        Idle hunters are otherwise only updated when they wake, so call this
+        before reading those attributes from outside the simulation.
+        """
+        for hunter in self._idle_since:
+            self._settle(hunter)
+
+    def _schedule_hunters(self):
+        """Rebuild the active list and idle schedule from the hunters' state (after load_state)"""
+        self._idle_since = {}
+        self._removals = []
+        self._resting = {}
+        self._falling_idle = []
+        for hunter in self.hunters:
+            position = (hunter.x, hunter.y)
+            if hunter.stamina <= 0 or (position in self.hideout_index and hunter.carried_treasure is None
+                                       and position not in self.knight_index):
+                self._fall_idle(hunter, position)
+        self.active_hunters = [hunter for hunter in self.hunters if hunter not in self._idle_since]
+
+    def snapshot(self) -> bytes:
+        """Compact binary copy of the whole game (format in eldoria.replay)"""
+        return encode_state(self.capture_state())
+
+    def restore(self, data):
+        """Continue from snapshot() bytes, decay rate included; navigation and columnar settings stay as they are"""
+        self.load_state(decode_state(data))
+
+    def capture_state(self, full=True):
+        """The game as a WorldState of packed arrays.
+
+        full adds the grid codes, hunter memories, cached paths and random state;
+        without them the state is a replay delta body (the writer adds changed cells).
+        """
+        self.settle_hunters()
+        carried = [hunter.carried_treasure for hunter in self.hunters if hunter.carried_treasure is not None]
+        treasures = self.treasures + carried  # Ground treasures in list order, then carried ones
+        rows = {treasure: row for row, treasure in enumerate(treasures)}
+        homes = {hideout: row for row, hideout in enumerate(self.hideouts)}
+        treasure_rows = []
+        for treasure in treasures:
+            decay_steps, ground_since = treasure.decay_state()
+            treasure_rows.append((treasure.x, treasure.y, TREASURE_TYPE_CODES[treasure.type], decay_steps,
+                                  NOWHERE if ground_since is None else ground_since))
+        state = WorldState(
+            size=self.grid.size, tick=self.tick, score=self.score, treasures_expired=self.treasures_expired,
+            game_over=self.game_over, decay_rate=self.decay_rate,
+            hideouts=np.array([(h.x, h.y, h.stored_treasure) for h in self.hideouts], HIDEOUT_DTYPE),
+            hunters=np.array([(h.x, h.y, SKILL_CODES[h.skill], h.stamina, h.survival_timer,
+                               rows[h.carried_treasure] if h.carried_treasure is not None else NOWHERE,
+                               h.hunter_id, homes[h.home] if h.home is not None else NOWHERE)
+                              for h in self.hunters], HUNTER_DTYPE),
+            knights=np.array([(k.x, k.y, k.energy) for k in self.knights], KNIGHT_DTYPE),
+            treasures=np.array(treasure_rows, TREASURE_DTYPE),
+        )
+        if not full:
+            return state
+
+        memory, stored = [], set()
+        for index, hunter in enumerate(self.hunters):
+            if hunter.memory not in stored:  # A team memory goes under its first member
+                stored.add(hunter.memory)
+                memory.extend((index, *divmod(cell, self.grid.size), value, stale)
+                              for cell, value, stale in hunter.memory.entries(self.treasure_stamps))
+        caches, steps = [], []
+        for agent in self.hunters + self.knights:
+            cache = agent.path_cache
+            goal = cache.goal if cache.goal is not None else (NOWHERE, NOWHERE)
+            caches.append((goal[0], goal[1], cache.is_stale(self.grid), len(cache.path)))
+            steps.extend(cache.path)
+        return state._replace(
+            codes=self.grid.codes.copy(), memory=np.array(memory, MEMORY_DTYPE),
+            caches=np.array(caches, CACHE_DTYPE), steps=np.array(steps, STEP_DTYPE).reshape(-1),
+            random_state=self.rng.getstate(),
+        )
+
+    def load_state(self, state):
+        """Replace the game with a WorldState (a decoded snapshot or replay record).
+
+        A state without grid codes is a replay delta and applies its changed
+        cells to the current grid.
+        """
+        if state.codes is not None:
+            if state.size != self.grid.size:
+                self.grid = self._new_grid(state.size)
+                if self.navigator is not None:
+                    self.navigator = FlowFieldNavigator(self.grid)
+            self.grid.load_codes(state.codes)
+            self.treasure_stamps = {}
+        else:
+            self.grid.write_codes(state.changes['cell'], state.changes['code'])
+        if state.random_state is not None:
+            self.rng = random.Random()
+            self.rng.setstate(state.random_state)
+        self.tick = state.tick
+        self.score = state.score
+        self.treasures_expired = state.treasures_expired
+        self.game_over = state.game_over
+        if state.decay_rate != self.decay_rate:
+            self.decay_rate = state.decay_rate
+            self.decay_table = decay_table(state.decay_rate)
+        if self.store is not None:
+            self.store = EntityStore(decay_table=self.decay_table)
+        new_hunter, new_knight, new_treasure = self._factories()
+
+        self.hideouts = []
+        for x, y, stored_treasure in state.hideouts.tolist():
+            hideout = Hideout(x, y)
+            hideout.stored_treasure = stored_treasure
+            self.hideouts.append(hideout)
+        self._hideout_cells = (state.hideouts['x'].astype(np.int64) * state.size + state.hideouts['y'])
+
+        treasures = []
+        for x, y, type_code, decay_steps, ground_since in state.treasures.tolist():
+            treasure = new_treasure(x, y, TREASURE_TYPES[type_code], clock=self)
+            treasure.set_decay_state(decay_steps, None if ground_since == NOWHERE else ground_since)
+            treasures.append(treasure)
+        self.treasures = [treasure for treasure in treasures if treasure.on_ground]
+
+        self.hunters = []
+        self._next_hunter_id = 0
+        for x, y, skill, stamina, survival_timer, carried, hunter_id, home in state.hunters.tolist():
+            hunter = new_hunter(x, y, SKILLS[skill])
+            hunter.stamina = stamina
+            hunter.survival_timer = survival_timer
+            hunter.carried_treasure = treasures[carried] if carried != NOWHERE else None
+            self._enlist(hunter, self.hideouts[home] if home != NOWHERE else None, hunter_id)
+            self.hunters.append(hunter)
+
+        self.knights = []
+        for x, y, energy in state.knights.tolist():
+            knight = new_knight(x, y, rng=self.rng)
+            knight.energy = energy
+            self.knights.append(knight)
+
+        self.treasure_index = PositionIndex(self.treasures)
+        self.knight_index = PositionIndex(self.knights)
+        self.hideout_index = PositionIndex(self.hideouts)
+        self.hunters_alive = len(self.hunters)
+        self.treasures_on_ground = len(self.treasures)
+        self.treasures_carried = sum(hunter.carried_treasure is not None for hunter in self.hunters)
+        self._expiry = []
+        self._live_expiry = {}
+        for treasure in self.treasures:
+            self._schedule_expiry(treasure)
+        self._schedule_hunters()
+
+        if state.memory is not None:
+            for index, x, y, value, stale in state.memory.tolist():
+                cell = x * state.size + y
+                self.hunters[index].memory.remember(cell, value, STALE if stale else self.treasure_stamps.get(cell, 0))
+        if state.caches is not None:
+            steps = [tuple(step) for step in state.steps.tolist()]
+            start = 0
+            for agent, (goal_x, goal_y, stale, length) in zip(self.hunters + self.knights, state.caches.tolist()):
+                goal = None if goal_x == NOWHERE else (goal_x, goal_y)
+                agent.path_cache.restore(self.grid, goal, steps[start:start + length], bool(stale))
+                start += length
+
+    def take_dirty(self):
+        """Cells to redraw since the previous call: entity changes plus every treasure on
+        the ground, whose displayed value moves each tick. Entity changes need grid.track_dirty()."""
+        dirty = self.grid.take_dirty()
+        dirty.update((treasure.x, treasure.y) for treasure in self.treasures)
+        return dirty
+
+    def treasure_at(self, position):
+        """Treasure lying at a cell (the earliest placed if several), or None"""
+        return self.treasure_index.first(position)
+
+    def check_consistency(self):
+        """Raise RuntimeError if a position index, live count or the idle schedule disagrees with the entity lists"""
+        self.treasure_index.check(self.treasures, 'treasure')
+        self.knight_index.check(self.knights, 'knight')
+        self.hideout_index.check(self.hideouts, 'hideout')
+        counts = {'hunters_alive': len(self.hunters), 'treasures_on_ground': len(self.treasures),
+                  'treasures_carried': sum(h.carried_treasure is not None for h in self.hunters)}
+        for name, actual in counts.items():
+            if getattr(self, name) != actual:
+                raise RuntimeError(f"{name} is {getattr(self, name)} but there are {actual}")
+        active = set(self.active_hunters)
+        if len(active) + len(self._idle_since) != len(self.hunters) or not active.isdisjoint(self._idle_since):
+            raise RuntimeError("active and idle hunters do not partition the hunter list")
+        resting = [hunter for hunters in self._resting.values() for hunter in hunters]
+        if len(set(resting)) != len(resting) or not self._idle_since.keys() >= set(resting):
+            raise RuntimeError("resting hunters are not all idle exactly once")
+
+    def _schedule_expiry(self, treasure):
+        """Queue a treasure that just landed on the ground for removal when it decays to 0"""
+        self._expiry_sequence += 1
+        self._live_expiry[treasure] = self._expiry_sequence
+        heappush(self._expiry, (treasure.expiry_tick, self._expiry_sequence, treasure))
 
     def _remove_hunter(self, hunter):
-        """Remove hunter from simulation"""
-        self.hunters.remove(hunter)
-        self.grid.cells[hunter.x][hunter.y] = EntityType.EMPTY
+        """Remove hunter from simulation; it leaves self.hunters at the next _flush_removals"""
+        self._departed_hunters.append(hunter)
+        self.hunters_alive -= 1
+        if hunter.home is not None:
+            hunter.home.remove_hunter(hunter.hunter_id)
+        self.grid.add_entity(hunter.x, hunter.y, EntityType.EMPTY)
+        if hunter.carried_treasure is not None:
+            self.treasures_carried -= 1
+            self._release(hunter.carried_treasure)
+        self._release(hunter)
+
+    def _lift_treasure(self, treasure):
+        """Take a treasure off the ground (pickup or expiry); it leaves self.treasures at the next flush"""
+        del self._live_expiry[treasure]
+        self.treasure_index.remove(treasure)
+        self._stamp(treasure)
+        self._lifted_treasures[treasure] = self._lifted_treasures.get(treasure, 0) + 1
+        self.treasures_on_ground -= 1
+
+    def _stamp(self, treasure):
+        """Invalidate what hunters remember about the cell where a treasure was lifted or dropped"""
+        cell = treasure.x * self.grid.size + treasure.y
+        self.treasure_stamps[cell] = self.treasure_stamps.get(cell, 0) + 1
+
+    def _enlist(self, hunter, hideout, hunter_id=None):
+        """Give a hunter its id and memory, registering it with its home hideout if that has room"""
+        if hunter_id is None:
+            hunter_id = self._next_hunter_id
+        self._next_hunter_id = max(self._next_hunter_id, hunter_id + 1)
+        hunter.hunter_id = hunter_id
+        hunter.decision_model = self.decision_model
+        if hideout is not None and hideout.add_hunter(hunter_id, hunter.skill):
+            hunter.home = hideout
+            if self.team_memory:
+                if hideout.knowledge is None:
+                    hideout.knowledge = HunterMemory(self.memory_capacity * hideout.capacity)
+                hunter.memory = hideout.knowledge
+                return
+        hunter.memory = HunterMemory(self.memory_capacity)
+
+    def _flush_removals(self):
+        """Drop the hunters and treasures removed during a phase from their lists in one pass each.
+
+        A treasure picked up and dropped again in the same phase was appended
+        anew, so only its earlier occurrences are dropped.
+        """
+        if self._falling_idle:
+            idle = set(self._falling_idle)
+            self.active_hunters = [hunter for hunter in self.active_hunters if hunter not in idle]
+            self._falling_idle = []
+        if self._departed_hunters:
+            departed = set(self._departed_hunters)
+            self.hunters = [hunter for hunter in self.hunters if hunter not in departed]
+            self._departed_hunters = []
+        if self._lifted_treasures:
+            lifted = self._lifted_treasures
+            kept = []
+            for treasure in self.treasures:
+                pending = lifted.get(treasure)
+                if pending:
+                    lifted[treasure] = pending - 1
+                else:
+                    kept.append(treasure)
+            self.treasures = kept
+            self._lifted_treasures = {}
+
+    def _release(self, entity):
+        """Give a departed entity's columnar row back to the store"""
+        if self.store is not None:
+            self.store.release(entity)
+
+    def _move_hunter(self, hunter, target):
+        """Step a hunter toward its MOVE target with the configured navigation"""
+        if hunter.carried_treasure is not None:
+            hunter.move_toward(self.grid, target, self.navigator)
+        elif self.flow_treasures:
+            step = self.navigator.next_step_to_type((hunter.x, hunter.y), EntityType.TREASURE)
+            hunter.step_to(self.grid, step)
+        else:
+            hunter.move_toward(self.grid, target)
 
     def _get_hunter_target(self, hunter):
         """Determine hunter's target based on current state"""
@@ -175,8 +692,6 @@ class EldoriaSimulation:
 
     def _check_game_over(self):
         """Check if game should end"""
-        no_treasures = not self.treasures
-        no_carried = all(h.carried_treasure is None for h in self.hunters)
-
-        if (no_treasures and no_carried) or not self.hunters:
+        no_treasures = self.treasures_on_ground == 0 and self.treasures_carried == 0
+        if no_treasures or self.hunters_alive == 0:
             self.game_over = True
\ No newline at end of file
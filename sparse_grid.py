@@ -0,0 +1,290 @@
+"""Sparse Grid backend for very large, mostly empty worlds.
+
+Cells live in fixed-size square chunks allocated on first write. A chunk
+whose last entity leaves is dropped again. Each chunk keeps a count of its
+cells per entity type, and per type the grid knows which chunks hold any. A
+nearest-entity search therefore only scans chunks that hold the target,
+nearest first, and stops as soon as no remaining chunk can be closer.
+
+    grid = SparseGrid(10_000)            # a few bytes until entities arrive
+    simulation = EldoriaSimulation(size=10_000, grid_backend='sparse')
+
+SparseGrid is a drop-in Grid: get, add_entity, get_adjacent (toroidal),
+find_nearest with the same tie-breaking, generations and dirty tracking.
+`codes` materializes a dense (size, size) copy on every access, so it suits
+snapshots and small worlds rather than per-tick use, and writes to that copy
+do not reach the grid.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from eldoria.enums import EntityType
+from eldoria.models.grid import DIRECTIONS, ENTITY_CODES, ENTITY_TYPES, Grid
+
+CHUNK = 64  # Chunk side in cells
+EMPTY_CODE = ENTITY_CODES[EntityType.EMPTY]
+
+
+class _SparseColumn:
+    """cells[x] compatibility view over one column of a SparseGrid"""
+    __slots__ = ('_grid', '_x')
+
+    def __init__(self, grid: 'SparseGrid', x: int):
+        self._grid = grid
+        self._x = x
+
+    def __getitem__(self, y: int) -> EntityType:
+        if not -self._grid.size <= y < self._grid.size:
+            raise IndexError('grid column index out of range')
+        return self._grid.get(self._x, y)
+
+    def __setitem__(self, y: int, entity_type: EntityType):
+        if not -self._grid.size <= y < self._grid.size:
+            raise IndexError('grid column index out of range')
+        self._grid.add_entity(self._x, y, entity_type)
+
+    def __len__(self) -> int:
+        return self._grid.size
+
+    def __iter__(self):
+        return (self._grid.get(self._x, y) for y in range(self._grid.size))
+
+
+class _SparseColumns:
+    """cells compatibility view: columns are made on access instead of size of them up front"""
+    __slots__ = ('_grid',)
+
+    def __init__(self, grid: 'SparseGrid'):
+        self._grid = grid
+
+    def __getitem__(self, x: int) -> _SparseColumn:
+        if not -self._grid.size <= x < self._grid.size:
+            raise IndexError('grid row index out of range')
+        return _SparseColumn(self._grid, x % self._grid.size)
+
+    def __len__(self) -> int:
+        return self._grid.size
+
+    def __iter__(self):
+        return (_SparseColumn(self._grid, x) for x in range(self._grid.size))
+
+
+class SparseGrid(Grid):
+    """Chunked Grid; see the module docstring"""
+
+    def __init__(self, size: int = 20, chunk: int = CHUNK):
+        self.size = size
+        self.chunk = chunk
+        self._per_axis = -(-size // chunk)  # Chunks per axis; the last row and column may be partial
+        self._chunks: Dict[int, bytearray] = {}  # chunk key (cx * per_axis + cy) -> chunk * chunk codes
+        self._counts: Dict[int, List[int]] = {}  # chunk key -> cells per code (EMPTY not counted)
+        self._holding: List[Set[int]] = [set() for _ in ENTITY_TYPES]  # per code, chunks with such cells
+        self._holding_keys: List[Optional[np.ndarray]] = [None] * len(ENTITY_TYPES)  # sorted _holding
+        self._generations = [0] * len(ENTITY_TYPES)
+        self._neighbors = None
+        self._dirty: Optional[Set[int]] = None
+        self.nearest_queries = 0
+        self.cells = _SparseColumns(self)
+        self._last_change = (EMPTY_CODE, EMPTY_CODE)  # (old, new) code of the latest _write that changed a cell
+
+    @property
+    def chunks_loaded(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Dense (size, size) copy of every cell code"""
+        codes = np.zeros((self.size, self.size), dtype=np.uint8)
+        chunk = self.chunk
+        for key, cells in self._chunks.items():
+            cx, cy = divmod(key, self._per_axis)
+            block = np.frombuffer(cells, dtype=np.uint8).reshape(chunk, chunk)
+            x0, y0 = cx * chunk, cy * chunk
+            x1, y1 = min(x0 + chunk, self.size), min(y0 + chunk, self.size)
+            codes[x0:x1, y0:y1] = block[:x1 - x0, :y1 - y0]
+        return codes
+
+    def get(self, x: int, y: int) -> EntityType:
+        """Entity type at a (wrapped) position"""
+        x, y = x % self.size, y % self.size
+        cells = self._chunks.get((x // self.chunk) * self._per_axis + y // self.chunk)
+        if cells is None:
+            return EntityType.EMPTY
+        return ENTITY_TYPES[cells[(x % self.chunk) * self.chunk + y % self.chunk]]
+
+    def add_entity(self, x: int, y: int, entity_type: EntityType):
+        x, y = x % self.size, y % self.size
+        if self._write(x, y, ENTITY_CODES[entity_type]) is not None:
+            self._bump(*self._last_change)
+
+    def place_many(self, positions: Iterable[Tuple[int, int]], entity_type: EntityType):
+        """Write one entity type at many (wrapped) positions, bumping each touched type once"""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2) % self.size
+        self._write_batch(positions[:, 0] * self.size + positions[:, 1],
+                          np.full(len(positions), ENTITY_CODES[entity_type], dtype=np.uint8))
+
+    def write_codes(self, index, codes):
+        """Write raw cell codes at flat indices (snapshot restore and replay)"""
+        self._write_batch(np.asarray(index, dtype=np.int64).reshape(-1),
+                          np.asarray(codes, dtype=np.uint8).reshape(-1))
+
+    def load_codes(self, codes):
+        """Replace every cell with a (size, size) or flat array of codes"""
+        codes = np.asarray(codes, dtype=np.uint8).reshape(-1)
+        occupied = np.flatnonzero(codes)
+        index = np.array(sorted(set(self._occupied_cells()) | set(occupied.tolist())), dtype=np.int64)
+        self._write_batch(index, codes[index] if len(index) else codes[:0])
+
+    def get_adjacent(self, x: int, y: int) -> Dict[Tuple[int, int], EntityType]:
+        size = self.size
+        adjacent = {}
+        for dx, dy in DIRECTIONS:
+            nx, ny = (x + dx) % size, (y + dy) % size
+            adjacent[(nx, ny)] = self.get(nx, ny)
+        return adjacent
+
+    def positions(self, entity_type: EntityType) -> np.ndarray:
+        """(n, 2) array of coordinates holding an entity type, in row-major order"""
+        code = ENTITY_CODES[entity_type]
+        if code == EMPTY_CODE:
+            return super().positions(entity_type)
+        found = [self._cells_in_chunk(key, code) for key in self._holding[code]]
+        if not found:
+            return np.zeros((0, 2), dtype=np.int64)
+        flat = np.sort(np.concatenate([x * self.size + y for x, y in found]))
+        return np.column_stack(np.divmod(flat, self.size))
+
+    def find_nearest(self, start: Tuple[int, int], target: EntityType) -> Tuple[int, int]:
+        """Nearest cell holding target by toroidal steps, breaking ties exactly like Grid.find_nearest"""
+        self.nearest_queries += 1
+        code = ENTITY_CODES[target]
+        sx, sy = start[0] % self.size, start[1] % self.size
+        if code == EMPTY_CODE:
+            return self._nearest_empty(sx, sy)
+
+        keys = self._holding_keys[code]
+        if keys is None:
+            keys = self._holding_keys[code] = np.array(sorted(self._holding[code]), dtype=np.int64)
+        if not len(keys):
+            return -1, -1
+        bounds = self._chunk_distances(sx, sy, keys)
+        order = np.argsort(bounds, kind='stable')
+        best_rank, best = None, None
+        for key, bound in zip(keys[order].tolist(), bounds[order].tolist()):
+            if best_rank is not None and bound > best_rank // self._rank_scale:
+                break  # No cell in this or any later chunk can be closer
+            x, y = self._cells_in_chunk(key, code)
+            rank = self._ranks(sx, sy, x, y)
+            i = int(rank.argmin())
+            if best_rank is None or rank[i] < best_rank:
+                best_rank, best = int(rank[i]), (int(x[i]), int(y[i]))
+        return best
+
+    # Chunk bookkeeping
+
+    def _write(self, x: int, y: int, code: int) -> Optional[int]:
+        """Write one in-range cell; returns its flat index if it changed (old and new code in _last_change)"""
+        chunk = self.chunk
+        key = (x // chunk) * self._per_axis + y // chunk
+        cells = self._chunks.get(key)
+        if cells is None:
+            if code == EMPTY_CODE:
+                return None
+            cells = self._chunks[key] = bytearray(chunk * chunk)
+            self._counts[key] = [0] * len(ENTITY_TYPES)
+        offset = (x % chunk) * chunk + y % chunk
+        old = cells[offset]
+        if old == code:
+            return None
+        cells[offset] = code
+        counts = self._counts[key]
+        if old != EMPTY_CODE:
+            counts[old] -= 1
+            if not counts[old]:
+                self._holding[old].discard(key)
+                self._holding_keys[old] = None
+        if code != EMPTY_CODE:
+            if not counts[code]:
+                self._holding[code].add(key)
+                self._holding_keys[code] = None
+            counts[code] += 1
+        elif not any(counts):
+            del self._chunks[key], self._counts[key]  # Gone cold: nothing but EMPTY left
+        index = x * self.size + y
+        if self._dirty is not None:
+            self._dirty.add(index)
+        self._last_change = (old, code)
+        return index
+
+    def _bump(self, *codes: int):
+        for code in codes:
+            self._generations[code] += 1
+
+    def _write_batch(self, index: np.ndarray, codes: np.ndarray):
+        touched = set()
+        for flat, code in zip(index.tolist(), codes.tolist()):
+            x, y = divmod(flat, self.size)
+            if self._write(x, y, code) is not None:
+                touched.update(self._last_change)
+        self._bump(*sorted(touched))
+
+    def _occupied_cells(self) -> List[int]:
+        cells = []
+        for key in self._chunks:
+            for code in range(len(ENTITY_TYPES)):
+                if code != EMPTY_CODE and key in self._holding[code]:
+                    x, y = self._cells_in_chunk(key, code)
+                    cells.extend((x * self.size + y).tolist())
+        return cells
+
+    def _cells_in_chunk(self, key: int, code: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Grid coordinates of the cells in a chunk holding code"""
+        cx, cy = divmod(key, self._per_axis)
+        offsets = np.flatnonzero(np.frombuffer(self._chunks[key], dtype=np.uint8) == code)
+        return cx * self.chunk + offsets // self.chunk, cy * self.chunk + offsets % self.chunk
+
+    def _chunk_distances(self, sx: int, sy: int, keys: np.ndarray) -> np.ndarray:
+        """Fewest toroidal steps from (sx, sy) to any cell of each chunk"""
+        cx, cy = np.divmod(keys, self._per_axis)
+        return self._axis_distance(sx, cx) + self._axis_distance(sy, cy)
+
+    def _axis_distance(self, s: int, c: np.ndarray) -> np.ndarray:
+        low = c * self.chunk
+        high = np.minimum(low + self.chunk, self.size) - 1
+        inside = (low <= s) & (s <= high)
+        return np.where(inside, 0, np.minimum((low - s) % self.size, (s - high) % self.size))
+
+    # Tie-breaking. find_nearest's BFS returns, among the nearest targets, the one
+    # whose first-in-DIRECTIONS shortest path is smallest. That path takes all its
+    # x steps before its y steps, so targets rank by distance, then up (-x) before
+    # down (+x) before level, then the longest x run, then left (-y) before right.
+    # An offset of exactly half an even world is reachable both ways; -x and -y win.
+
+    @property
+    def _rank_scale(self) -> int:
+        return 3 * 2 * (self.size + 1)
+
+    def _offsets(self, s: int, c: np.ndarray) -> np.ndarray:
+        half = self.size // 2
+        return (c - s + half) % self.size - half
+
+    def _ranks(self, sx: int, sy: int, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """One integer per cell ordering it as find_nearest would: distance first, then the tie-break"""
+        dx, dy = self._offsets(sx, x), self._offsets(sy, y)
+        distance = np.abs(dx) + np.abs(dy)
+        side = np.where(dx < 0, 0, np.where(dx > 0, 1, 2))
+        return ((distance * 3 + side) * (self.size + 1) + (self.size - np.abs(dx))) * 2 + (dy > 0)
+
+    def _nearest_empty(self, sx: int, sy: int) -> Tuple[int, int]:
+        """Walk outward ring by ring in tie-break order; empty cells are nearly everywhere"""
+        low, high = -(self.size // 2), (self.size - 1) // 2
+        for distance in range(2 * (self.size // 2) + 1):
+            for dx in list(range(-distance, 0)) + list(range(distance, 0, -1)) + [0]:
+                if not low <= dx <= high:
+                    continue
+                rest = distance - abs(dx)
+                for dy in ((-rest, rest) if rest else (0,)):
+                    if low <= dy <= high and self.get(sx + dx, sy + dy) == EntityType.EMPTY:
+                        return (sx + dx) % self.size, (sy + dy) % self.size
+        return -1, -1
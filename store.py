@@ -0,0 +1,233 @@
+"""Optional structure-of-arrays storage for hunters, knights and treasures.
+
+An EntityStore keeps every per-entity number in NumPy columns (one row per
+entity) so per-tick bookkeeping runs as whole-array operations:
+
+    store = EntityStore()
+    hunter = store.hunter(x, y, skill)   # a TreasureHunter whose fields live in store.hunters
+    exhausted = store.drain_stamina(hideout_cells, size)
+
+The row classes are the regular entity classes with their numeric fields
+redirected to the store, so the rest of the simulation uses them unchanged.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from eldoria.enums import HunterSkill, TreasureType
+from eldoria.models.hunter import TreasureHunter
+from eldoria.models.knight import Knight, MAX_ENERGY, PATROL_COST, RECOVERY, RETURN_ENERGY
+from eldoria.models.treasure import DECAY_TABLE, Treasure
+
+SKILLS = tuple(HunterSkill)
+SKILL_CODES = {skill: code for code, skill in enumerate(SKILLS)}
+TREASURE_TYPES = tuple(TreasureType)
+TREASURE_TYPE_CODES = {treasure_type: code for code, treasure_type in enumerate(TREASURE_TYPES)}
+MULTIPLIERS = np.array([treasure_type.value_multiplier for treasure_type in TREASURE_TYPES])
+NOWHERE = -1  # Row reference / tick meaning "none"
+
+HUNTER_COLUMNS = {'x': np.int32, 'y': np.int32, 'stamina': np.float64, 'survival_timer': np.int32,
+                  'skill': np.int8, 'carried': np.int32}
+KNIGHT_COLUMNS = {'x': np.int32, 'y': np.int32, 'energy': np.float64}
+TREASURE_COLUMNS = {'x': np.int32, 'y': np.int32, 'type': np.int8, 'decay_steps': np.int32,
+                    'ground_since': np.int64}
+
+
+class ColumnStore:
+    """Growable table of NumPy columns; rows are handed out and recycled through a free list.
+
+    Columns are reallocated when the table grows, so always index through
+    ``store[name]`` rather than keeping a column around.
+    """
+
+    def __init__(self, columns: Dict[str, type], capacity: int = 64):
+        self._columns = {name: np.zeros(capacity, dtype) for name, dtype in columns.items()}
+        self.live = np.zeros(capacity, dtype=bool)
+        self.entities: List[Optional[object]] = [None] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return int(self.live.sum())
+
+    @property
+    def capacity(self) -> int:
+        return len(self.live)
+
+    @property
+    def nbytes(self) -> int:
+        return self.live.nbytes + sum(column.nbytes for column in self._columns.values())
+
+    def allocate(self, entity) -> int:
+        if not self._free:
+            self._grow()
+        row = self._free.pop()
+        self.live[row] = True
+        self.entities[row] = entity
+        return row
+
+    def release(self, row: int):
+        self.live[row] = False
+        self.entities[row] = None
+        for column in self._columns.values():
+            column[row] = 0
+        self._free.append(row)
+
+    def _grow(self):
+        old = self.capacity
+        new = 2 * old
+        for name, column in self._columns.items():
+            grown = np.zeros(new, column.dtype)
+            grown[:old] = column
+            self._columns[name] = grown
+        self.live = np.concatenate([self.live, np.zeros(old, dtype=bool)])
+        self.entities.extend([None] * old)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+
+class Column:
+    """Attribute stored in one column of the owning entity's store row"""
+    __slots__ = ('name', 'load', 'dump')
+
+    def __init__(self, name: str, load=None, dump=None):
+        self.name = name
+        self.load = load
+        self.dump = dump
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        value = entity._store[self.name][entity._row].item()
+        return self.load(value) if self.load is not None else value
+
+    def __set__(self, entity, value):
+        entity._store[self.name][entity._row] = self.dump(value) if self.dump is not None else value
+
+
+def _optional_tick(tick: int) -> Optional[int]:
+    return None if tick == NOWHERE else tick
+
+
+def _tick_or_nowhere(tick: Optional[int]) -> int:
+    return NOWHERE if tick is None else tick
+
+
+class CarriedColumn(Column):
+    """carried_treasure as a treasure-table row, NOWHERE when empty-handed"""
+    __slots__ = ()
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        row = entity._store[self.name][entity._row]
+        return None if row == NOWHERE else entity._treasures.entities[row]
+
+    def __set__(self, entity, treasure):
+        entity._store[self.name][entity._row] = NOWHERE if treasure is None else treasure._row
+
+
+class HunterRow(TreasureHunter):
+    __slots__ = ('_store', '_row', '_treasures')
+    x = Column('x')
+    y = Column('y')
+    stamina = Column('stamina')
+    survival_timer = Column('survival_timer')
+    skill = Column('skill', SKILLS.__getitem__, SKILL_CODES.__getitem__)
+    carried_treasure = CarriedColumn('carried')
+
+    def __init__(self, store: 'EntityStore', x: int, y: int, skill: HunterSkill):
+        self._store = store.hunters
+        self._treasures = store.treasures
+        self._row = self._store.allocate(self)
+        super().__init__(x, y, skill)
+
+
+class KnightRow(Knight):
+    __slots__ = ('_store', '_row')
+    x = Column('x')
+    y = Column('y')
+    energy = Column('energy')
+
+    def __init__(self, store: 'EntityStore', x: int, y: int, rng=None):
+        self._store = store.knights
+        self._row = self._store.allocate(self)
+        super().__init__(x, y, rng)
+
+
+class TreasureRow(Treasure):
+    __slots__ = ('_store', '_row')
+    x = Column('x')
+    y = Column('y')
+    type = Column('type', TREASURE_TYPES.__getitem__, TREASURE_TYPE_CODES.__getitem__)
+    _decay_steps = Column('decay_steps')
+    _ground_since = Column('ground_since', _optional_tick, _tick_or_nowhere)
+
+    def __init__(self, store: 'EntityStore', x: int, y: int, treasure_type: TreasureType, clock=None):
+        self._store = store.treasures
+        self._row = self._store.allocate(self)
+        super().__init__(x, y, treasure_type, clock, store.decay_table)
+
+
+class EntityStore:
+    """Column tables for one simulation's hunters, knights and treasures; every treasure decays by decay_table"""
+
+    def __init__(self, capacity: int = 64, decay_table=DECAY_TABLE):
+        self.decay_table = decay_table
+        self._decay_values = np.array(decay_table)
+        self.hunters = ColumnStore(HUNTER_COLUMNS, capacity)
+        self.knights = ColumnStore(KNIGHT_COLUMNS, capacity)
+        self.treasures = ColumnStore(TREASURE_COLUMNS, capacity)
+
+    def hunter(self, x: int, y: int, skill: HunterSkill) -> HunterRow:
+        return HunterRow(self, x, y, skill)
+
+    def knight(self, x: int, y: int, rng=None) -> KnightRow:
+        return KnightRow(self, x, y, rng)
+
+    def treasure(self, x: int, y: int, treasure_type: TreasureType, clock=None) -> TreasureRow:
+        return TreasureRow(self, x, y, treasure_type, clock)
+
+    def release(self, entity):
+        """Free the row of an entity that left the simulation; the object must not be used afterwards"""
+        entity._store.release(entity._row)
+
+    def drain_stamina(self, hideout_cells: np.ndarray, size: int) -> np.ndarray:
+        """Start-of-tick stamina and survival-timer update for every live hunter.
+
+        hideout_cells holds the flat indices (x * size + y) of the hideouts. Hunters already exhausted count
+        down their survival timer; the rest recover 1 in a hideout or pay their
+        movement cost. Returns the exhausted mask by row.
+        """
+        hunters = self.hunters
+        stamina = hunters['stamina']
+        exhausted = hunters.live & (stamina <= 0)
+        active = hunters.live & ~exhausted
+        resting = active & np.isin(hunters['x'].astype(np.int64) * size + hunters['y'], hideout_cells)
+        walking = active & ~resting
+        cost = np.where(hunters['skill'] == SKILL_CODES[HunterSkill.ENDURANCE], 1, 2)
+        hunters['survival_timer'][exhausted] -= 1
+        stamina[resting] = np.minimum(100, stamina[resting] + 1)
+        stamina[walking] = np.maximum(0, stamina[walking] - cost[walking])
+        return exhausted
+
+    def recover_knights(self, returning: np.ndarray, moved: np.ndarray):
+        """Energy after a patrol tick: returning knights recover, knights that patrolled a step pay for it"""
+        energy = self.knights['energy']
+        patrolled = moved & ~returning
+        energy[returning] = np.minimum(MAX_ENERGY, energy[returning] + RECOVERY)
+        energy[patrolled] = np.maximum(0, energy[patrolled] - PATROL_COST)
+
+    def returning_knights(self) -> np.ndarray:
+        """Mask by row of live knights low enough on energy to head home"""
+        return self.knights.live & (self.knights['energy'] <= RETURN_ENERGY)
+
+    def treasure_values(self, tick: int) -> np.ndarray:
+        """Current value (with type multiplier) of every treasure row, 0 for free rows"""
+        treasures = self.treasures
+        ground_since = treasures['ground_since']
+        on_ground = ground_since != NOWHERE
+        steps = treasures['decay_steps'] + np.where(on_ground, tick - ground_since, 0)
+        values = self._decay_values[np.minimum(steps, len(self.decay_table) - 1)] * MULTIPLIERS[treasures['type']]
+        return np.where(treasures.live, values, 0.0)
@@ -0,0 +1,278 @@
+"""Parameter sweeps: seeded games over a grid of world parameters, once per candidate decision model.
+
+    grid = {'size': [15, 20], 'knights': [3, 5], 'treasures': [20], 'decay_rate': [0.1, 0.2]}
+    policies = {'shipped': HunterDecisionModel.shared(), 'always-move': constant_model(Action.MOVE)}
+    results = dict(run_sweep(grid, policies, games=100, cache_dir='sweep-cache'))
+    print(format_report(summarize(results.items())))
+
+Grid keys are EldoriaSimulation options. Every combination of grid values and
+policy is one cell; its games run across a process pool in chunks, and a
+finished cell is written to cache_dir under a hash of everything that decides
+its games, so an interrupted sweep resumes with the cells still missing:
+
+    python -m eldoria.sweep --size 15 20 --knights 3 5 --decay-rate 0.1 0.2 --games 100 --cache sweep-cache
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from eldoria.ai.decision_tree import CompiledTree, HunterDecisionModel
+from eldoria.batch import RunResult, run_game, run_lockstep
+from eldoria.enums import Action
+from eldoria.lockstep import check_options
+
+CACHE_VERSION = 1  # Bump when the rules change, so cached cells are not reused
+CHUNK = 50  # Games per task on the scalar engine
+
+
+class SweepCell(NamedTuple):
+    policy: str
+    params: Tuple[Tuple[str, object], ...]  # Sorted (option, value) pairs
+
+    @property
+    def options(self) -> Dict[str, object]:
+        return dict(self.params)
+
+
+def constant_model(action: Action) -> HunterDecisionModel:
+    """Model that always picks one action, as a baseline"""
+    return HunterDecisionModel(CompiledTree.constant(action.value))
+
+
+POLICIES = {
+    'shipped': HunterDecisionModel.shared,
+    'always-move': lambda: constant_model(Action.MOVE),
+    'always-rest': lambda: constant_model(Action.REST),
+}
+
+
+def load_policy(name: str) -> HunterDecisionModel:
+    """A POLICIES entry, or a model file written by eldoria.ai.training"""
+    if name in POLICIES:
+        return POLICIES[name]()
+    if name.endswith('.npz'):
+        return HunterDecisionModel.load(name)
+    raise ValueError(f"unknown policy {name!r}: expected one of {sorted(POLICIES)} or a .npz model file")
+
+
+def expand(grid: Mapping[str, Sequence], policies: Iterable[str]) -> List[SweepCell]:
+    """Every (policy, parameter combination) cell, policies outermost"""
+    names = sorted(grid)
+    combinations = list(itertools.product(*(grid[name] for name in names)))
+    return [SweepCell(policy, tuple(zip(names, values))) for policy in policies for values in combinations]
+
+
+def cell_key(cell: SweepCell, model: HunterDecisionModel, seeds: Sequence[int], max_steps: int,
+             lockstep: bool = False) -> str:
+    """Hash of everything that decides a cell's games (not its policy's name)"""
+    spec = {'version': CACHE_VERSION, 'params': cell.params, 'seeds': list(seeds), 'max_steps': max_steps,
+            'engine': 'lockstep' if lockstep else 'scalar', 'model': model.tree.to_source()}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def _cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f'{key}.json')
+
+
+def _load_cell(cache_dir: Optional[str], key: str) -> Optional[List[RunResult]]:
+    if cache_dir is None:
+        return None
+    try:
+        with open(_cache_path(cache_dir, key)) as f:
+            return [RunResult(**row) for row in json.load(f)['results']]
+    except FileNotFoundError:
+        return None
+
+
+def _store_cell(cache_dir: str, key: str, cell: SweepCell, results: List[RunResult]):
+    """Write a finished cell; the rename makes a partly written file impossible"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, key)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'policy': cell.policy, 'params': cell.params,
+                   'results': [result._asdict() for result in results]}, f)
+    os.replace(path + '.tmp', path)
+
+
+def _run_chunk(seeds: Sequence[int], max_steps: int, lockstep: bool, options: dict) -> List[RunResult]:
+    if lockstep:
+        options = dict(options)
+        return list(run_lockstep(seeds, options.pop('size', 20), max_steps, **options))
+    return [run_game(seed, max_steps=max_steps, **options) for seed in seeds]
+
+
+def run_sweep(grid: Mapping[str, Sequence], policies: Mapping[str, HunterDecisionModel], games: int = 100,
+              seed: int = 0, max_steps: int = 1000, workers: Optional[int] = None,
+              cache_dir: Optional[str] = None, lockstep: bool = False) -> Iterator[Tuple[SweepCell, List[RunResult]]]:
+    """Yield (cell, results by seed) for every cell: cached cells first, then the rest as they finish.
+
+    Every cell plays seeds seed .. seed + games - 1. workers=1 runs in this
+    process; otherwise chunks of games are spread over a ProcessPoolExecutor
+    (default: one worker per CPU). lockstep=True plays each cell on the
+    vectorized engine (see batch.run_lockstep) in one task, and refuses grid
+    keys that engine does not implement.
+    """
+    if lockstep:
+        check_options(set(grid) - {'size'})
+    seeds = list(range(seed, seed + games))
+    chunk = len(seeds) if lockstep else CHUNK
+    pending = {}  # cell -> (cache key, chunks outstanding, results so far)
+    tasks = []
+    for cell in expand(grid, policies):
+        model = policies[cell.policy]
+        key = cell_key(cell, model, seeds, max_steps, lockstep)
+        cached = _load_cell(cache_dir, key)
+        if cached is not None:
+            yield cell, cached
+            continue
+        chunks = [seeds[start:start + chunk] for start in range(0, len(seeds), chunk)]
+        pending[cell] = [key, len(chunks), []]
+        options = dict(cell.options, decision_model=model)
+        tasks.extend((cell, (chunk_seeds, max_steps, lockstep, options)) for chunk_seeds in chunks)
+
+    def finish(cell, results):
+        entry = pending[cell]
+        entry[1] -= 1
+        entry[2].extend(results)
+        if entry[1]:
+            return None
+        del pending[cell]
+        results = sorted(entry[2])
+        if cache_dir is not None:
+            _store_cell(cache_dir, entry[0], cell, results)
+        return results
+
+    if workers == 1:
+        for cell, args in tasks:
+            results = finish(cell, _run_chunk(*args))
+            if results is not None:
+                yield cell, results
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_chunk, *args): cell for cell, args in tasks}
+        for future in as_completed(futures):
+            results = finish(futures[future], future.result())
+            if results is not None:
+                yield futures[future], results
+
+
+class Distribution(NamedTuple):
+    mean: float
+    std: float
+    p10: float
+    median: float
+    p90: float
+
+    @classmethod
+    def of(cls, values: Sequence[float]) -> 'Distribution':
+        values = np.asarray(values, dtype=float)
+        p10, median, p90 = np.percentile(values, [10, 50, 90])
+        return cls(float(values.mean()), float(values.std()), float(p10), float(median), float(p90))
+
+
+class PolicySummary(NamedTuple):
+    policy: str
+    params: Tuple[Tuple[str, object], ...]  # Values of the grouped-by parameters
+    games: int
+    score: Distribution
+    survivors: Distribution  # Hunters alive at the end of a game
+    steps: Distribution
+    survival_rate: float  # Fraction of games ending with a hunter alive
+
+
+def summarize(cells: Iterable[Tuple[SweepCell, List[RunResult]]], by: Sequence[str] = ()) -> List[PolicySummary]:
+    """Score and survival distributions per policy, or per policy and value of the `by` parameters"""
+    groups: Dict[Tuple[str, tuple], List[RunResult]] = {}
+    for cell, results in cells:
+        options = cell.options
+        group = (cell.policy, tuple((name, options.get(name)) for name in by))
+        groups.setdefault(group, []).extend(results)
+    summaries = []
+    def order(group):
+        policy, params = group
+        return policy, [(value is None, value) for _, value in params]
+
+    for (policy, params), results in sorted(groups.items(), key=lambda item: order(item[0])):
+        survivors = [result.hunters_surviving for result in results]
+        summaries.append(PolicySummary(
+            policy=policy,
+            params=params,
+            games=len(results),
+            score=Distribution.of([result.score for result in results]),
+            survivors=Distribution.of(survivors),
+            steps=Distribution.of([result.steps for result in results]),
+            survival_rate=float(np.mean([count > 0 for count in survivors])),
+        ))
+    return summaries
+
+
+def format_report(summaries: Sequence[PolicySummary]) -> str:
+    """Plain-text table of summarize() output"""
+    lines = [f"{'policy':<16} {'group':<24}{'games':>7}  {'score mean±std [p10 p50 p90]':<34}"
+             f"{'survivors mean [p10 p50 p90]':<30}{'survived':>9}"]
+    for summary in summaries:
+        group = ' '.join(f'{name}={value}' for name, value in summary.params) or '-'
+        score, survivors = summary.score, summary.survivors
+        lines.append(
+            f"{summary.policy:<16} {group:<24}{summary.games:>7}  "
+            f"{f'{score.mean:.2f}±{score.std:.2f} [{score.p10:.2f} {score.median:.2f} {score.p90:.2f}]':<34}"
+            f"{f'{survivors.mean:.2f} [{survivors.p10:g} {survivors.median:g} {survivors.p90:g}]':<30}"
+            f"{summary.survival_rate:>9.1%}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep world parameters and decision models, headless.")
+    parser.add_argument('--size', type=int, nargs='+', default=[20])
+    parser.add_argument('--knights', type=int, nargs='+', default=[5])
+    parser.add_argument('--treasures', type=int, nargs='+', default=[20])
+    parser.add_argument('--decay-rate', type=float, nargs='+', default=[0.1])
+    parser.add_argument('--policy', action='append',
+                        help=f"candidate decision model: one of {', '.join(sorted(POLICIES))} or a .npz model file "
+                             "(repeatable; default: the built-in ones)")
+    parser.add_argument('--games', type=int, default=100, help="games per cell")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game of every cell")
+    parser.add_argument('--max-steps', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--cache', metavar='DIR', help="keep finished cells here and reuse them")
+    parser.add_argument('--lockstep', action='store_true', help="play each cell on the vectorized engine")
+    parser.add_argument('--by', nargs='*', default=[], choices=('size', 'knights', 'treasures', 'decay_rate'),
+                        help="also split the report by these parameters")
+    parser.add_argument('--json', action='store_true', help="print one JSON summary per line instead of a table")
+    args = parser.parse_args(argv)
+
+    grid = {'size': args.size, 'knights': args.knights, 'treasures': args.treasures, 'decay_rate': args.decay_rate}
+    try:
+        policies = {name: load_policy(name) for name in args.policy or POLICIES}
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    cells = []
+    total = len(expand(grid, policies))
+    for cell, results in run_sweep(grid, policies, args.games, args.seed, args.max_steps, args.workers,
+                                   args.cache, args.lockstep):
+        cells.append((cell, results))
+        sys.stderr.write(f"\r{len(cells)}/{total} cells")
+        sys.stderr.flush()
+    sys.stderr.write('\n')
+
+    summaries = summarize(cells, args.by)
+    if args.json:
+        for summary in summaries:
+            row = summary._asdict()
+            for name in ('score', 'survivors', 'steps'):
+                row[name] = row[name]._asdict()
+            sys.stdout.write(json.dumps(row) + '\n')
+    else:
+        sys.stdout.write(format_report(summaries) + '\n')
+
+
+if __name__ == '__main__':
+    main()
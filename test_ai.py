@@ -6,4 +6,37 @@ class TestAI:
     def test_decision_tree(self):
         model = HunterDecisionModel()
         prediction = model.predict(50, 0.13, 3)
-        assert prediction in [0, 1, 2, 3]  # COLLECT, MOVE, FLEE, REST
\ No newline at end of file
+        assert prediction in [0, 1, 2, 3]  # COLLECT, MOVE, FLEE, REST
+
+    def test_shared_model_is_reused(self):
+        assert HunterDecisionModel.shared() is HunterDecisionModel.shared()
+
+    def test_predict_batch_matches_predict(self):
+        model = HunterDecisionModel.shared()
+        states = np.array([[80, 0.13, 5], [10, 0.03, 1], [50, 0.07, 3]])
+        expected = [model.predict(*row) for row in states]
+        assert model.predict_batch(states).tolist() == expected
+        assert model.predict_batch(np.empty((0, 3))).shape == (0,)
+
+    def test_compiled_tree_matches_sklearn(self):
+        pytest.importorskip('sklearn')
+        from eldoria.ai.decision_tree import CompiledTree, fit_classifier
+
+        classifier = fit_classifier()
+        tree = CompiledTree.from_sklearn(classifier)
+        stamina = np.linspace(0, 100, 41)
+        values = np.concatenate([np.linspace(0, 0.2, 41), [0.07, 0.0999999, 0.1, 0.13]])
+        distance = np.concatenate([np.linspace(0, 15, 61), [1e6]])
+        states = np.array(np.meshgrid(stamina, values, distance)).reshape(3, -1).T
+
+        expected = classifier.predict(states)
+        assert (tree.predict_batch(states) == expected).all()
+        assert [tree.predict(*row) for row in states[::37]] == expected[::37].tolist()
+
+    def test_shipped_tree_matches_sklearn(self):
+        pytest.importorskip('sklearn')
+        from eldoria.ai.decision_tree import fit_classifier
+
+        states = np.random.default_rng(0).uniform([0, 0, 0], [100, 0.2, 20], size=(5000, 3))
+        model = HunterDecisionModel()
+        assert (model.predict_batch(states) == fit_classifier().predict(states)).all()
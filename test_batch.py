@@ -0,0 +1,13 @@
+from eldoria.batch import run_batch, run_game
+
+
+class TestBatch:
+    def test_same_seed_same_result(self):
+        assert run_game(11, size=10, max_steps=150) == run_game(11, size=10, max_steps=150)
+
+    def test_serial_and_parallel_agree(self):
+        seeds = range(4)
+        serial = sorted(run_batch(seeds, size=10, max_steps=150, workers=1))
+        parallel = sorted(run_batch(seeds, size=10, max_steps=150, workers=2))
+        assert serial == parallel
+        assert [result.seed for result in serial] == list(seeds)
@@ -0,0 +1,33 @@
+from eldoria import benchmarks
+from eldoria.simulation import EldoriaSimulation
+
+
+class TestBenchmarks:
+    def test_population_is_configurable(self):
+        simulation = EldoriaSimulation(size=30, seed=1, knights=9, treasures=40, hunters_per_hideout=3)
+        assert len(simulation.knights) == 9
+        assert len(simulation.treasures) == 40
+        assert len(simulation.hunters) == 3 * len(simulation.hideouts)
+
+    def test_scenarios_scale_with_area_and_density(self):
+        assert benchmarks.scenario(20, 'default')[2:] == (5, 20, 2)
+        dense = benchmarks.scenario(40, 'dense')
+        assert (dense.knights, dense.treasures, dense.hunters_per_hideout) == (40, 160, 4)
+
+    def test_suite_and_compare(self, tmp_path):
+        results = benchmarks.run_suite(sizes=[12], densities=['default'], repeat=1,
+                                       warmup=2, ticks=3, queries=5, frames=3)
+        assert results['size12-default/run_step_ticks'] == 3
+        assert all(value >= 0 for value in results.values())
+        assert benchmarks.compare(results, results, threshold=0.2) == []
+
+        slower = {key: value * 2 for key, value in results.items()}
+        flagged = benchmarks.compare(slower, results, threshold=0.2)
+        assert any(line.startswith('size12-default/construct_ms') for line in flagged)
+        assert not any('run_step_ticks' in line for line in flagged)
+
+    def test_find_nearest_on_a_full_grid(self):
+        case = benchmarks.Scenario(4, 'full', knights=0, treasures=13, hunters_per_hideout=0)
+        assert not (EldoriaSimulation(seed=0, **case.options()).grid.codes == 0).any()
+        results = benchmarks.bench_find_nearest(case, seed=0, repeat=1, queries=3)
+        assert list(results) == ['find_nearest_warm_ms']  # No empty cell to change for the cold measurement
@@ -1,3 +1,7 @@
+import random
+from collections import deque
+
+import numpy as np
 import pytest
 from eldoria.models.grid import Grid
 from eldoria.enums import EntityType
@@ -18,4 +22,61 @@ class TestGrid:
 
     def test_wrap_around(self, grid):
         grid.add_entity(25, 25, EntityType.KNIGHT)
-        assert grid.cells[5][5] == EntityType.KNIGHT
\ No newline at end of file
+        assert grid.cells[5][5] == EntityType.KNIGHT
+
+    def test_dirty_cells_are_only_tracked_on_request(self, grid):
+        grid.add_entity(1, 2, EntityType.HUNTER)
+        assert grid.take_dirty() == set()
+        grid.track_dirty()
+        grid.add_entity(3, 4, EntityType.HUNTER)
+        assert grid.take_dirty() == {(3, 4)}
+        assert grid.take_dirty() == set()
+
+    def test_find_nearest_matches_bfs(self):
+        def bfs_nearest(grid, start, target):
+            queue, visited = deque([start]), set()
+            while queue:
+                x, y = queue.popleft()
+                if grid.cells[x][y] == target:
+                    return (x, y)
+                for cell in grid.get_adjacent(x, y):
+                    if cell not in visited:
+                        visited.add(cell)
+                        queue.append(cell)
+            return (-1, -1)
+
+        rng = random.Random(7)
+        for size in (1, 2, 3, 6, 9):
+            grid = Grid(size)
+            for _ in range(4):
+                for _ in range(rng.randint(0, 4)):
+                    grid.add_entity(rng.randrange(size), rng.randrange(size), rng.choice(list(EntityType)))
+                for target in (EntityType.TREASURE, EntityType.HIDEOUT, EntityType.KNIGHT):
+                    for x in range(size):
+                        for y in range(size):
+                            assert grid.find_nearest((x, y), target) == bfs_nearest(grid, (x, y), target)
+
+    def test_find_nearest_tracks_direct_writes(self):
+        grid = Grid(10)
+        grid.add_entity(2, 2, EntityType.TREASURE)
+        assert grid.find_nearest((0, 0), EntityType.TREASURE) == (2, 2)
+        grid.cells[2][2] = EntityType.EMPTY
+        assert grid.find_nearest((0, 0), EntityType.TREASURE) == (-1, -1)
+        grid.cells[9][9] = EntityType.TREASURE
+        assert grid.find_nearest((0, 0), EntityType.TREASURE) == (9, 9)
+
+    def test_codes_share_cell_storage(self, grid):
+        grid.add_entity(3, 4, EntityType.TREASURE)
+        assert grid.codes.dtype == np.uint8
+        assert grid.mask(EntityType.TREASURE).sum() == 1
+        assert grid.positions(EntityType.TREASURE).tolist() == [[3, 4]]
+        assert grid.get(23, 24) == EntityType.TREASURE
+
+    def test_place_many_and_neighbor_counts(self, grid):
+        grid.place_many([(0, 0), (19, 0), (21, 1)], EntityType.KNIGHT)
+        assert grid.cells[1][1] == EntityType.KNIGHT
+        counts = grid.count_adjacent(EntityType.KNIGHT)
+        # (0, 1) touches (0, 0) and (1, 1); (19, 0) wraps around to neighbour (0, 0)
+        assert counts[0, 1] == 2
+        assert counts[0, 0] == 1
+        assert grid.find_nearest((18, 0), EntityType.KNIGHT) == (19, 0)
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ('sklearn', 'scipy', 'tkinter')
+IMPORT_BUDGET = 1.0  # seconds for a fresh interpreter to import and step a headless world
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'elapsed': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def probe(body):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    output = subprocess.run([sys.executable, '-c', PROBE.format(body=body)], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    loaded = {name.split('.')[0] for name in result['modules']}
+    return result['elapsed'], loaded
+
+
+class TestImports:
+    def test_package_import_is_lazy(self):
+        _, loaded = probe("import eldoria\nimport eldoria.models.grid")
+        assert not loaded & set(HEAVY_MODULES)
+
+    def test_headless_simulation_within_budget(self):
+        elapsed, loaded = probe(
+            "from eldoria.simulation import EldoriaSimulation\n"
+            "simulation = EldoriaSimulation(size=20, seed=0)\n"
+            "for _ in range(5): simulation.run_step()"
+        )
+        assert not loaded & set(HEAVY_MODULES)
+        assert elapsed < IMPORT_BUDGET
+
+    def test_gui_module_defers_tkinter(self):
+        _, loaded = probe("import eldoria.main")
+        assert 'tkinter' not in loaded
+
+    def test_lazy_attributes_resolve(self):
+        import eldoria
+        assert eldoria.HunterDecisionModel.shared() is eldoria.HunterDecisionModel.shared()
+        assert callable(eldoria.a_star)
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+from eldoria.batch import run_batch
+from eldoria.enums import EntityType
+from eldoria.lockstep import LockstepSimulation
+from eldoria.models.grid import Grid
+from eldoria.simulation import EldoriaSimulation
+
+
+def ks_statistic(a, b):
+    """Two-sample Kolmogorov-Smirnov distance between empirical distributions"""
+    values = np.union1d(a, b)
+    cdf_a = np.searchsorted(np.sort(a), values, side='right') / len(a)
+    cdf_b = np.searchsorted(np.sort(b), values, side='right') / len(b)
+    return np.abs(cdf_a - cdf_b).max()
+
+
+class TestLockstep:
+    def test_worlds_start_like_the_scalar_engine(self):
+        engine = LockstepSimulation([3, 4], size=10)
+        for row, seed in enumerate([3, 4]):
+            world = EldoriaSimulation(size=10, seed=seed)
+            assert np.array_equal(engine.grid[row], world.grid.codes)
+            assert engine.hunter_alive[row].sum() == len(world.hunters)
+
+    def test_statistics_match_scalar_engine(self):
+        seeds = range(120)
+        scalar = list(run_batch(seeds, size=10, max_steps=200, workers=1))
+        engine = LockstepSimulation(seeds, size=10)
+        engine.run(max_steps=200)
+        lockstep = engine.results()
+        assert [result.seed for result in lockstep] == list(seeds)
+
+        steps = [np.array([result.steps for result in results]) for results in (scalar, lockstep)]
+        assert ks_statistic(*steps) < 0.2  # Well inside the 1% critical value (~0.21) for 120 vs 120 games
+        assert np.median(steps[0]) == np.median(steps[1])
+        survivors = [np.mean([result.hunters_surviving for result in results]) for results in (scalar, lockstep)]
+        assert abs(survivors[0] - survivors[1]) < 0.1
+
+    def test_unimplemented_options_are_refused(self):
+        for options in ({'memory_capacity': 2}, {'team_memory': True}, {'navigation': 'flow'}, {'columnar': True},
+                        {'grid_backend': 'sparse'}):
+            with pytest.raises(ValueError):
+                LockstepSimulation([0], size=8, **options)
+        LockstepSimulation([0], size=8, knights=2, decay_rate=0.5, placement='kmeans')
+
+    def test_finished_worlds_stop_changing(self):
+        engine = LockstepSimulation(range(20), size=8)
+        engine.run(max_steps=400)
+        before = engine.results()
+        for _ in range(5):
+            engine.run_step()
+        after = engine.results()
+        assert [a for a in before if a.game_over] == [b for b in after if b.game_over]
+
+    def test_nearest_matches_grid_find_nearest(self):
+        engines = {size: LockstepSimulation([0], size=size) for size in (7, 8)}
+        for trial in range(200):
+            rng = random.Random(trial)
+            size = rng.choice([7, 8])
+            grid = Grid(size)
+            targets = [(rng.randrange(size), rng.randrange(size)) for _ in range(rng.randint(1, 5))]
+            grid.place_many(targets, EntityType.KNIGHT)
+            starts = [(rng.randrange(size), rng.randrange(size)) for _ in range(4)]
+            found = engines[size]._nearest(np.array([[x * size + y for x, y in starts]]),
+                                           np.array([[x * size + y for x, y in targets]]),
+                                           np.ones((1, len(targets)), dtype=bool))[0]
+            for start, cell in zip(starts, found):
+                assert divmod(int(cell), size) == grid.find_nearest(start, EntityType.KNIGHT)
@@ -0,0 +1,49 @@
+import pytest
+from eldoria.enums import EntityType
+from eldoria.models.memory import HunterMemory
+from eldoria.simulation import EldoriaSimulation
+
+
+class TestHunterMemory:
+    def test_least_recently_used_cell_is_evicted(self):
+        memory = HunterMemory(capacity=2)
+        memory.remember(1, 3.0, 0)
+        memory.remember(2, 7.0, 0)
+        assert memory.recall(1, 0) == 3.0  # Now 2 is the least recently used
+        memory.remember(3, 13.0, 0)
+        assert 2 not in memory and len(memory) == 2
+        assert memory.recall(1, 0) == 3.0 and memory.recall(3, 0) == 13.0
+
+    def test_changed_stamp_forgets_the_entry(self):
+        memory = HunterMemory()
+        memory.remember(5, 3.0, 0)
+        assert list(memory.entries({})) == [(5, 3.0, False)]
+        assert list(memory.entries({5: 1})) == [(5, 3.0, True)]
+        assert memory.recall(5, 1) == 0
+        assert 5 not in memory
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            HunterMemory(capacity=0)
+
+    def test_pickup_invalidates_remembered_cell(self):
+        simulation = EldoriaSimulation(seed=1, check_index=True)
+        hunter, treasure = simulation.hunters[0], simulation.treasures[0]
+        cell = treasure.x * simulation.grid.size + treasure.y
+        hunter.memory.remember(cell, treasure.get_value(), simulation.treasure_stamps.get(cell, 0))
+        simulation.grid.add_entity(hunter.x, hunter.y, EntityType.EMPTY)
+        hunter.x, hunter.y = treasure.x, treasure.y
+        simulation.run_step()
+        assert hunter.carried_treasure is treasure
+        assert hunter.memory.recall(cell, simulation.treasure_stamps.get(cell, 0)) == 0
+
+    def test_team_memory_is_shared_through_the_hideout(self):
+        simulation = EldoriaSimulation(seed=2, team_memory=True, memory_capacity=4)
+        for hideout in simulation.hideouts:
+            team = [hunter for hunter in simulation.hunters if hunter.home is hideout]
+            assert [hunter_id for hunter_id, _ in hideout.hunters] == [hunter.hunter_id for hunter in team]
+            assert all(hunter.memory is hideout.knowledge for hunter in team)
+            assert hideout.knowledge.capacity == 4 * hideout.capacity
+        while not simulation.game_over:
+            simulation.run_step()
+        assert sum(len(hideout.hunters) for hideout in simulation.hideouts) == len(simulation.hunters)
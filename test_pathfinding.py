@@ -0,0 +1,123 @@
+import random
+from collections import deque
+
+import pytest
+from eldoria.models.grid import Grid
+from eldoria.enums import EntityType
+from eldoria.ai.pathfinding import a_star, wrapped_manhattan, PathCache, SearchStats, collect_stats
+from eldoria.ai.flow_field import FlowFieldNavigator
+from eldoria.simulation import EldoriaSimulation
+
+
+def bfs_length(grid, start, goal):
+    """Shortest knight-free path length, or None when unreachable"""
+    queue, seen = deque([(start, 0)]), {start}
+    while queue:
+        cell, length = queue.popleft()
+        if cell == goal:
+            return length
+        for neighbor, cell_type in grid.get_adjacent(*cell).items():
+            if cell_type != EntityType.KNIGHT and neighbor not in seen:
+                seen.add(neighbor)
+                queue.append((neighbor, length + 1))
+    return None
+
+
+class TestPathfinding:
+    @pytest.fixture
+    def grid(self):
+        rng = random.Random(3)
+        grid = Grid(12)
+        for _ in range(30):
+            grid.add_entity(rng.randrange(12), rng.randrange(12), EntityType.KNIGHT)
+        return grid
+
+    def test_wrapped_manhattan(self):
+        assert wrapped_manhattan((0, 0), (9, 9), 10) == 2
+        assert wrapped_manhattan((2, 3), (4, 3), 10) == 2
+
+    def test_a_star_finds_shortest_paths(self, grid):
+        rng = random.Random(5)
+        for _ in range(50):
+            start = (rng.randrange(12), rng.randrange(12))
+            goal = (rng.randrange(12), rng.randrange(12))
+            path = a_star(grid, start, goal)
+            expected = bfs_length(grid, start, goal)
+            if expected is None or start == goal:
+                assert path == []
+                continue
+            assert len(path) == expected
+            assert path[-1] == goal
+            assert all(grid.get(*cell) != EntityType.KNIGHT for cell in path)
+
+    def test_a_star_wraps_around_edges(self):
+        grid = Grid(10)
+        assert a_star(grid, (0, 0), (9, 0)) == [(9, 0)]
+
+    def test_a_star_budget_returns_a_leg_toward_the_goal(self):
+        grid = Grid(60)
+        grid.add_entity(3, 1, EntityType.KNIGHT)
+        path = a_star(grid, (0, 0), (30, 20), max_expansions=40)
+        assert path and len(path) < 50
+        assert wrapped_manhattan(path[-1], (30, 20), 60) == 50 - len(path)  # Every step went toward the goal
+        assert all(grid.get(*cell) != EntityType.KNIGHT for cell in path)
+        assert len(a_star(grid, (0, 0), (30, 20), max_expansions=None)) == 50
+
+    def test_collect_stats(self):
+        grid = Grid(10)
+        stats = SearchStats()
+        with collect_stats(stats):
+            a_star(grid, (0, 0), (0, 3))
+        a_star(grid, (0, 0), (0, 3))
+        assert stats.calls == 1
+        assert stats.expansions == 3
+
+    def test_path_cache_reuses_and_repairs(self):
+        grid = Grid(10)
+        cache = PathCache()
+        stats = SearchStats()
+        with collect_stats(stats):
+            assert cache.next_step(grid, (0, 0), (0, 5)) == (0, 1)
+            assert cache.next_step(grid, (0, 1), (0, 5)) == (0, 2)
+            assert stats.calls == 1
+
+            grid.add_entity(0, 3, EntityType.KNIGHT)
+            step = cache.next_step(grid, (0, 2), (0, 5))
+            assert stats.calls == 2
+            assert grid.get(*step) != EntityType.KNIGHT
+            assert all(grid.get(*cell) != EntityType.KNIGHT for cell in cache.path)
+            assert cache.path[-1] == (0, 5)
+
+    def test_flow_field_steps_along_shortest_paths(self, grid):
+        rng = random.Random(9)
+        navigator = FlowFieldNavigator(grid)
+        for _ in range(30):
+            start = (rng.randrange(12), rng.randrange(12))
+            goal = (rng.randrange(12), rng.randrange(12))
+            expected = len(a_star(grid, start, goal))
+            position, steps = start, 0
+            while (step := navigator.next_step(position, goal)) is not None:
+                assert grid.get(*step) != EntityType.KNIGHT
+                position, steps = step, steps + 1
+            assert steps == expected
+
+    def test_flow_navigation_brings_knights_home_by_shortest_paths(self):
+        simulation = EldoriaSimulation(size=12, seed=2, navigation='flow', knights=3, check_index=True)
+        grid, navigator = simulation.grid, simulation.navigator
+        for knight in simulation.knights:
+            start = (knight.x, knight.y)
+            home = grid.find_nearest(start, EntityType.HIDEOUT)
+            remaining = bfs_length(grid, start, home)
+            assert remaining
+            for _ in range(remaining):
+                navigator.begin_tick()
+                assert knight.move(grid, navigator, returning=True)
+                remaining -= 1
+                assert (knight.x, knight.y) == home or bfs_length(grid, (knight.x, knight.y), home) == remaining
+            assert (knight.x, knight.y) == home
+
+        simulation = EldoriaSimulation(size=12, seed=2, navigation='flow', flow_treasures=True, check_index=True)
+        for _ in range(50):
+            simulation.run_step()
+        with pytest.raises(ValueError):
+            EldoriaSimulation(size=12, navigation='teleport')
@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+import pytest
+from eldoria.placement import kmeans_centers, lloyd_centers
+from eldoria.simulation import EldoriaSimulation
+
+
+def inertia(size, centers):
+    cells = np.indices((size, size)).reshape(2, -1).T
+    distances = ((cells[:, None, :] - np.array(centers)[None, :, :]) ** 2).sum(axis=2)
+    return distances.min(axis=1).sum()
+
+
+class TestPlacement:
+    @pytest.mark.parametrize('count', [1, 3, 7, 20])
+    def test_centers_are_distinct_and_on_grid(self, count):
+        centers = lloyd_centers(30, count, random.Random(count))
+        assert len(centers) == len(set(centers)) == count
+        assert all(0 <= x < 30 and 0 <= y < 30 for x, y in centers)
+
+    def test_fills_tiny_grids(self):
+        assert sorted(lloyd_centers(3, 9, random.Random(0))) == [(x, y) for x in range(3) for y in range(3)]
+        with pytest.raises(ValueError):
+            lloyd_centers(3, 10)
+
+    def test_spread_matches_kmeans(self):
+        for seed in range(3):
+            lloyd = inertia(40, lloyd_centers(40, 3, random.Random(seed)))
+            kmeans = inertia(40, kmeans_centers(40, 3, random_state=seed))
+            assert lloyd <= 1.05 * kmeans
+
+    def test_simulation_placement_options(self):
+        simulation = EldoriaSimulation(size=200, seed=3, hideouts=5)
+        assert len(simulation.hideouts) == 5
+        assert simulation.hideouts[0].x == EldoriaSimulation(size=200, seed=3, hideouts=5).hideouts[0].x
+        assert len(EldoriaSimulation(size=12, seed=3, placement='kmeans').hideouts) == 3
+        with pytest.raises(ValueError):
+            EldoriaSimulation(placement='grid')
@@ -0,0 +1,23 @@
+import random
+
+from eldoria.simulation import EldoriaSimulation
+from eldoria.renderer import GridRenderer
+
+
+class TestRenderer:
+    def test_incremental_frames_match_full_redraw(self, canvas):
+        random.seed(4)
+        simulation = EldoriaSimulation(size=12)
+        renderer = GridRenderer(canvas)
+        assert renderer.attach(simulation) == 12 * 12
+        assert len(canvas.items) == 2 * 12 * 12
+
+        for _ in range(30):
+            simulation.run_step()
+            simulation.run_step()  # Two steps per frame: the dirty set accumulates
+            assert renderer.draw() < 12 * 12
+
+            for (x, y), (rectangle, text) in renderer._items.items():
+                fill, label = renderer.cell_style(x, y)
+                assert canvas.items[rectangle]['fill'] == fill
+                assert canvas.items[text]['text'] == label
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from eldoria.renderer import GridRenderer
+from eldoria.replay import ReplayReader, ReplayWriter
+from eldoria.simulation import EldoriaSimulation
+
+
+def view(simulation):
+    """What a viewer of the game sees at this tick"""
+    return (simulation.grid.codes.tobytes(), simulation.score, simulation.game_over,
+            [(h.x, h.y, h.stamina, h.carried_treasure is not None) for h in simulation.hunters],
+            [(k.x, k.y, k.energy) for k in simulation.knights],
+            [(t.x, t.y, t.type, t.value) for t in simulation.treasures])
+
+
+def record(path, seed, keyframe_every, **options):
+    """Record a seeded game; returns the view at every tick"""
+    simulation = EldoriaSimulation(seed=seed, **options)
+    views = {0: view(simulation)}
+    with ReplayWriter(path, simulation, keyframe_every) as replay:
+        while not simulation.game_over:
+            simulation.run_step()
+            replay.record()
+            views[simulation.tick] = view(simulation)
+    return views
+
+
+class TestSnapshot:
+    @pytest.mark.parametrize('options', [{}, {'columnar': True}, {'navigation': 'flow'},
+                                         {'team_memory': True, 'memory_capacity': 2}])
+    def test_restored_game_continues_exactly(self, options):
+        for seed in range(4):
+            original = EldoriaSimulation(seed=seed, **options)
+            for _ in range(15):
+                original.run_step()
+            copy = EldoriaSimulation(size=9, **options)
+            copy.restore(original.snapshot())
+            assert view(copy) == view(original)
+            for _ in range(25):
+                original.run_step()
+                copy.run_step()
+                assert view(copy) == view(original)
+            assert copy.snapshot() == original.snapshot()
+
+    def test_restore_keeps_the_decay_rate(self):
+        original = EldoriaSimulation(seed=1, columnar=True, decay_rate=5)
+        for _ in range(3):
+            original.run_step()
+        copy = EldoriaSimulation(size=9, columnar=True)
+        copy.restore(original.snapshot())
+        assert copy.decay_rate == 5
+        assert view(copy) == view(original)
+        for _ in range(10):
+            original.run_step()
+            copy.run_step()
+            assert view(copy) == view(original)
+        assert copy.snapshot() == original.snapshot()
+
+    def test_rejects_other_data(self):
+        data = EldoriaSimulation(seed=1).snapshot()
+        with pytest.raises(ValueError):
+            EldoriaSimulation().restore(b'XXXX' + data[4:])
+
+
+class TestReplay:
+    def test_seek_shows_every_recorded_tick(self, tmp_path):
+        path = str(tmp_path / 'game.eldr')
+        views = record(path, seed=2, keyframe_every=10)
+        with ReplayReader(path) as reader:
+            assert list(reader.ticks) == sorted(views)
+            for tick, expected in views.items():
+                assert view(reader.seek(tick)) == expected
+
+            simulation = reader.seek(0)
+            for tick in list(views)[1:] + [30, 4, 17, reader.last_tick]:  # Forward through deltas, then jumps
+                reader.load(simulation, tick)
+                assert view(simulation) == views[tick]
+
+    def test_seek_uses_the_recorded_decay_rate(self, tmp_path):
+        path = str(tmp_path / 'game.eldr')
+        views = record(path, seed=1, keyframe_every=10, decay_rate=5)
+        with ReplayReader(path) as reader:
+            for tick in (3, 10, 14):
+                assert view(reader.seek(tick, columnar=True)) == views[tick]
+
+    def test_keyframes_resume_exactly(self, tmp_path):
+        path = str(tmp_path / 'game.eldr')
+        record(path, seed=3, keyframe_every=10)
+        live = EldoriaSimulation(seed=3)
+        for _ in range(20):
+            live.run_step()
+        with ReplayReader(path) as reader:
+            resumed = reader.seek(20)
+        for _ in range(15):
+            live.run_step()
+            resumed.run_step()
+        assert resumed.snapshot() == live.snapshot()
+
+    def test_playback_redraws_only_changes(self, tmp_path, canvas):
+        path = str(tmp_path / 'game.eldr')
+        record(path, seed=4, keyframe_every=25)
+        with ReplayReader(path) as reader:
+            simulation = reader.seek(reader.first_tick)
+            renderer = GridRenderer(canvas)
+            renderer.attach(simulation)
+            tick = reader.tick_after(simulation.tick)
+            while tick is not None:
+                reader.load(simulation, tick)
+                renderer.draw()
+                for (x, y), (rectangle, text) in renderer._items.items():
+                    fill, label = renderer.cell_style(x, y)
+                    assert canvas.items[rectangle]['fill'] == fill
+                    assert canvas.items[text]['text'] == label
+                tick = reader.tick_after(tick)
+            assert simulation.game_over
+            assert np.array_equal(simulation.grid.codes, reader.seek(reader.last_tick).grid.codes)
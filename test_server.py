@@ -0,0 +1,99 @@
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+from eldoria.server import RemoteWorld, SimulationServer, _Subscriber
+from eldoria.simulation import EldoriaSimulation
+
+
+@pytest.fixture
+def serve():
+    """Start a SimulationServer on a background event loop; yields a starter taking the worlds"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = []
+
+    def start(worlds, **options):
+        server = SimulationServer(worlds, port=0, **options)
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestServer:
+    def test_viewer_mirrors_the_world(self, serve):
+        worlds = {'a': EldoriaSimulation(seed=1), 'b': EldoriaSimulation(seed=2)}
+        server = serve(worlds, tick_interval=0.002)
+        remote = RemoteWorld.connect('127.0.0.1', server.port, 'b')
+        wait_for(lambda: remote.poll() >= 0 and not remote.connected)
+        simulation = worlds['b']
+        assert remote.game_over and simulation.game_over
+        assert np.array_equal(remote.grid.codes, simulation.grid.codes)
+        assert remote.score == simulation.score
+        assert [hunter.stamina for hunter in remote.hunters] == [hunter.stamina for hunter in simulation.hunters]
+        for treasure in simulation.treasures:
+            assert remote.treasure_at((treasure.x, treasure.y)).type == treasure.type
+
+    def test_unknown_world_is_refused(self, serve):
+        server = serve({'a': EldoriaSimulation(seed=1)}, max_ticks=1)
+        with pytest.raises(ConnectionError):
+            RemoteWorld.connect('127.0.0.1', server.port, 'missing')
+
+    def test_viewers_are_released_when_the_world_stops_at_max_ticks(self, serve):
+        simulation = EldoriaSimulation(seed=1)
+        server = serve({'a': simulation}, tick_interval=0.002, max_ticks=20)
+        remote = RemoteWorld.connect('127.0.0.1', server.port, 'a')
+        wait_for(lambda: remote.poll() >= 0 and not remote.connected)
+        assert remote.tick == simulation.tick == 20 and not simulation.game_over
+        assert np.array_equal(remote.grid.codes, simulation.grid.codes)
+
+    def test_request_that_is_not_an_object_is_dropped(self, serve, caplog):
+        server = serve({'a': EldoriaSimulation(seed=1)}, max_ticks=1)
+        with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+            sock.sendall(b'[]\n')
+            assert sock.makefile('rb').read() == b''
+        RemoteWorld.connect('127.0.0.1', server.port, 'a')  # The server keeps serving
+        assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+    def test_stalled_client_does_not_stall_the_world(self, serve):
+        simulation = EldoriaSimulation(seed=3)
+        server = serve({'a': simulation}, buffer_limit=1)
+        with socket.create_connection(('127.0.0.1', server.port)) as sock:
+            sock.sendall(b'{"world": "a"}\n')
+            wait_for(lambda: simulation.game_over)  # Nothing read yet
+            frames = [json.loads(line) for line in sock.makefile('rb')]
+        assert frames[0]['full'] and frames[-1]['game_over']
+        assert sum(frame['ticks'] for frame in frames) <= simulation.tick + 1
+        remote = RemoteWorld(frames[0]['size'])
+        for frame in frames:
+            remote.apply(frame)
+        assert np.array_equal(remote.grid.codes, simulation.grid.codes)
+
+    def test_pending_ticks_coalesce_into_one_frame(self):
+        subscriber = _Subscriber(writer=None)
+        subscriber.push({1: 2, 5: 3}, {'tick': 1})
+        subscriber.push({1: 0}, {'tick': 2})
+        frame = subscriber.take()
+        assert frame['cells'] == [(1, 0), (5, 3)]
+        assert frame['tick'] == 2 and frame['ticks'] == 2 and frame['full']
+        subscriber.push({}, {'tick': 3})
+        assert not subscriber.take()['full']
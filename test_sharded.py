@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+from eldoria.enums import EntityType
+from eldoria.lockstep import KNIGHT, TREASURE
+from eldoria.models.grid import Grid
+from eldoria.sharded import NEAREST, STEP, ShardedSimulation, search_tile
+
+OPTIONS = {'size': 40, 'radius': 6, 'knights': 20, 'treasures': 80, 'hunters_per_hideout': 3}
+
+
+def final_state(**options):
+    with ShardedSimulation(seed=5, **OPTIONS, **options) as world:
+        world.run(max_steps=60)
+        return world.codes.copy(), world.hunter_position.copy(), world.knight_position.copy(), world.results()
+
+
+def torus_distance(a, b, size):
+    return sum(min(abs(p - q), size - abs(p - q)) for p, q in zip(a, b))
+
+
+class TestSharded:
+    def test_same_seed_same_run_for_any_tiling(self):
+        codes, hunters, knights, results = final_state(tiles=1, workers=1)
+        for options in ({'tiles': 1, 'workers': 1}, {'tiles': (2, 3), 'workers': 1}, {'tiles': 4, 'workers': 2}):
+            other = final_state(**options)
+            assert np.array_equal(codes, other[0])
+            assert np.array_equal(hunters, other[1])
+            assert np.array_equal(knights, other[2])
+            assert results == other[3]
+
+    def test_close_keeps_the_final_grid(self):
+        world = ShardedSimulation(seed=1, **OPTIONS, tiles=2, workers=2)
+        world.run_step()
+        grid = world.grid.copy()
+        world.close()
+        assert np.array_equal(world.grid, grid)
+        world.close()
+
+    def test_rejects_bad_tiles_and_radius(self):
+        with pytest.raises(ValueError):
+            ShardedSimulation(size=10, tiles=11)
+        with pytest.raises(ValueError):
+            ShardedSimulation(size=10, radius=5)
+
+    def test_nearest_matches_grid_find_nearest_within_radius(self):
+        size, radius = 16, 5
+        for trial in range(100):
+            rng = random.Random(trial)
+            grid = Grid(size)
+            targets = [(rng.randrange(size), rng.randrange(size)) for _ in range(rng.randint(1, 6))]
+            grid.place_many(targets, EntityType.KNIGHT)
+            starts = [(rng.randrange(size), rng.randrange(size)) for _ in range(4)]
+            # Tile bounds only have to hold the agents; use the quarter holding the first one
+            x0, y0 = (starts[0][0] // 8) * 8, (starts[0][1] // 8) * 8
+            starts = [start for start in starts if x0 <= start[0] < x0 + 8 and y0 <= start[1] < y0 + 8]
+            found = search_tile(grid.codes, radius, NEAREST, KNIGHT, ((x0, x0 + 8), (y0, y0 + 8)),
+                                np.array([x * size + y for x, y in starts]))
+            for start, cell in zip(starts, found):
+                nearest = grid.find_nearest(start, EntityType.KNIGHT)
+                expected = nearest if torus_distance(start, nearest, size) <= radius else None
+                assert (divmod(int(cell), size) if cell >= 0 else None) == expected
+
+    def test_step_goes_around_knights_and_across_the_wrap(self):
+        grid = Grid(12)
+        grid.add_entity(11, 3, EntityType.TREASURE)
+        grid.add_entity(0, 3, EntityType.KNIGHT)
+        step, = search_tile(grid.codes, 4, STEP, TREASURE, ((0, 6), (0, 6)), np.array([1 * 12 + 3]))
+        assert divmod(int(step), 12) in {(1, 2), (1, 4)}
+        grid.add_entity(11, 3, EntityType.EMPTY)
+        assert search_tile(grid.codes, 4, STEP, TREASURE, ((0, 6), (0, 6)), np.array([1 * 12 + 3]))[0] == -1
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+from eldoria.simulation import EldoriaSimulation
+from eldoria.models.entity_index import PositionIndex
+from eldoria.models.knight import Knight
+from eldoria.enums import Action, EntityType
+
+
+class TestSimulation:
+    @pytest.mark.parametrize('seed', range(3))
+    def test_position_indexes_stay_consistent(self, seed):
+        random.seed(seed)
+        simulation = EldoriaSimulation(size=10, check_index=True)
+        for _ in range(150):
+            simulation.run_step()
+        for treasure in simulation.treasures:
+            assert simulation.treasure_at((treasure.x, treasure.y)) is not None
+
+    @pytest.mark.parametrize('columnar', [False, True])
+    def test_live_counts_track_crowded_games(self, columnar):
+        for seed in range(5):
+            simulation = EldoriaSimulation(size=8, seed=seed, knights=6, treasures=20, check_index=True,
+                                           columnar=columnar)
+            while not simulation.game_over:
+                simulation.run_step()  # check_index compares the counts with the lists every tick
+            assert simulation.hunters_alive == 0 or simulation.treasures_on_ground + simulation.treasures_carried == 0
+
+    def test_deposits_are_stored_in_their_hideout(self):
+        simulation = EldoriaSimulation(size=8, seed=24, knights=2, treasures=20, check_index=True)
+        while not simulation.game_over:
+            simulation.run_step()
+        assert simulation.score > 0
+        assert sum(hideout.stored_treasure for hideout in simulation.hideouts) == pytest.approx(simulation.score)
+
+    def test_resting_hunters_sleep_until_a_knight_lands(self):
+        simulation = EldoriaSimulation(seed=1, knights=1, check_index=True)
+        hunter, hideout = simulation.hunters[0], simulation.hideouts[0]
+        simulation.grid.add_entity(hunter.x, hunter.y, EntityType.EMPTY)
+        hunter.x, hunter.y, hunter.stamina = hideout.x, hideout.y, 90
+        simulation.grid.add_entity(hunter.x, hunter.y, EntityType.HUNTER)
+        simulation.restore(simulation.snapshot())  # Reschedules from the edited state
+        hunter, knight = simulation.hunters[0], simulation.knights[0]
+        for _ in range(5):
+            assert hunter not in simulation.active_hunters
+            simulation.run_step()
+        simulation.settle_hunters()
+        assert hunter.stamina == 95
+
+        position = (knight.x, knight.y)
+        knight.x, knight.y = hunter.x, hunter.y
+        simulation.knight_index.move(knight, position)
+        simulation._wake_resting()
+        assert hunter in simulation.active_hunters
+        simulation.run_step()
+        assert hunter.stamina == 95 + 1 - 20
+
+    def test_hunters_sharing_a_hideout_wake_together(self):
+        simulation = EldoriaSimulation(seed=1, knights=1, check_index=True)
+        hideout = simulation.hideouts[0]
+        for hunter in simulation.hunters[:2]:
+            simulation.grid.add_entity(hunter.x, hunter.y, EntityType.EMPTY)
+            hunter.x, hunter.y, hunter.stamina = hideout.x, hideout.y, 90
+        simulation.grid.add_entity(hideout.x, hideout.y, EntityType.HUNTER)
+        simulation.restore(simulation.snapshot())
+        resting = simulation.hunters[:2]
+        simulation.run_step()
+        assert not set(resting) & set(simulation.active_hunters)
+
+        knight = simulation.knights[0]
+        position = (knight.x, knight.y)
+        knight.x, knight.y = hideout.x, hideout.y
+        simulation.knight_index.move(knight, position)
+        simulation._wake_resting()
+        assert set(resting) <= set(simulation.active_hunters)
+        simulation.check_consistency()
+
+    def test_exhausted_hunters_leave_when_their_timer_runs_out(self):
+        simulation = EldoriaSimulation(seed=2, check_index=True)
+        simulation.hunters[0].stamina = 0
+        simulation.restore(simulation.snapshot())
+        hunter = simulation.hunters[0]
+        assert hunter not in simulation.active_hunters
+        simulation.run_step()
+        simulation.run_step()
+        simulation.settle_hunters()
+        assert hunter.survival_timer == 1 and hunter in simulation.hunters
+        simulation.run_step()
+        assert hunter not in simulation.hunters and simulation.hunters_alive == len(simulation.hunters)
+
+    def test_restored_schedule_continues_exactly(self):
+        for ticks in (40, 300, 600):
+            original = EldoriaSimulation(size=8, seed=24, knights=2, treasures=20)
+            for _ in range(ticks):
+                original.run_step()
+            copy = EldoriaSimulation(size=8)
+            copy.restore(original.snapshot())
+            assert len(copy.active_hunters) == len(original.active_hunters)
+            for _ in range(30):
+                original.run_step()
+                copy.run_step()
+            assert copy.snapshot() == original.snapshot()
+
+    def test_position_index_detects_unreported_moves(self):
+        knight = Knight(1, 1)
+        index = PositionIndex([knight])
+        knight.x = 2
+        with pytest.raises(RuntimeError):
+            index.check([knight], 'knight')
+        index.move(knight, (1, 1))
+        index.check([knight], 'knight')
+        assert index.first((2, 1)) is knight
+        assert (1, 1) not in index
+
+    def test_instrumentation_records_each_tick(self, tmp_path):
+        from eldoria.instrumentation import Instrumentation
+
+        simulation = EldoriaSimulation(size=10, seed=5)
+        simulation.instrumentation = instrumentation = Instrumentation()
+        for _ in range(20):
+            simulation.run_step()
+
+        assert len(instrumentation.records) == 20
+        record = instrumentation.records[0]
+        for key in ('decay_ms', 'hunters_ms', 'decide_ms', 'movement_ms', 'knights_ms', 'total_ms',
+                    'find_nearest', 'a_star_calls', 'a_star_expansions', 'action_MOVE'):
+            assert key in record
+        assert record['find_nearest'] > 0
+        assert sum(record[f'action_{action.name}'] for action in Action) <= 6  # 2 hunters per hideout
+
+        instrumentation.write_jsonl(tmp_path / 'ticks.jsonl')
+        instrumentation.write_csv(tmp_path / 'ticks.csv')
+        assert len((tmp_path / 'ticks.jsonl').read_text().splitlines()) == 20
+        assert instrumentation.summary()['total_ms']['max'] > 0
+        assert sum(instrumentation.histograms(bins=5)['find_nearest']['counts']) == 20
+
+        plain = EldoriaSimulation(size=10, seed=5)
+        for _ in range(20):
+            plain.run_step()
+        assert plain.score == simulation.score
+        assert bytes(plain.grid.codes) == bytes(simulation.grid.codes)
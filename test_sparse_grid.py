@@ -0,0 +1,80 @@
+import random
+import time
+
+import numpy as np
+import pytest
+from eldoria.enums import EntityType
+from eldoria.models.grid import ENTITY_TYPES, Grid
+from eldoria.models.sparse_grid import SparseGrid
+from eldoria.simulation import EldoriaSimulation
+
+
+def random_pair(rng, size, chunk, writes):
+    dense, sparse = Grid(size), SparseGrid(size, chunk)
+    for _ in range(writes):
+        x, y = rng.randrange(-size, 2 * size), rng.randrange(-size, 2 * size)
+        entity_type = rng.choice(ENTITY_TYPES) if rng.random() < 0.3 else EntityType.EMPTY
+        dense.add_entity(x, y, entity_type)
+        sparse.add_entity(x, y, entity_type)
+    return dense, sparse
+
+
+class TestSparseGrid:
+    @pytest.mark.parametrize('size, chunk', [(7, 3), (10, 4), (12, 64), (16, 5)])
+    def test_matches_dense_grid(self, size, chunk):
+        rng = random.Random(size)
+        for _ in range(5):
+            dense, sparse = random_pair(rng, size, chunk, writes=rng.randrange(size * size))
+            assert np.array_equal(sparse.codes, dense.codes)
+            for entity_type in ENTITY_TYPES:
+                assert sparse.generation(entity_type) == dense.generation(entity_type)
+                assert np.array_equal(sparse.positions(entity_type), dense.positions(entity_type))
+            for x in range(size):
+                for y in range(size):
+                    assert sparse.get_adjacent(x, y) == dense.get_adjacent(x, y)
+                    for entity_type in ENTITY_TYPES:
+                        assert sparse.find_nearest((x, y), entity_type) == dense.find_nearest((x, y), entity_type)
+
+    def test_chunks_load_on_write_and_unload_when_empty(self):
+        grid = SparseGrid(10_000)
+        assert grid.chunks_loaded == 0 and grid.get(9_999, 0) == EntityType.EMPTY
+        grid.add_entity(-1, 0, EntityType.KNIGHT)
+        grid.add_entity(5_000, 5_000, EntityType.TREASURE)
+        assert grid.chunks_loaded == 2
+        assert grid.find_nearest((0, 0), EntityType.KNIGHT) == (9_999, 0)
+        assert grid.find_nearest((0, 0), EntityType.HIDEOUT) == (-1, -1)
+        grid.add_entity(9_999, 0, EntityType.EMPTY)
+        assert grid.chunks_loaded == 1
+
+    def test_load_codes_replaces_everything(self):
+        dense, sparse = random_pair(random.Random(1), 9, 4, writes=60)
+        codes = np.zeros(81, dtype=np.uint8)
+        codes[[3, 40]] = 2
+        sparse.track_dirty()
+        sparse.load_codes(codes)
+        dense.load_codes(codes)
+        assert np.array_equal(sparse.codes, dense.codes) and sparse.chunks_loaded == 2
+        assert sparse.take_dirty()
+
+    @pytest.mark.parametrize('options', [{}, {'columnar': True}, {'size': 8, 'knights': 2}])
+    def test_simulation_runs_exactly_like_dense(self, options):
+        for seed in range(3):
+            dense = EldoriaSimulation(seed=seed, **options)
+            sparse = EldoriaSimulation(seed=seed, grid_backend='sparse', **options)
+            while not dense.game_over and dense.tick < 300:
+                dense.run_step()
+                sparse.run_step()
+                assert sparse.snapshot() == dense.snapshot()
+            assert sparse.game_over == dense.game_over
+
+    def test_huge_world_steps_with_bounded_searches(self):
+        simulation = EldoriaSimulation(size=10_000, seed=1, grid_backend='sparse')
+        started = time.perf_counter()
+        for _ in range(50):
+            simulation.run_step()
+        assert time.perf_counter() - started < 30  # Unbounded a_star took minutes for the first returning knight
+        assert simulation.tick == 50 and simulation.grid.chunks_loaded < 100
+
+    def test_flow_navigation_needs_the_dense_grid(self):
+        with pytest.raises(ValueError):
+            EldoriaSimulation(grid_backend='sparse', navigation='flow')
@@ -0,0 +1,49 @@
+import pytest
+from eldoria.enums import HunterSkill, TreasureType
+from eldoria.models.store import ColumnStore, EntityStore
+from eldoria.simulation import EldoriaSimulation
+
+
+def snapshot(simulation):
+    simulation.settle_hunters()
+    return ([(h.x, h.y, h.stamina, h.survival_timer, h.skill, h.carried_treasure and h.carried_treasure.value)
+             for h in simulation.hunters],
+            [(k.x, k.y, k.energy) for k in simulation.knights],
+            [(t.x, t.y, t.value, t.type) for t in simulation.treasures],
+            simulation.score, bytes(simulation.grid.codes))
+
+
+class TestStore:
+    @pytest.mark.parametrize('seed, decay_rate', [(0, 0.1), (1, 0.1), (2, 0.1), (3, 0.1), (0, 1.5)])
+    def test_columnar_run_matches_objects(self, seed, decay_rate):
+        plain = EldoriaSimulation(size=12, seed=seed, decay_rate=decay_rate)
+        columnar = EldoriaSimulation(size=12, seed=seed, columnar=True, decay_rate=decay_rate)
+        for _ in range(300):
+            assert snapshot(plain) == snapshot(columnar)
+            if plain.game_over:
+                break
+            plain.run_step()
+            columnar.run_step()
+        assert columnar.game_over == plain.game_over
+        carried = sum(h.carried_treasure is not None for h in columnar.hunters)
+        assert len(columnar.store.hunters) == len(columnar.hunters)
+        assert len(columnar.store.treasures) == len(columnar.treasures) + carried
+
+    def test_rows_grow_and_recycle(self):
+        store = ColumnStore({'value': float}, capacity=2)
+        rows = [store.allocate(object()) for _ in range(5)]
+        assert store.capacity == 8 and len(store) == 5 and len(set(rows)) == 5
+        store.release(rows[1])
+        assert store.allocate(object()) == rows[1]
+
+    def test_views_read_and_write_columns(self):
+        store = EntityStore(capacity=1)
+        treasure = store.treasure(1, 2, TreasureType.GOLD)
+        hunter = store.hunter(3, 4, HunterSkill.ENDURANCE)
+        hunter.carried_treasure = treasure
+        hunter.stamina -= 2.5
+        assert store.hunters['stamina'][hunter._row] == 97.5
+        assert hunter.carried_treasure is treasure and hunter.skill is HunterSkill.ENDURANCE
+        assert not hasattr(hunter, '__dict__')
+        treasure.decay()
+        assert store.treasure_values(tick=0)[treasure._row] == pytest.approx(treasure.get_value())
@@ -0,0 +1,58 @@
+import pytest
+from eldoria import sweep
+from eldoria.ai.decision_tree import HunterDecisionModel
+from eldoria.batch import run_game
+from eldoria.enums import Action
+from eldoria.sweep import constant_model, run_sweep, summarize
+
+GRID = {'size': [8], 'knights': [1, 3], 'decay_rate': [0.1, 2.0]}
+
+
+def policies():
+    return {'shipped': HunterDecisionModel.shared(), 'always-move': constant_model(Action.MOVE)}
+
+
+class TestSweep:
+    def test_cells_play_the_same_games_as_batch(self):
+        results = dict(run_sweep(GRID, policies(), games=3, seed=5, max_steps=150, workers=1))
+        assert len(results) == 8
+        for cell, games in results.items():
+            model = policies()[cell.policy]
+            assert games == [run_game(seed, max_steps=150, decision_model=model, **cell.options) for seed in (5, 6, 7)]
+        parallel = dict(run_sweep(GRID, policies(), games=3, seed=5, max_steps=150, workers=2))
+        assert parallel == results
+
+    def test_interrupted_sweep_resumes_from_the_cache(self, tmp_path, monkeypatch):
+        played = []
+        run_chunk = sweep._run_chunk
+        monkeypatch.setattr(sweep, 'CHUNK', 2)
+        monkeypatch.setattr(sweep, '_run_chunk', lambda seeds, *args: played.extend(seeds) or run_chunk(seeds, *args))
+
+        cells = run_sweep(GRID, policies(), games=3, max_steps=100, workers=1, cache_dir=tmp_path)
+        first = next(cells)
+        cells.close()  # Interrupted after the first cell
+        assert len(played) == 3
+
+        resumed = dict(run_sweep(GRID, policies(), games=3, max_steps=100, workers=1, cache_dir=tmp_path))
+        assert resumed[first[0]] == first[1]
+        assert len(played) == 3 * 8
+        assert dict(run_sweep(GRID, policies(), games=3, max_steps=100, workers=1, cache_dir=tmp_path)) == resumed
+        assert len(played) == 3 * 8
+
+    def test_lockstep_refuses_options_it_does_not_implement(self):
+        with pytest.raises(ValueError):
+            next(run_sweep(dict(GRID, navigation=['flow']), policies(), games=2, workers=1, lockstep=True))
+
+    def test_summaries_group_by_policy_and_parameters(self):
+        results = list(run_sweep(GRID, policies(), games=4, max_steps=100, workers=1))
+        overall = summarize(results)
+        assert [summary.policy for summary in overall] == ['always-move', 'shipped']
+        assert all(summary.games == 16 for summary in overall)
+        split = summarize(results, by=['knights'])
+        assert [(summary.policy, summary.params) for summary in split] == [
+            ('always-move', (('knights', 1),)), ('always-move', (('knights', 3),)),
+            ('shipped', (('knights', 1),)), ('shipped', (('knights', 3),))]
+        scores = [result.score for cell, games in results if cell.policy == 'shipped' for result in games]
+        assert overall[1].score.mean == pytest.approx(sum(scores) / len(scores))
+        assert overall[1].score.p10 <= overall[1].score.median <= overall[1].score.p90
+        assert sweep.format_report(split).count('\n') == len(split)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from eldoria.ai.decision_tree import HunterDecisionModel
+from eldoria.ai.training import fit_tree, latest_model, retrain
+from eldoria.batch import run_game, run_recorded
+from eldoria.sweep import load_policy
+
+
+class TestTraining:
+    def test_tree_recovers_a_known_policy(self):
+        rng = np.random.default_rng(0)
+        states = rng.random((2000, 3)).astype(np.float32) * [100, 0.2, 15]
+        actions = np.where(states[:, 0] <= 20, 4, np.where(states[:, 2] <= 3, 3, 1))
+        tree = fit_tree(states, actions, max_depth=3)
+        assert np.array_equal(tree.predict_batch(states), actions)
+        assert [tree.predict(*state) for state in states[:50].tolist()] == actions[:50].tolist()
+
+    def test_weights_decide_between_conflicting_rows(self):
+        states = np.array([[50, 0.1, 5]] * 2 + [[90, 0.1, 5]] * 2)
+        actions = np.array([1, 4, 1, 4])
+        tree = fit_tree(states, actions, weights=[1, 9, 9, 1])
+        assert tree.predict(50, 0.1, 5) == 4 and tree.predict(90, 0.1, 5) == 1
+
+    def test_retrained_models_are_versioned_and_loadable(self, tmp_path):
+        trajectories, models = tmp_path / 'trajectories', tmp_path / 'models'
+        list(run_recorded(range(20), trajectories, size=8, knights=2, max_steps=300,
+                          decision_model=load_policy('always-move')))
+        first = retrain(trajectories, models)
+        second = retrain(trajectories, models, max_depth=2)
+        assert latest_model(models) == second and first != second
+        model = HunterDecisionModel.load(second)
+        assert model.tree.version == 2 and model.tree.depth <= 2
+        assert model.tree.metadata['max_depth'] == 2
+        assert load_policy(str(first)).tree.to_source() == HunterDecisionModel.load(first).tree.to_source()
+        run_game(0, size=8, max_steps=50, decision_model=model)
+
+    def test_empty_directory_is_refused(self, tmp_path):
+        with pytest.raises(ValueError):
+            retrain(tmp_path, tmp_path / 'models')
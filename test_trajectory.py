@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from eldoria.batch import run_batch, run_game
+from eldoria.simulation import EldoriaSimulation
+from eldoria.trajectory import TrajectoryRecorder, read_chunks
+
+
+def play(simulation, max_steps=1000):
+    for _ in range(max_steps):
+        if simulation.game_over:
+            break
+        simulation.run_step()
+
+
+class TestTrajectoryRecorder:
+    def test_rows_match_the_decisions_taken(self, tmp_path):
+        simulation = EldoriaSimulation(size=8, seed=24, knights=2, treasures=20)
+        recorder = simulation.recorder = TrajectoryRecorder(tmp_path, chunk_rows=64)
+        decisions = []
+        decide = simulation._decide_actions
+
+        def spy(observed):
+            decided = decide(observed)
+            decisions.extend((simulation.tick, hunter.hunter_id, features, action.value)
+                             for (hunter, features), (_, action) in zip(observed, decided) if features is not None)
+            return decided
+
+        simulation._decide_actions = spy
+        play(simulation)
+        recorder.close()
+        chunks = list(read_chunks(tmp_path))
+        assert len(chunks) == recorder.chunks_written > 1
+        assert all(len(chunk['tick']) == 64 for chunk in chunks[:-1])
+        rows = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+        assert recorder.rows_written == len(rows['tick']) == len(decisions)
+        assert rows['tick'].tolist() == [tick for tick, _, _, _ in decisions]
+        assert rows['hunter'].tolist() == [hunter for _, hunter, _, _ in decisions]
+        assert rows['action'].tolist() == [action for _, _, _, action in decisions]
+        states = np.array([features for _, _, features, _ in decisions], dtype=np.float32)
+        assert np.array_equal(rows['stamina'], states[:, 0])
+        assert np.array_equal(rows['knight_distance'], states[:, 2])
+
+        # A hunter's first decision is credited with everything it deposited
+        first = {}
+        for index, hunter in enumerate(rows['hunter'].tolist()):
+            first.setdefault(hunter, index)
+        assert simulation.score > 0
+        assert sum(rows['outcome'][index] for index in first.values()) == pytest.approx(simulation.score)
+        assert (np.diff(rows['outcome'][rows['hunter'] == rows['hunter'][0]]) <= 0).all()
+
+    def test_recording_does_not_change_the_game(self, tmp_path):
+        with TrajectoryRecorder(tmp_path) as recorder:
+            assert run_game(5, size=10, max_steps=200, recorder=recorder) == run_game(5, size=10, max_steps=200)
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_a_batch_writes_many_games_per_chunk(self, tmp_path, workers):
+        seeds = range(6)
+        recorded = sorted(run_batch(seeds, size=8, max_steps=100, workers=workers, record=tmp_path))
+        assert recorded == sorted(run_batch(seeds, size=8, max_steps=100, workers=1))
+        assert len(list(tmp_path.glob('*.npz'))) == 1
+        again = list(run_batch([5], size=8, max_steps=100, workers=workers, record=tmp_path))
+        assert again == [recorded[5]]
+        assert len(list(tmp_path.glob('*.npz'))) == 2  # The same seed again adds a chunk instead of replacing one
@@ -0,0 +1,46 @@
+import pytest
+from eldoria.models.treasure import Treasure, DECAY_TABLE, LIFETIME, decay_table
+from eldoria.enums import TreasureType
+
+
+class Clock:
+    def __init__(self):
+        self.tick = 0
+
+
+class TestTreasure:
+    @pytest.fixture
+    def clock(self):
+        return Clock()
+
+    def test_lazy_value_matches_eager_decay(self, clock):
+        lazy = Treasure(0, 0, TreasureType.GOLD, clock=clock)
+        eager = Treasure(0, 0, TreasureType.GOLD)
+        while eager.decay():
+            clock.tick += 1
+            assert lazy.value == eager.value
+            assert lazy.get_value() == eager.get_value()
+        assert clock.tick + 1 == LIFETIME
+        assert DECAY_TABLE[LIFETIME] == 0
+
+    def test_carried_treasure_stops_decaying(self, clock):
+        treasure = Treasure(0, 0, TreasureType.SILVER, clock=clock)
+        clock.tick = 10
+        treasure.pick_up()
+        clock.tick = 50
+        assert treasure.value == DECAY_TABLE[10]
+        assert treasure.expiry_tick is None
+
+        treasure.put_down(3, 4)
+        clock.tick = 55
+        assert (treasure.x, treasure.y) == (3, 4)
+        assert treasure.value == DECAY_TABLE[15]
+        assert treasure.expiry_tick == 50 + LIFETIME - 10
+
+    def test_decay_rate_sets_the_lifetime(self, clock):
+        treasure = Treasure(0, 0, TreasureType.GOLD, clock=clock, decay_table=decay_table(2.5))
+        assert treasure.expiry_tick == 40
+        clock.tick = 4
+        assert treasure.value == 90
+        with pytest.raises(ValueError):
+            decay_table(0)
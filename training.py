@@ -0,0 +1,143 @@
+"""Retrain HunterDecisionModel from recorded trajectories (see eldoria.trajectory).
+
+    python -m eldoria.ai.training trajectories --models models
+
+Chunks are streamed from disk one at a time and only the decisions whose
+hunter went on to deposit treasure are kept. A CART tree (Gini impurity,
+NumPy only) is fitted to those decisions' actions, each weighted by its
+outcome, so the model imitates what led to value. The tree is written as
+models/hunter-v<N>.npz, one version above the newest model there, and loads
+with HunterDecisionModel.load().
+"""
+import argparse
+import glob
+import os
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+
+from eldoria.ai.decision_tree import _LEAF, CompiledTree
+from eldoria.trajectory import FEATURES, read_chunks
+
+MODEL_PATTERN = re.compile(r'hunter-v(\d+)\.npz$')
+_UNDEFINED = -2  # sklearn's feature/threshold of a leaf
+
+
+def fit_tree(states: np.ndarray, actions: np.ndarray, weights: Optional[np.ndarray] = None,
+             max_depth: int = 6, min_weight: float = 1.0) -> CompiledTree:
+    """Fit a classification tree to (n, 3) float32 states.
+
+    Splits minimise weighted Gini impurity; a split needs at least min_weight
+    on each side. Thresholds fall midway between neighbouring float32 values,
+    like sklearn's, and nodes are numbered depth first from the root.
+    """
+    states = np.asarray(states, dtype=np.float32)
+    classes, labels = np.unique(actions, return_inverse=True)
+    weights = np.ones(len(states)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if not len(states) or weights.sum() <= 0:
+        raise ValueError("no weighted rows to fit")
+    nodes = []  # (feature, threshold, left, right, action)
+
+    def grow(rows: np.ndarray, depth: int) -> int:
+        totals = np.bincount(labels[rows], weights=weights[rows], minlength=len(classes))
+        node = len(nodes)
+        nodes.append((_UNDEFINED, float(_UNDEFINED), _LEAF, _LEAF, classes[np.argmax(totals)]))
+        if depth == max_depth or np.count_nonzero(totals) < 2:
+            return node
+        split = _best_split(states[rows], labels[rows], weights[rows], totals, min_weight)
+        if split is None:
+            return node
+        feature, threshold = split
+        goes_left = states[rows, feature] <= threshold
+        left = grow(rows[goes_left], depth + 1)
+        right = grow(rows[~goes_left], depth + 1)
+        nodes[node] = (feature, threshold, left, right, nodes[node][4])
+        return node
+
+    grow(np.arange(len(states)), 0)
+    return CompiledTree(*zip(*nodes))
+
+
+def _best_split(states, labels, weights, totals, min_weight) -> Optional[Tuple[int, float]]:
+    """(feature, threshold) with the lowest weighted child impurity, or None if nothing beats the node"""
+    total = totals.sum()
+    best_impurity = total - (totals ** 2).sum() / total  # Weighted Gini of the node itself
+    best = None
+    for feature in range(states.shape[1]):
+        order = np.argsort(states[:, feature], kind='stable')
+        values = states[order, feature]
+        left = np.cumsum(np.eye(len(totals))[labels[order]] * weights[order, None], axis=0)[:-1]
+        left_weight = left.sum(axis=1)
+        right_weight = total - left_weight
+        valid = (values[:-1] < values[1:]) & (left_weight >= min_weight) & (right_weight >= min_weight)
+        if not valid.any():
+            continue
+        with np.errstate(divide='ignore', invalid='ignore'):
+            impurity = (left_weight - (left ** 2).sum(axis=1) / left_weight
+                        + right_weight - ((totals - left) ** 2).sum(axis=1) / right_weight)
+        impurity = np.where(valid, impurity, np.inf)
+        position = int(np.argmin(impurity))
+        if impurity[position] < best_impurity - 1e-12:
+            best_impurity = impurity[position]
+            low, high = float(values[position]), float(values[position + 1])
+            threshold = (low + high) / 2
+            best = feature, (threshold if threshold < high else low)
+    return best
+
+
+def load_training_data(directory: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(states, actions, outcomes) of every recorded decision with a positive outcome"""
+    states, actions, outcomes = [], [], []
+    for chunk in read_chunks(directory, FEATURES + ('action', 'outcome')):
+        rewarded = chunk['outcome'] > 0
+        states.append(np.stack([chunk[name][rewarded] for name in FEATURES], axis=1))
+        actions.append(chunk['action'][rewarded])
+        outcomes.append(chunk['outcome'][rewarded])
+    if not states:
+        raise ValueError(f"no trajectory chunks in {directory}")
+    return np.concatenate(states), np.concatenate(actions), np.concatenate(outcomes)
+
+
+def model_versions(models: str):
+    """{version: path} of the model files in a directory"""
+    versions = {}
+    for path in glob.glob(os.path.join(models, 'hunter-v*.npz')):
+        match = MODEL_PATTERN.search(path)
+        if match:
+            versions[int(match.group(1))] = path
+    return versions
+
+
+def latest_model(models: str) -> Optional[str]:
+    """Path of the highest model version in a directory, or None"""
+    versions = model_versions(models)
+    return versions[max(versions)] if versions else None
+
+
+def retrain(trajectories: str, models: str, max_depth: int = 6, min_weight: float = 1.0) -> str:
+    """Fit a tree to the recorded trajectories and write it as the next model version; returns its path"""
+    states, actions, outcomes = load_training_data(trajectories)
+    if not len(states):
+        raise ValueError(f"no decision in {trajectories} led to a deposit")
+    tree = fit_tree(states, actions, outcomes, max_depth, min_weight)
+    version = max(model_versions(models), default=0) + 1
+    os.makedirs(models, exist_ok=True)
+    path = os.path.join(models, f'hunter-v{version}.npz')
+    tree.save(path, version, rows=len(states), max_depth=max_depth, min_weight=min_weight,
+              trajectories=os.path.abspath(trajectories))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit a new HunterDecisionModel to recorded trajectories.")
+    parser.add_argument('trajectories', help="directory of chunks written by eldoria.trajectory.TrajectoryRecorder")
+    parser.add_argument('--models', default='models', help="directory of versioned model files")
+    parser.add_argument('--max-depth', type=int, default=6)
+    parser.add_argument('--min-weight', type=float, default=1.0, help="least outcome weight on each side of a split")
+    args = parser.parse_args(argv)
+    print(retrain(args.trajectories, args.models, args.max_depth, args.min_weight))
+
+
+if __name__ == '__main__':
+    main()
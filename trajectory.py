@@ -0,0 +1,170 @@
+"""Opt-in recording of hunter decisions, as training data for HunterDecisionModel.
+
+    recorder = TrajectoryRecorder('trajectories')
+    simulation.recorder = recorder
+    ...run steps...
+    recorder.close()
+
+Every tick, each hunter that asks the model for an action adds one row:
+the (stamina, treasure_value, knight_distance) it decided on, the action and
+its outcome, the treasure value that hunter goes on to deposit from then
+until it leaves the game (or the recording ends). Outcomes are only known
+once a game is over, so a game's rows wait in a per-game buffer until then
+and are copied into a fixed-size chunk buffer, which is written out whole as
+one .npz file of column arrays whenever it fills. Several simulations may
+share one recorder; eldoria.ai.training reads the chunks back.
+"""
+import glob
+import os
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+COLUMNS = {'tick': np.int32, 'hunter': np.int32, 'stamina': np.float32, 'treasure_value': np.float32,
+           'knight_distance': np.float32, 'action': np.int8, 'outcome': np.float32}
+FEATURES = ('stamina', 'treasure_value', 'knight_distance')  # HunterDecisionModel input order
+CHUNK_ROWS = 1 << 16
+
+
+class _Buffer:
+    """Preallocated column arrays holding `size` rows"""
+
+    def __init__(self, capacity: int):
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self.size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.columns['tick'])
+
+    def reserve(self, rows: int):
+        """Grow (doubling) until `rows` more rows fit"""
+        if self.size + rows <= self.capacity:
+            return
+        capacity = max(self.capacity * 2, self.size + rows)
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+
+class _Game:
+    """Rows and deposits of one simulation until it is over"""
+
+    def __init__(self):
+        self.rows = _Buffer(256)
+        self.deposits: List[Tuple[int, int, float]] = []  # (hunter, tick, value)
+
+    def outcomes(self) -> np.ndarray:
+        """Value each row's hunter deposited after the row's tick"""
+        rows = self.rows
+        hunters = rows.columns['hunter'][:rows.size].astype(np.int64)
+        ticks = rows.columns['tick'][:rows.size].astype(np.int64)
+        if not self.deposits:
+            return np.zeros(rows.size, dtype=np.float32)
+        deposit_hunters, deposit_ticks, values = (np.array(column) for column in zip(*self.deposits))
+        span = max(ticks.max(initial=0), deposit_ticks.max()) + 2
+        keys = deposit_hunters * span + deposit_ticks
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        totals = np.concatenate([[0.0], np.cumsum(values[order])])
+
+        def deposited_through(key):
+            return totals[np.searchsorted(keys, key, side='right')]
+
+        return (deposited_through(hunters * span + span - 1) - deposited_through(hunters * span + ticks)).astype(
+            np.float32)
+
+
+class TrajectoryRecorder:
+    """Buffers decision rows per game and writes them to `directory` in chunks of chunk_rows"""
+
+    def __init__(self, directory: str, chunk_rows: int = CHUNK_ROWS, prefix: Optional[str] = None):
+        """prefix names this recorder's chunk files (default: process id and a random suffix),
+        so recorders in several processes can share one directory"""
+        self.directory = directory
+        self.prefix = prefix if prefix is not None else f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._chunk = _Buffer(chunk_rows)
+        self._games: Dict[object, _Game] = {}
+        self.chunks_written = 0
+        self.rows_written = 0
+
+    def record(self, simulation, observed, decisions):
+        """Called by run_step with the hunters that observed and the actions they took"""
+        acted = [(hunter.hunter_id, features, action.value)
+                 for (hunter, features), (_, action) in zip(observed, decisions) if features is not None]
+        if not acted:
+            return
+        game = self._games.get(simulation)
+        if game is None:
+            game = self._games[simulation] = _Game()
+        rows = game.rows
+        rows.reserve(len(acted))
+        start, stop = rows.size, rows.size + len(acted)
+        hunters, states, actions = zip(*acted)
+        columns = rows.columns
+        columns['tick'][start:stop] = simulation.tick
+        columns['hunter'][start:stop] = hunters
+        columns['action'][start:stop] = actions
+        states = np.array(states, dtype=np.float32)
+        for index, name in enumerate(FEATURES):
+            columns[name][start:stop] = states[:, index]
+        rows.size = stop
+
+    def deposited(self, simulation, hunter, value: float):
+        """Called by the simulation when a hunter deposits treasure"""
+        game = self._games.get(simulation)
+        if game is not None:
+            game.deposits.append((hunter.hunter_id, simulation.tick, value))
+
+    def finish(self, simulation):
+        """Settle the outcomes of a game (called by run_step at game over) and move its rows to the chunk buffer"""
+        game = self._games.pop(simulation, None)
+        if game is None:
+            return
+        rows = game.rows
+        rows.columns['outcome'][:rows.size] = game.outcomes()
+        chunk = self._chunk
+        start = 0
+        while start < rows.size:
+            count = min(rows.size - start, chunk.capacity - chunk.size)
+            for name, column in chunk.columns.items():
+                column[chunk.size:chunk.size + count] = rows.columns[name][start:start + count]
+            chunk.size += count
+            start += count
+            if chunk.size == chunk.capacity:
+                self.flush()
+
+    def flush(self):
+        """Write the rows in the chunk buffer as one chunk file"""
+        chunk = self._chunk
+        if not chunk.size:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{self.prefix}-{self.chunks_written:05d}.npz')
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, **{name: column[:chunk.size] for name, column in chunk.columns.items()})
+        os.replace(path + '.tmp', path)
+        self.chunks_written += 1
+        self.rows_written += chunk.size
+        chunk.size = 0
+
+    def close(self):
+        """Settle games still running with the deposits made so far and write everything out"""
+        for simulation in list(self._games):
+            self.finish(simulation)
+        self.flush()
+
+    def __enter__(self) -> 'TrajectoryRecorder':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_chunks(directory: str, columns=tuple(COLUMNS)) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield the requested columns of every chunk file in directory, one chunk at a time"""
+    for path in sorted(glob.glob(os.path.join(directory, '*.npz'))):
+        with np.load(path) as chunk:
+            yield {name: chunk[name] for name in columns}
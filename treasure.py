@@ -1,17 +1,90 @@
+from functools import lru_cache
+from typing import Optional, Tuple
 from eldoria.enums import TreasureType
 
+DECAY_RATE = 0.1  # Value lost per decay step
+
+
+@lru_cache(maxsize=None)
+def decay_table(rate: float = DECAY_RATE, base: float = 100.0) -> Tuple[float, ...]:
+    """Value after n decay steps, built by repeated subtraction so lazy reads match eager decay exactly"""
+    if not rate > 0:
+        raise ValueError(f"decay rate must be positive, got {rate}")
+    values = [base]
+    while values[-1] > 0:
+        values.append(max(0, values[-1] - rate))
+    return tuple(values)
+
+
+DECAY_TABLE = decay_table()
+LIFETIME = len(DECAY_TABLE) - 1  # Decay steps until the value reaches 0
+
+
 class Treasure:
-    def __init__(self, x: int, y: int, treasure_type: TreasureType):
+    __slots__ = ('x', 'y', 'type', 'clock', 'decay_table', 'lifetime', '_decay_steps', '_ground_since')
+
+    def __init__(self, x: int, y: int, treasure_type: TreasureType, clock=None,
+                 decay_table: Tuple[float, ...] = DECAY_TABLE):
+        """clock is any object with an integer `tick` (the simulation). With a clock the
+        treasure decays one step per tick while on the ground; without one it only
+        decays through decay(). decay_table is a treasure.decay_table() of the decay rate."""
         self.x = x
         self.y = y
         self.type = treasure_type
-        self.value = 100.0  # Base value
+        self.clock = clock
+        self.decay_table = decay_table
+        self.lifetime = len(decay_table) - 1  # Decay steps until the value reaches 0
+        self._decay_steps = 0  # Steps banked while off the clock
+        self._ground_since: Optional[int] = clock.tick if clock is not None else None
+
+    @property
+    def decay_steps(self) -> int:
+        steps = self._decay_steps
+        if self._ground_since is not None:
+            steps += self.clock.tick - self._ground_since
+        return min(steps, self.lifetime)
+
+    @property
+    def value(self) -> float:
+        """Base value (100) after decay so far"""
+        return self.decay_table[self.decay_steps]
+
+    @property
+    def on_ground(self) -> bool:
+        return self._ground_since is not None
+
+    @property
+    def expiry_tick(self) -> Optional[int]:
+        """Clock tick at which the value reaches 0, or None while carried"""
+        if self._ground_since is None:
+            return None
+        return self._ground_since + self.lifetime - self._decay_steps
+
+    def decay_state(self) -> Tuple[int, Optional[int]]:
+        """(decay steps banked off the ground, tick it was last put down or None while carried)"""
+        return self._decay_steps, self._ground_since
+
+    def set_decay_state(self, decay_steps: int, ground_since: Optional[int]):
+        """Inverse of decay_state, for restoring snapshots"""
+        self._decay_steps = decay_steps
+        self._ground_since = ground_since
+
+    def pick_up(self):
+        """Stop decaying (carried treasure keeps its value)"""
+        self._decay_steps = self.decay_steps
+        self._ground_since = None
+
+    def put_down(self, x: int, y: int):
+        """Place on the ground and resume decaying from the next tick"""
+        self.x, self.y = x, y
+        if self.clock is not None:
+            self._ground_since = self.clock.tick
 
     def decay(self) -> bool:
-        """Reduce treasure value by 0.1% each step"""
-        self.value = max(0, self.value - 0.1)
+        """Reduce treasure value by one decay step"""
+        self._decay_steps = min(self._decay_steps + 1, self.lifetime)
         return self.value > 0
 
     def get_value(self) -> float:
         """Get current value with type multiplier"""
-        return self.value * self.type.value_multiplier
\ No newline at end of file
+        return self.value * self.type.value_multiplier